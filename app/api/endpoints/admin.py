@@ -0,0 +1,36 @@
+import os
+import secrets
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import FileResponse
+from app.core.config import settings
+from app.core.profiling import list_profiles
+
+async def require_admin_token(authorization: str | None = Header(None)):
+    """Bearer PROFILING_ADMIN_TOKEN; with no token configured the endpoints don't exist."""
+    token = settings.PROFILING_ADMIN_TOKEN
+    if not token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    scheme, _, supplied = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(supplied.encode("utf-8"), token.encode("utf-8")):
+        raise HTTPException(status_code=401, detail="Admin token required.", headers={"WWW-Authenticate": "Bearer"})
+
+router = APIRouter(dependencies=[Depends(require_admin_token)])
+
+@router.get("/profiles")
+async def get_profiles():
+    """
+    Lists the sampled profiles in the on-disk ring, newest first.
+    """
+    return list_profiles()
+
+@router.get("/profiles/{name}")
+async def download_profile(name: str):
+    # Only serve plain file names that are actually in the ring (no path traversal)
+    if os.path.basename(name) != name or name not in {p["name"] for p in list_profiles()}:
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    profile_dir = os.path.realpath(settings.PROFILING_DIR)
+    path = os.path.realpath(os.path.join(profile_dir, name))
+    if os.path.dirname(path) != profile_dir:
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    media_type = "application/json" if name.endswith(".json") else "text/plain"
+    return FileResponse(path, media_type=media_type, filename=name)
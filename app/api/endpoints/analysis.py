@@ -1,13 +1,24 @@
-from fastapi import APIRouter, HTTPException
-from app.schemas.analysis import AnalysisRequest, AnalysisResponse
-from app.services.feynman_analyzer import analyzer_service
+import json
+from functools import lru_cache
+from typing import Literal
+from fastapi import APIRouter, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.schemas.analysis import AnalysisRequest, AnalysisResponse, BatchAnalysisRequest
+from app.services.feynman_analyzer import get_analyzer_service
+from app.services.batch_analyzer import batch_analyzer
+from app.services.live_speech import LiveSpeechSession
 
 router = APIRouter()
 
 @router.post("/analyze", response_model=AnalysisResponse)
 async def analyze_explanation(request: AnalysisRequest):
     try:
-        response = analyzer_service.analyze_explanation(request)
+        # The analyzer blocks on the LLM; keep it off the event loop
+        response = await run_in_threadpool(get_analyzer_service().analyze_explanation, request)
         return response
     except Exception as e:
         # Log the full error for debugging
@@ -15,7 +26,143 @@ async def analyze_explanation(request: AnalysisRequest):
         logging.getLogger(__name__).error(f"Analysis API Error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/analyze/batch")
+async def analyze_batch(request: BatchAnalysisRequest):
+    """
+    Analyzes many explanations in one call.
+    Streams newline-delimited JSON events: 'started', one 'result' per item as it finishes
+    (with batch progress, failures reported per item), then 'done'.
+    """
+    if not request.items:
+        raise HTTPException(status_code=400, detail="Batch must contain at least one item.")
+    if len(request.items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Batch too large. Max items is {settings.BATCH_MAX_ITEMS}.")
+
+    async def event_stream():
+        async for event in batch_analyzer.stream(request):
+            yield json.dumps(event, default=str) + "\n"
+
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+@router.websocket("/ws/speech")
+async def live_speech(websocket: WebSocket):
+    """
+    Live speech mode. The client streams final transcript segments as they are recognized
+    and gets filler/pace metrics back after each one; the full analysis starts on 'stop'.
+
+    Client -> server (JSON):
+      {"type": "segment", "text": "...", "start": 1.2, "end": 3.4}   (seconds since recording start)
+      {"type": "stop", "total_seconds": 30.5, "request": {"concept": "...", ...AnalysisRequest fields}}
+    Server -> client:
+      {"type": "metrics", ...} after every segment
+      {"type": "analyzing"}, then {"type": "result", "response": AnalysisResponse} after 'stop'
+      (an unsaved draft: POST /analyze with draft_id=response.attempt_id saves it if the text is unchanged)
+      {"type": "error", "detail": "..."} on bad input (the session stays open) or a failed analysis
+    """
+    import logging
+    logger = logging.getLogger(__name__)
+
+    await websocket.accept()
+    session = LiveSpeechSession(settings.LIVE_SPEECH_MAX_CHARS)
+    try:
+        while True:
+            try:
+                message = await websocket.receive_json()
+            except ValueError:
+                await websocket.send_json({"type": "error", "detail": "Messages must be JSON."})
+                continue
+
+            kind = message.get("type") if isinstance(message, dict) else None
+            if kind == "segment":
+                try:
+                    metrics = session.add_segment(message.get("text", ""), message.get("start"), message.get("end"))
+                except (TypeError, ValueError) as e:
+                    await websocket.send_json({"type": "error", "detail": str(e)})
+                    continue
+                await websocket.send_json({"type": "metrics", **metrics})
+            elif kind == "stop":
+                session.stop(message.get("total_seconds"))
+                if not session.parts:
+                    await websocket.send_json({"type": "error", "detail": "Nothing was transcribed."})
+                    continue
+                try:
+                    request = session.analysis_request(message.get("request"))
+                except (TypeError, ValidationError) as e:
+                    await websocket.send_json({"type": "error", "detail": str(e)})
+                    continue
+                await websocket.send_json({"type": "analyzing"})
+                try:
+                    # Kept as a draft: it is only saved if the user submits this transcript unchanged
+                    response = await run_in_threadpool(get_analyzer_service().analyze_explanation, request, None, False)
+                    await websocket.send_json({"type": "result", "response": jsonable_encoder(response)})
+                except Exception as e:
+                    logger.error(f"Live speech analysis error: {str(e)}", exc_info=True)
+                    await websocket.send_json({"type": "error", "detail": str(e)})
+                break
+            else:
+                await websocket.send_json({"type": "error", "detail": f"Unknown message type: {kind}"})
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.info("Live speech client disconnected")
+
+@router.get("/interview/sessions/{session_id}")
+async def get_interview_session(session_id: str):
+    from app.memory.session_store import session_store
+    session = session_store.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Interview session not found or expired.")
+    return session
+
+@lru_cache(maxsize=8)
+def _render_history(version: str, view: str) -> bytes:
+    # `version` is only part of the cache key: a new attempt changes it and forces a re-render
+    from app.memory.attempts_store import load_attempts, summarize_attempt
+    attempts = load_attempts(limit=20)
+    if view == "summary":
+        attempts = [summarize_attempt(a) for a in attempts]
+    return json.dumps(attempts, default=str).encode("utf-8")
+
 @router.get("/history")
-async def get_history():
-    from app.memory.attempts_store import load_attempts
-    return load_attempts(limit=20)
+async def get_history(request: Request, view: Literal["full", "summary"] = "full"):
+    """
+    Most recent attempts, newest first. `view=summary` leaves out the full analyses.
+    The ETag comes from the history file's stat, so an unchanged history is answered
+    with a 304 without reading or serializing anything.
+    """
+    from app.memory.attempts_store import history_version
+    version = history_version()
+    etag = f'W/"{version}-{view}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+
+    body = await run_in_threadpool(_render_history, version, view)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@router.get("/progress")
+async def get_progress():
+    from app.memory.progress_store import list_progress
+    return list_progress()
+
+@router.post("/progress/rebuild")
+async def rebuild_progress():
+    from app.memory.progress_store import rebuild_progress
+    return rebuild_progress()
+
+@router.get("/progress/sessions/{session_id}")
+async def get_session_progress(session_id: str):
+    from app.memory.progress_store import get_session_progress
+    progress = get_session_progress(session_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="No progress recorded for this session.")
+    return progress
+
+@router.get("/progress/{concept}")
+async def get_concept_progress(concept: str):
+    from app.memory.progress_store import get_concept_progress
+    progress = get_concept_progress(concept)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="No progress recorded for this concept.")
+    return progress
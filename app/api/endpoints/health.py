@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from app.services.warmup import warmup_service
+
+router = APIRouter()
+
+@router.get("/health")
+async def health():
+    """
+    Liveness: the process is up and serving HTTP.
+    """
+    return {"status": "ok"}
+
+@router.get("/ready")
+async def ready():
+    """
+    Readiness: 200 only once warm-up has finished, so no traffic lands on a cold instance.
+    A failed warm-up (e.g. llama-server not started yet) is retried in the background.
+    """
+    if warmup_service.ready:
+        return warmup_service.status()
+    warmup_service.retry_if_failed()
+    return JSONResponse(warmup_service.status(), status_code=503)
@@ -8,30 +8,36 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 
 UPLOAD_DIR = "data/raw"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+def ensure_upload_dir():
+    """Create the upload directory. Called from the app lifespan, not at import time."""
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 @router.post("/upload")
-async def upload_pdf(file: UploadFile = File(...)):
+async def upload_pdf(file: UploadFile = File(...), include_text: bool = True):
     """
     Uploads a PDF, extracts text, and saves it locally.
-    Returns the extracted text and a reference ID.
+    Returns the extracted text and a reference ID. Pass `include_text=false` to get
+    only the reference and length back when the text isn't needed client-side.
     """
     logger.info(f"Receiving upload: {file.filename}")
     
     # Extract
     text = await PDFLoader.extract_text(file)
-    
+
     # Save temporarily (Phase 2 requirement)
     file_id = str(uuid.uuid4())
     save_path = os.path.join(UPLOAD_DIR, f"{file_id}.txt")
-    
+
     with open(save_path, "w", encoding="utf-8") as f:
         f.write(text)
-        
-    return {
+    
+    response = {
         "status": "success",
         "file_id": file_id,
         "filename": file.filename,
         "text_length": len(text),
-        "text": text  # Returning full text as requested
     }
+    if include_text:
+        response["text"] = text  # Returning full text as requested
+    return response
@@ -1,3 +1,4 @@
+from typing import Any, Dict, Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -7,6 +8,71 @@ class Settings(BaseSettings):
     # Local Server Config
     LLM_API_BASE: str = "http://localhost:8080/v1"
     LLM_API_KEY: str = "lm-studio"  # Dummy key for local server
+    # Resilience: overall per-call deadline, bounded retries, circuit breaker and optional hedging
+    LLM_TIMEOUT_SECONDS: float = 180.0
+    LLM_MAX_RETRIES: int = 2
+    LLM_RETRY_BACKOFF_SECONDS: float = 0.5
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RESET_SECONDS: float = 30.0
+    LLM_HEDGE_API_BASE: Optional[str] = None  # Second llama-server to race slow calls against
+    LLM_HEDGE_DELAY_SECONDS: Optional[float] = None  # Defaults to the observed p95 latency
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+    # "live", "record" (live + save to cassette) or "replay" (serve from cassette, no backend needed)
+    LLM_MODE: str = "live"
+    LLM_CASSETTE_PATH: str = "data/llm_cassette.jsonl.gz"
+    LLM_REPLAY_LATENCY: str = "zero"  # "zero" or "original"
+    # Task routing: per-task backend/model/max_tokens/temperature overrides as JSON, e.g.
+    # LLM_TASK_ROUTES='{"comparison": {"api_base": "http://localhost:8081/v1", "model": "small", "max_tokens": 200}}'
+    # Tasks: analysis, interviewer, comparison, compression. Unset fields fall back to the primary backend.
+    LLM_TASK_ROUTES: Dict[str, Dict[str, Any]] = {}
+    LLM_SLOTS: int = 1  # Must match llama-server parallel slots (-np); interview sessions are pinned to one of them
+    # Startup warm-up (client pool, backend health, prompt-cache priming) gating /ready
+    WARMUP_ENABLED: bool = True
+    WARMUP_TIMEOUT_SECONDS: float = 60.0
+    # Interview Sessions
+    INTERVIEW_SESSION_TTL_SECONDS: int = 1800
+    INTERVIEW_MAX_SESSIONS: int = 500
+    # Batch Analysis
+    BATCH_MAX_ITEMS: int = 200
+    BATCH_MAX_CONCURRENCY: int = 4  # Keep at or below llama-server's parallel slots (-np)
+    # Profiling (requests can also opt in with the PROFILING_HEADER header)
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.01
+    PROFILING_INTERVAL_MS: float = 5.0
+    PROFILING_FORMAT: str = "collapsed"  # "collapsed" or "speedscope"
+    PROFILING_DIR: str = "data/profiles"
+    PROFILING_RING_SIZE: int = 50
+    PROFILING_HEADER: str = "X-Feynman-Profile"
+    # The /api/admin profile endpoints are only mounted when this is set, and require it as a Bearer token
+    PROFILING_ADMIN_TOKEN: Optional[str] = None
+    # Delta re-analysis: revisions that change at most this share of the text only send the changes to the model
+    DELTA_ANALYSIS_ENABLED: bool = True
+    DELTA_MAX_CHANGE_RATIO: float = 0.5
+    DELTA_MAX_TOKENS: int = 400
+    # Retrieval of reference material: "keyword", "bm25" or "tfidf"; compression "off", "extractive" or "llm"
+    RETRIEVAL_STRATEGY: str = "keyword"
+    RETRIEVAL_TOP_K: int = 3
+    CONTEXT_COMPRESSION: str = "off"
+    CONTEXT_COMPRESSION_MAX_SENTENCES: int = 4  # Per chunk, for extractive compression
+    # Live speech (WebSocket): cap on the accumulated transcript
+    LIVE_SPEECH_MAX_CHARS: int = 20000
+    # Stop-time live speech analyses are kept unsaved until the user submits them
+    DRAFT_ATTEMPT_TTL_SECONDS: int = 1800
+    DRAFT_ATTEMPT_MAX: int = 500
+    # Comparator fast path: decide clear-cut comparisons locally, ask the LLM only when ambiguous
+    COMPARATOR_FAST_PATH_ENABLED: bool = True
+    COMPARATOR_GAP_MATCH_THRESHOLD: float = 0.6  # Token-set similarity above which two gaps are the same gap
+    # Segmented (map-reduce) analysis: explanations over the threshold (estimated tokens, ~4 chars each) are
+    # analyzed in parts across LLM_SLOTS in parallel, then merged by one short reduce call
+    SEGMENTED_ANALYSIS_ENABLED: bool = True
+    SEGMENT_THRESHOLD_TOKENS: int = 1500  # What fits next to reference material and the answer in -c 4096
+    SEGMENT_MAX_TOKENS: int = 600
+    SEGMENT_RESPONSE_MAX_TOKENS: int = 300
+    SEGMENT_REDUCE_MAX_TOKENS: int = 700
+    # HTTP responses: gzip (or brotli, if brotli-asgi is installed) above a size threshold
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_LEVEL: int = 6  # gzip 1-9 / brotli 0-11
+    STATIC_CACHE_MAX_AGE_SECONDS: int = 3600  # index.html is always revalidated; this applies to css/js/images
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,205 @@
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Dependency-free counters/histograms rendered in Prometheus text format, plus a
+# per-request stage log that feeds the Server-Timing header.
+_lock = Lock()
+
+def _format_labels(labelnames: tuple, values: tuple, extra: dict | None = None) -> str:
+    pairs = list(zip(labelnames, values))
+    if extra:
+        pairs.extend(extra.items())
+    if not pairs:
+        return ""
+    escaped = []
+    for name, value in pairs:
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        escaped.append(f'{name}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with _lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with _lock:
+            return self._values.get(key, 0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # key -> [bucket counts..., sum, count]
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with _lock:
+            state = self._values.get(key)
+            if state is None:
+                state = [0] * len(self.buckets) + [0.0, 0]
+                self._values[key] = state
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def summary(self) -> dict[tuple, dict]:
+        """Sum and count per label set, for in-process reporting (benchmarks)."""
+        with _lock:
+            return {key: {"sum": state[-2], "count": state[-1]} for key, state in self._values.items()}
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for key, state in sorted(self._values.items()):
+            cumulative = 0
+            for i, bound in enumerate(self.buckets):
+                cumulative += state[i]
+                labels = _format_labels(self.labelnames, key, {"le": _format_value(bound)})
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{labels} {state[-1]}")
+        return lines
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: list = []
+
+    def counter(self, name: str, documentation: str, labelnames: tuple = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        with _lock:
+            lines = []
+            for metric in self._metrics:
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+
+# HTTP
+http_request_duration = registry.histogram(
+    "feynman_http_request_duration_seconds", "HTTP request latency.", ("method", "route", "status"))
+
+# Analyzer pipeline
+stage_duration = registry.histogram(
+    "feynman_stage_duration_seconds", "Time spent in each analysis pipeline stage.", ("stage",))
+
+# LLM backend
+llm_request_duration = registry.histogram(
+    "feynman_llm_request_duration_seconds", "Wall-clock latency of LLM calls.", ("outcome", "task"))
+llm_queue_wait = registry.histogram(
+    "feynman_llm_queue_wait_seconds", "Time an LLM call spent outside prompt eval and generation (queueing, transport).")
+llm_tokens_per_second = registry.histogram(
+    "feynman_llm_tokens_per_second", "Completion tokens generated per second.",
+    buckets=(1, 2, 5, 10, 15, 20, 30, 50, 75, 100, 200))
+llm_prompt_tokens = registry.counter(
+    "feynman_llm_prompt_tokens_total", "Prompt tokens sent to the LLM.")
+llm_completion_tokens = registry.counter(
+    "feynman_llm_completion_tokens_total", "Completion tokens generated by the LLM.")
+llm_cache_tokens = registry.counter(
+    "feynman_llm_prompt_cache_tokens_total", "Prompt tokens served from llama-server's prompt cache.")
+llm_cache_requests = registry.counter(
+    "feynman_llm_prompt_cache_requests_total", "LLM calls by whether any prompt tokens came from cache.", ("result",))
+llm_retries = registry.counter(
+    "feynman_llm_retries_total", "LLM calls retried after a transient failure.")
+llm_circuit_rejections = registry.counter(
+    "feynman_llm_circuit_rejections_total", "LLM calls rejected because a backend's circuit was open.", ("backend",))
+llm_hedged_requests = registry.counter(
+    "feynman_llm_hedged_requests_total", "LLM calls that fired a hedge request, by which backend answered.", ("winner",))
+
+# Comparator
+comparator_fast_path = registry.counter(
+    "feynman_comparator_fast_path_total", "Attempt comparisons answered by the local heuristic (hit) or the LLM (miss).", ("result",))
+
+# Per-request stage log, read by the Server-Timing middleware
+_request_timings: ContextVar[list | None] = ContextVar("request_timings", default=None)
+
+def begin_request_timings() -> list:
+    timings = []
+    _request_timings.set(timings)
+    return timings
+
+def record_timing(name: str, seconds: float) -> None:
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.append((name, seconds))
+
+@contextmanager
+def stage(name: str):
+    """Time a pipeline stage into the stage histogram and the current request's Server-Timing."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stage_duration.observe(elapsed, stage=name)
+        record_timing(name, elapsed)
+
+def server_timing_header(timings: list) -> str:
+    # Repeated stages (e.g. two LLM calls) are summed so each name appears once
+    totals: dict[str, float] = {}
+    for name, seconds in timings:
+        totals[name] = totals.get(name, 0.0) + seconds
+    return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in totals.items())
+
+def observe_llm_call(elapsed: float, outcome: str, usage: dict | None = None, timings: dict | None = None, task: str = "analysis") -> None:
+    """Record one LLM call. `timings` is llama-server's non-standard per-request timing block."""
+    llm_request_duration.observe(elapsed, outcome=outcome, task=task)
+    if outcome != "ok":
+        return
+
+    completion_tokens = 0
+    if usage:
+        llm_prompt_tokens.inc(usage.get("prompt_tokens") or 0)
+        completion_tokens = usage.get("completion_tokens") or 0
+        llm_completion_tokens.inc(completion_tokens)
+
+    if timings:
+        prompt_ms = timings.get("prompt_ms") or 0
+        predicted_ms = timings.get("predicted_ms") or 0
+        llm_queue_wait.observe(max(elapsed - (prompt_ms + predicted_ms) / 1000, 0.0))
+        if timings.get("predicted_per_second"):
+            llm_tokens_per_second.observe(timings["predicted_per_second"])
+        cached = timings.get("cache_n") or 0
+        llm_cache_tokens.inc(cached)
+        llm_cache_requests.inc(result="hit" if cached else "miss")
+    elif completion_tokens and elapsed > 0:
+        llm_tokens_per_second.observe(completion_tokens / elapsed)
@@ -0,0 +1,156 @@
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_EXTENSIONS = {"collapsed": ".folded", "speedscope": ".speedscope.json"}
+
+# Set per request by the HTTP middleware when the client sends the profiling header
+_profile_requested: ContextVar[bool] = ContextVar("profile_requested", default=False)
+
+def request_profiling(requested: bool) -> None:
+    _profile_requested.set(requested)
+
+def _should_profile() -> bool:
+    if _profile_requested.get():
+        return True
+    return settings.PROFILING_ENABLED and random.random() < settings.PROFILING_SAMPLE_RATE
+
+class SamplingProfiler:
+    """
+    Samples one thread's Python stack from a background thread every `interval` seconds.
+    Cheap enough to leave on for a fraction of requests: the target thread is never traced or paused.
+    """
+    def __init__(self, target_thread_id: int, interval: float):
+        self.target_thread_id = target_thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.sample_count = 0
+        self.started_at = 0.0
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.target_thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_name, code.co_filename, frame.f_lineno))
+                frame = frame.f_back
+            # Root first, as both collapsed stacks and speedscope expect
+            self.stacks[tuple(reversed(stack))] += 1
+            self.sample_count += 1
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started_at
+
+    def to_collapsed(self) -> str:
+        lines = []
+        for stack, count in self.stacks.most_common():
+            frames = ";".join(f"{name} ({os.path.basename(filename)}:{line})" for name, filename, line in stack)
+            lines.append(f"{frames} {count}")
+        return "\n".join(lines) + "\n"
+
+    def to_speedscope(self, name: str) -> str:
+        frames = []
+        frame_index = {}
+        samples = []
+        weights = []
+        interval_ms = self.interval * 1000
+        for stack, count in self.stacks.items():
+            indices = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                indices.append(frame_index[frame])
+            samples.append(indices)
+            weights.append(count * interval_ms)
+        return json.dumps({
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": settings.PROJECT_NAME,
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }],
+        })
+
+def _write_profile(profiler: SamplingProfiler, name: str) -> str:
+    """Write one profile into the on-disk ring, dropping the oldest beyond PROFILING_RING_SIZE."""
+    profile_format = settings.PROFILING_FORMAT if settings.PROFILING_FORMAT in PROFILE_EXTENSIONS else "collapsed"
+    os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+
+    filename = f"{time.strftime('%Y%m%dT%H%M%S')}-{name}-{uuid.uuid4().hex[:8]}{PROFILE_EXTENSIONS[profile_format]}"
+    body = profiler.to_speedscope(name) if profile_format == "speedscope" else profiler.to_collapsed()
+    with open(os.path.join(settings.PROFILING_DIR, filename), "w", encoding="utf-8") as f:
+        f.write(body)
+
+    for old in list_profiles()[settings.PROFILING_RING_SIZE:]:
+        try:
+            os.remove(os.path.join(settings.PROFILING_DIR, old["name"]))
+        except OSError:
+            pass
+    return filename
+
+@contextmanager
+def profiled(name: str):
+    """
+    Sample the current thread while the block runs, if this request was picked for profiling.
+    """
+    if not _should_profile():
+        yield
+        return
+
+    profiler = SamplingProfiler(threading.get_ident(), settings.PROFILING_INTERVAL_MS / 1000)
+    profiler.start()
+    try:
+        yield
+    finally:
+        profiler.stop()
+        try:
+            filename = _write_profile(profiler, name)
+            logger.info(f"Profile '{name}' written: {filename} ({profiler.sample_count} samples, {profiler.duration:.2f}s)")
+        except Exception as e:
+            logger.error(f"Failed to write profile: {e}")
+
+def list_profiles() -> list[dict]:
+    """
+    Profiles currently in the ring, newest first.
+    """
+    if not os.path.isdir(settings.PROFILING_DIR):
+        return []
+    profiles = []
+    for entry in os.scandir(settings.PROFILING_DIR):
+        if entry.is_file() and entry.name.endswith(tuple(PROFILE_EXTENSIONS.values())):
+            stat = entry.stat()
+            profiles.append({"name": entry.name, "size_bytes": stat.st_size, "modified_at": stat.st_mtime})
+    profiles.sort(key=lambda p: (p["modified_at"], p["name"]), reverse=True)
+    return profiles
@@ -0,0 +1,23 @@
+import os
+
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles with Cache-Control on top of its built-in ETag / Last-Modified validators.
+    HTML is always revalidated (a cheap 304 when unchanged) so new deploys show up immediately;
+    other assets may be reused from the browser cache for `max_age` seconds.
+    """
+    def __init__(self, *args, max_age: int = 3600, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_age = max_age
+
+    def file_response(self, full_path: str | os.PathLike, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if str(full_path).endswith(".html"):
+            response.headers["Cache-Control"] = "no-cache"
+        else:
+            response.headers["Cache-Control"] = f"public, max-age={self.max_age}"
+        return response
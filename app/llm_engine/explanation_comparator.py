@@ -1,6 +1,6 @@
 import json
 import logging
-from app.services.llm_engine import llm_engine
+from app.services.llm_engine import get_llm_engine
 
 logger = logging.getLogger(__name__)
 
@@ -75,10 +75,11 @@ def compare_explanations(
         )
 
         # Generate Response
-        response_str = llm_engine.generate(
+        response_str = get_llm_engine().generate(
             system_prompt=COMPARISON_SYSTEM_PROMPT,
             user_prompt=user_prompt,
-            max_tokens=800
+            max_tokens=800,
+            task="comparison"
         )
 
         # Parse JSON
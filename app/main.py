@@ -1,12 +1,33 @@
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.endpoints import analysis, ingest
+from fastapi.middleware.gzip import GZipMiddleware
+from app.api.endpoints import admin, analysis, health, ingest, metrics
 from app.core.config import settings
+from app.core.metrics import begin_request_timings, http_request_duration, server_timing_header
+from app.core.profiling import request_profiling
+from app.core.static_files import CachedStaticFiles
+from app.api.endpoints.ingest import ensure_upload_dir
+from app.memory.attempts_store import ensure_history_dir
+from app.services.warmup import warmup_service
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Filesystem setup lives here so importing the app has no side effects
+    ensure_upload_dir()
+    ensure_history_dir()
+    # Warm up in the background so /health answers immediately; /ready flips once it's done
+    if settings.WARMUP_ENABLED:
+        warmup_service.run_in_background()
+    else:
+        warmup_service.state = "ready"
+    yield
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    version=settings.VERSION
+    version=settings.VERSION,
+    lifespan=lifespan
 )
 
 # CORS
@@ -18,12 +39,64 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compression above a size threshold: brotli when the optional brotli-asgi package is
+# installed (it falls back to gzip for clients without br support), gzip otherwise
+try:
+    from brotli_asgi import BrotliMiddleware
+    app.add_middleware(BrotliMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE, quality=settings.COMPRESSION_LEVEL)
+except ImportError:
+    app.add_middleware(GZipMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE, compresslevel=settings.COMPRESSION_LEVEL)
+
+def _route_template(scope: dict) -> str:
+    """
+    The matched route's path template, never the user-supplied values.
+    FastAPI versions that include routers lazily keep `route.path` relative to the router; the
+    (static) router prefix is then the part of the path before the route's own match.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if not template:
+        return "static"
+    regex = getattr(route, "path_regex", None)
+    path = scope.get("path", "")
+    if regex is None or regex.match(path):
+        return template
+    for i, char in enumerate(path):
+        if char == "/" and i and regex.match(path[i:]):
+            return path[:i] + template
+    return template
+
+# Per-request latency histogram + Server-Timing header built from the pipeline stages
+@app.middleware("http")
+async def record_request_timing(request: Request, call_next):
+    timings = begin_request_timings()
+    request_profiling(settings.PROFILING_HEADER in request.headers)
+    start = time.perf_counter()
+    response = await call_next(request)
+    elapsed = time.perf_counter() - start
+
+    # Label by route template (/api/v1/progress/{concept}) rather than raw path to keep cardinality bounded
+    route_label = _route_template(request.scope)
+    http_request_duration.observe(
+        elapsed,
+        method=request.method,
+        route=route_label,
+        status=response.status_code
+    )
+    response.headers["Server-Timing"] = server_timing_header(timings + [("total", elapsed)])
+    return response
+
 # Routers
 app.include_router(analysis.router, prefix="/api/v1", tags=["analysis"])
 app.include_router(ingest.router, prefix="/api/v2", tags=["ingestion"])
+app.include_router(metrics.router, tags=["observability"])
+app.include_router(health.router, tags=["observability"])
+# Profiles expose stack samples (file paths, code structure): only served to holders of the admin token
+if settings.PROFILING_ADMIN_TOKEN:
+    app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
 
 # Static Files (Frontend)
-app.mount("/", StaticFiles(directory="static", html=True), name="static")
+app.mount("/", CachedStaticFiles(directory="static", html=True, max_age=settings.STATIC_CACHE_MAX_AGE_SECONDS), name="static")
 
 if __name__ == "__main__":
     import uvicorn
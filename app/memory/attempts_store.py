@@ -2,22 +2,26 @@ import json
 import logging
 import os
 from datetime import datetime
-from threading import Lock
+
+from app.memory.progress_store import history_lock, update_progress
 
 logger = logging.getLogger(__name__)
 
 HISTORY_DIR = "data/history"
 HISTORY_FILE = os.path.join(HISTORY_DIR, "attempts.json")
 
-# Ensure directory exists
-os.makedirs(HISTORY_DIR, exist_ok=True)
+# Thread safety lock for file writes, shared with the progress aggregates
+_lock = history_lock
 
-# Thread safety lock for file writes
-_lock = Lock()
+def ensure_history_dir():
+    """Create the history directory. Called from the app lifespan, not at import time."""
+    os.makedirs(HISTORY_DIR, exist_ok=True)
 
 def _ensure_file_exists():
     """Create the history file with an empty list if it doesn't exist."""
     if not os.path.exists(HISTORY_FILE):
+        # Scripts use the store without the app lifespan
+        ensure_history_dir()
         with open(HISTORY_FILE, "w", encoding="utf-8") as f:
             json.dump([], f)
 
@@ -33,6 +37,8 @@ def save_attempt(attempt: dict) -> None:
     - explanation_text (str)
     - analysis_result (dict)
     - referenced_chunk_ids (list)
+    - comparison (dict, optional)
+    - session_id (str, optional)
     """
     _ensure_file_exists()
 
@@ -63,6 +69,13 @@ def save_attempt(attempt: dict) -> None:
             logger.error(f"Failed to save attempt: {e}")
             raise e
 
+        # Keep the progress aggregates in step with the log (same critical section, so folds happen
+        # in append order); they can always be rebuilt
+        try:
+            update_progress(attempt)
+        except Exception as e:
+            logger.error(f"Failed to update progress aggregates: {e}")
+
 def load_attempts(limit: int | None = None) -> list[dict]:
     """
     Load past explanation attempts, most recent first.
@@ -90,6 +103,36 @@ def load_attempts(limit: int | None = None) -> list[dict]:
             logger.error(f"Failed to load attempts: {e}")
             return []
 
+def history_version() -> str:
+    """
+    Cheap fingerprint of the history log (mtime + size), usable as an ETag.
+    Changes whenever an attempt is saved, without reading or parsing the file.
+    """
+    try:
+        stat = os.stat(HISTORY_FILE)
+    except FileNotFoundError:
+        return "empty"
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+def summarize_attempt(attempt: dict) -> dict:
+    """
+    Lightweight projection of an attempt for history listings: drops the full analysis
+    and comparison payloads, keeping what's needed to list and reload an attempt.
+    """
+    analysis = attempt.get("analysis_result") or {}
+    comparison = attempt.get("comparison") or {}
+    return {
+        "attempt_id": attempt.get("attempt_id"),
+        "timestamp": attempt.get("timestamp"),
+        "concept": attempt.get("concept"),
+        "target_audience": attempt.get("target_audience"),
+        "explanation_text": attempt.get("explanation_text"),
+        "session_id": attempt.get("session_id"),
+        "summary": analysis.get("summary"),
+        "gap_count": len(analysis.get("gaps") or []),
+        "improvement_status": comparison.get("improvement_status"),
+    }
+
 def load_attempt(attempt_id: str) -> dict | None:
     """
     Retrieve a specific attempt by ID.
@@ -0,0 +1,47 @@
+import logging
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class DraftAttemptStore:
+    """
+    In-memory attempts that were analyzed but not saved yet (live speech analyzes when recording stops,
+    before the user decides to submit). A draft is saved when the client submits it unchanged, and
+    otherwise dropped: replaced by a fresh analysis, or expired after DRAFT_ATTEMPT_TTL_SECONDS.
+    """
+    def __init__(self, ttl_seconds: int, max_drafts: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_drafts = max_drafts
+        # Ordered by creation, so eviction only ever looks at the oldest entries
+        self._drafts: OrderedDict[str, dict] = OrderedDict()
+        self._lock = Lock()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired drafts, then the oldest ones above capacity. Caller holds _lock."""
+        while self._drafts:
+            draft_id, draft = next(iter(self._drafts.items()))
+            if now - draft["created_at"] < self.ttl_seconds and len(self._drafts) <= self.max_drafts:
+                break
+            del self._drafts[draft_id]
+            logger.info(f"Dropped unsubmitted draft attempt {draft_id}")
+
+    def put(self, draft_id: str, request: dict, attempt: dict, response: dict) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._drafts[draft_id] = {"request": request, "attempt": attempt, "response": response, "created_at": now}
+            self._evict(now)
+
+    def pop(self, draft_id: str) -> dict | None:
+        """Take a draft out of the store (each draft is saved or dropped exactly once)."""
+        with self._lock:
+            self._evict(time.monotonic())
+            return self._drafts.pop(draft_id, None)
+
+draft_store = DraftAttemptStore(
+    ttl_seconds=settings.DRAFT_ATTEMPT_TTL_SECONDS,
+    max_drafts=settings.DRAFT_ATTEMPT_MAX,
+)
@@ -0,0 +1,193 @@
+import json
+import logging
+import os
+from datetime import datetime
+from threading import RLock
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_DIR = "data/history"
+PROGRESS_FILE = os.path.join(PROGRESS_DIR, "progress.json")
+
+# Trend series are capped so a single concept entry stays small
+TREND_WINDOW = 50
+
+# One lock for the attempts log and the aggregates folded from it (attempts_store holds it while
+# appending and folding, so saves are folded in log order and a first-load rebuild can't race a save).
+# Re-entrant because a rebuild reads the log through load_attempts.
+history_lock = RLock()
+_progress: dict | None = None
+
+def _concept_key(concept: str) -> str:
+    """Normalize a concept name so 'Entropy' and ' entropy ' share one entry."""
+    return " ".join((concept or "unknown").lower().split())
+
+def _new_entry(attempt: dict) -> dict:
+    return {
+        "concept": attempt.get("concept", "Unknown"),
+        "attempt_count": 0,
+        "first_attempt_at": attempt.get("timestamp"),
+        "last_attempt_at": None,
+        "last_attempt_id": None,
+        "gap_counts": [],
+        "filler_density": [],
+        "last_improvement_status": None,
+        "improvement_counts": {"better": 0, "same": 0, "worse": 0},
+    }
+
+def _append_trend(series: list, point: dict) -> None:
+    series.append(point)
+    if len(series) > TREND_WINDOW:
+        del series[:-TREND_WINDOW]
+
+def _apply(entry: dict, attempt: dict) -> None:
+    """Fold a single attempt into an aggregate entry in O(1)."""
+    analysis = attempt.get("analysis_result") or {}
+    timestamp = attempt.get("timestamp")
+    attempt_id = attempt.get("attempt_id")
+
+    entry["concept"] = attempt.get("concept", entry["concept"])
+    entry["attempt_count"] += 1
+    entry["last_attempt_at"] = timestamp
+    entry["last_attempt_id"] = attempt_id
+
+    gaps = analysis.get("gaps") or []
+    _append_trend(entry["gap_counts"], {
+        "timestamp": timestamp,
+        "attempt_id": attempt_id,
+        "count": len(gaps),
+    })
+
+    fillers = analysis.get("filler_analysis") or {}
+    _append_trend(entry["filler_density"], {
+        "timestamp": timestamp,
+        "attempt_id": attempt_id,
+        "density": fillers.get("filler_density", 0.0),
+    })
+
+    status = (attempt.get("comparison") or {}).get("improvement_status")
+    if status:
+        entry["last_improvement_status"] = status
+        if status in entry["improvement_counts"]:
+            entry["improvement_counts"][status] += 1
+
+def _fold(progress: dict, attempt: dict) -> None:
+    key = _concept_key(attempt.get("concept"))
+    concepts = progress["concepts"]
+    if key not in concepts:
+        concepts[key] = _new_entry(attempt)
+    _apply(concepts[key], attempt)
+
+    session_id = attempt.get("session_id")
+    if session_id:
+        sessions = progress["sessions"]
+        if session_id not in sessions:
+            sessions[session_id] = _new_entry(attempt)
+        _apply(sessions[session_id], attempt)
+
+def _write(progress: dict) -> None:
+    # Rewrites the whole file, O(concepts + sessions) per save; small next to the attempts log that save_attempt rewrites
+    progress["updated_at"] = datetime.utcnow().isoformat()
+    tmp_path = PROGRESS_FILE + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(progress, f, indent=2, default=str)
+    os.replace(tmp_path, PROGRESS_FILE)
+
+def _build_from_log() -> dict:
+    # Imported lazily: attempts_store calls into this module on every save
+    from app.memory.attempts_store import load_attempts
+
+    progress = {"concepts": {}, "sessions": {}}
+    attempts = load_attempts()
+    # load_attempts returns newest first; aggregates must be folded oldest first
+    for attempt in reversed(attempts):
+        _fold(progress, attempt)
+    logger.info(f"Rebuilt progress aggregates from {len(attempts)} attempts")
+    return progress
+
+def _get_progress() -> dict:
+    """Return the in-memory aggregates, loading or rebuilding them on first use. Caller holds history_lock."""
+    _ensure_loaded()
+    return _progress
+
+def _ensure_loaded() -> bool:
+    """Load the aggregates if needed. Returns True when they were rebuilt from the log."""
+    global _progress
+    if _progress is not None:
+        return False
+
+    if os.path.exists(PROGRESS_FILE):
+        try:
+            with open(PROGRESS_FILE, "r", encoding="utf-8") as f:
+                _progress = json.load(f)
+            return False
+        except (json.JSONDecodeError, OSError) as e:
+            logger.error(f"Progress file unreadable, rebuilding: {e}")
+
+    _progress = _build_from_log()
+    _write(_progress)
+    return True
+
+def update_progress(attempt: dict) -> None:
+    """
+    Fold a newly saved attempt into the per-concept and per-session aggregates.
+    Called by save_attempt, still holding history_lock, right after the attempt has been appended.
+    """
+    with history_lock:
+        # A rebuild already folds this attempt in, since it is saved before we are called
+        if _ensure_loaded():
+            return
+        _fold(_progress, attempt)
+        _write(_progress)
+
+def rebuild_progress() -> dict:
+    """
+    Discard the current aggregates and recompute them from the attempts log.
+    """
+    global _progress
+    with history_lock:
+        _progress = _build_from_log()
+        _write(_progress)
+        return {
+            "concepts": len(_progress["concepts"]),
+            "sessions": len(_progress["sessions"]),
+        }
+
+def get_concept_progress(concept: str) -> dict | None:
+    """
+    Retrieve the aggregate entry for a single concept.
+    """
+    with history_lock:
+        entry = _get_progress()["concepts"].get(_concept_key(concept))
+        return json.loads(json.dumps(entry)) if entry else None
+
+def get_session_progress(session_id: str) -> dict | None:
+    """
+    Retrieve the aggregate entry for a single interview session.
+    """
+    with history_lock:
+        entry = _get_progress()["sessions"].get(session_id)
+        return json.loads(json.dumps(entry)) if entry else None
+
+def list_progress() -> list[dict]:
+    """
+    Compact overview of every concept, most recently practised first.
+    """
+    with history_lock:
+        concepts = _get_progress()["concepts"]
+        overview = []
+        for key, entry in concepts.items():
+            last_gaps = entry["gap_counts"][-1]["count"] if entry["gap_counts"] else None
+            last_density = entry["filler_density"][-1]["density"] if entry["filler_density"] else None
+            overview.append({
+                "concept_key": key,
+                "concept": entry["concept"],
+                "attempt_count": entry["attempt_count"],
+                "last_attempt_at": entry["last_attempt_at"],
+                "last_gap_count": last_gaps,
+                "last_filler_density": last_density,
+                "last_improvement_status": entry["last_improvement_status"],
+            })
+
+    overview.sort(key=lambda x: x.get("last_attempt_at") or "", reverse=True)
+    return overview
@@ -0,0 +1,90 @@
+import logging
+import time
+from collections import OrderedDict
+from itertools import count
+from threading import Lock
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class InterviewSessionStore:
+    """
+    In-memory transcripts for interview sessions, evicted after INTERVIEW_SESSION_TTL_SECONDS of inactivity.
+
+    Each session keeps the chat history (system prompt, then alternating user/assistant turns) and is
+    pinned to one llama-server slot, so every turn extends the prompt that slot already has cached.
+    """
+    def __init__(self, ttl_seconds: int, max_sessions: int, slots: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.slots = max(1, slots)
+        # Ordered by last use so eviction only ever looks at the oldest entries
+        self._sessions: OrderedDict[str, dict] = OrderedDict()
+        self._slot_counter = count()
+        self._lock = Lock()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired sessions, then the least recently used ones above capacity. Caller holds _lock."""
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if now - session["last_used"] < self.ttl_seconds and len(self._sessions) <= self.max_sessions:
+                break
+            del self._sessions[session_id]
+            logger.info(f"Evicted interview session {session_id}")
+
+    def start_turn(self, session_id: str, system_prompt: str, turn_index: int, user_prompt: str) -> tuple[list[dict], int]:
+        """
+        Append the user's turn to the session transcript, creating the session if needed.
+        A repeated turn_index (client retry) replaces that turn instead of appending a duplicate.
+        Returns the messages to send and the slot the session is pinned to.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = {
+                    "messages": [{"role": "system", "content": system_prompt}],
+                    "slot_id": next(self._slot_counter) % self.slots,
+                    "created_at": now,
+                }
+                self._sessions[session_id] = session
+                logger.info(f"Created interview session {session_id} on slot {session['slot_id']}")
+
+            # System prompt plus one user/assistant pair per completed turn
+            del session["messages"][1 + 2 * max(turn_index - 1, 0):]
+            session["messages"].append({"role": "user", "content": user_prompt})
+            session["last_used"] = now
+            self._sessions.move_to_end(session_id)
+            return list(session["messages"]), session["slot_id"]
+
+    def finish_turn(self, session_id: str, reply: str) -> None:
+        """
+        Record the model's reply verbatim so the next turn's prompt shares the cached prefix.
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or session["messages"][-1]["role"] != "user":
+                return
+            session["messages"].append({"role": "assistant", "content": reply})
+            session["last_used"] = time.monotonic()
+
+    def get(self, session_id: str) -> dict | None:
+        with self._lock:
+            self._evict(time.monotonic())
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            return {
+                "session_id": session_id,
+                "slot_id": session["slot_id"],
+                "turns": sum(1 for m in session["messages"] if m["role"] == "assistant"),
+                "messages": list(session["messages"]),
+            }
+
+session_store = InterviewSessionStore(
+    ttl_seconds=settings.INTERVIEW_SESSION_TTL_SECONDS,
+    max_sessions=settings.INTERVIEW_MAX_SESSIONS,
+    slots=settings.LLM_SLOTS,
+)
@@ -2,6 +2,9 @@ from enum import Enum
 
 class PromptMode(Enum):
     FEYNMAN_ANALYSIS = "feynman_analysis"
+    DELTA_ANALYSIS = "delta_analysis"
+    SEGMENT_ANALYSIS = "segment_analysis"
+    SEGMENT_REDUCE = "segment_reduce"
 
 PROFESSOR_FEYNMAN_SYSTEM_PROMPT = """You are Richard Feynman acting as a supportive Professor. Help a student learn by analyzing their explanation.
 
@@ -70,6 +73,69 @@ Required JSON Structure:
 }
 """
 
+DELTA_FEYNMAN_SYSTEM_PROMPT = """You are Richard Feynman acting as a supportive Professor. A student has revised an explanation you already reviewed.
+
+Return ONLY raw JSON. No markdown. No intro/outro.
+
+Instructions:
+1. Judge ONLY the changed and removed sentences; the rest of the explanation was already reviewed.
+2. Decide which of the previously identified gaps the changes resolve (by their numbers).
+3. List any new gaps the changes introduce.
+4. Ask follow-up questions about the explanation as it now stands.
+5. Keep it short.
+
+Required JSON Structure:
+{
+    "summary": "assessment of the revision",
+    "resolved_gaps": [1, 3],
+    "new_gaps": ["list", "of", "new", "missing", "logic"],
+    "suggestions": ["list", "of", "tips"],
+    "follow_up_questions": ["question 1", "question 2"]
+}
+"""
+
+SEGMENT_FEYNMAN_SYSTEM_PROMPT = """You are Richard Feynman acting as a supportive Professor. You are reviewing ONE part of a student's long explanation.
+
+Return ONLY raw JSON. No markdown. No intro/outro.
+
+Instructions:
+1. Judge only the logic and accuracy of this part.
+2. Do NOT list as gaps topics that other parts of the explanation probably cover.
+3. Keep it short: at most 3 gaps and 3 suggestions.
+
+Required JSON Structure:
+{
+    "summary": "one-sentence assessment of this part",
+    "gaps": ["list", "of", "missing", "logic"],
+    "suggestions": ["list", "of", "tips"]
+}
+"""
+
+SEGMENT_REDUCE_SYSTEM_PROMPT = """You are Richard Feynman acting as a supportive Professor. A student's long explanation was reviewed part by part; combine those reviews into one.
+
+Return ONLY raw JSON. No markdown. No intro/outro.
+
+Instructions:
+1. Write one overall summary of the whole explanation.
+2. Merge the gaps: drop duplicates and gaps that a later part resolves, keep the most important (at most 6).
+3. Merge the suggestions the same way (at most 5).
+4. Generate 2-3 'follow_up_questions' that help the student build up their understanding.
+
+Required JSON Structure:
+{
+    "summary": "assessment",
+    "gaps": ["list", "of", "missing", "logic"],
+    "suggestions": ["list", "of", "tips"],
+    "follow_up_questions": ["question1", "question2"],
+    "speaking_clarity": {
+        "issues": ["rambling", "run-on sentences", "filler words"],
+        "suggestions": ["pause more", "break it down"]
+    },
+    "speaking_metrics": { /* Optional if speech was used */ },
+    "filler_analysis": { /* Optional if fillers detected */ }
+}
+"""
+
 FEYNMAN_SYSTEM_PROMPT = PROFESSOR_FEYNMAN_SYSTEM_PROMPT # Alias for backward compatibility if needed, but we should update usage sites.
 
 FEYNMAN_USER_PROMPT_TEMPLATE = """
@@ -83,6 +149,52 @@ User Explanation:
 Analyze this explanation strictly using the Feynman principles.
 """
 
+DELTA_USER_PROMPT_TEMPLATE = """
+Context: The user is explaining '{concept}' to a '{target_audience}'.
+
+Previously identified gaps:
+{previous_gaps}
+
+Changed or added sentences:
+{changed_sentences}
+
+Removed sentences:
+{removed_sentences}
+
+Judge only these changes using the Feynman principles.
+"""
+
+SEGMENT_USER_PROMPT_TEMPLATE = """
+Context: The user is explaining '{concept}' to a '{target_audience}'.
+
+Part {index} of {count} of the explanation:
+"{segment}"
+
+Analyze this part strictly using the Feynman principles.
+"""
+
+SEGMENT_REDUCE_USER_PROMPT_TEMPLATE = """
+Context: The user is explaining '{concept}' to a '{target_audience}'.
+
+Reviews of each part, in order:
+{segment_summaries}
+
+Gaps found across the parts:
+{gaps}
+
+Suggestions across the parts:
+{suggestions}
+
+{speaking_context}
+
+Combine these into one review of the whole explanation.
+"""
+
+def _numbered(items: list[str], bullet: bool = False) -> str:
+    if not items:
+        return "(none)"
+    return "\n".join(f"- {item}" if bullet else f"{i}. {item}" for i, item in enumerate(items, start=1))
+
 def get_prompt_template(mode: PromptMode, **kwargs) -> str:
     if mode == PromptMode.FEYNMAN_ANALYSIS:
         # Default empty string for optional params if not provided
@@ -90,4 +202,29 @@ def get_prompt_template(mode: PromptMode, **kwargs) -> str:
             kwargs["speaking_context"] = ""
             
         return FEYNMAN_USER_PROMPT_TEMPLATE.format(**kwargs)
+    if mode == PromptMode.DELTA_ANALYSIS:
+        return DELTA_USER_PROMPT_TEMPLATE.format(
+            concept=kwargs["concept"],
+            target_audience=kwargs["target_audience"],
+            previous_gaps=_numbered(kwargs.get("previous_gaps", [])),
+            changed_sentences=_numbered(kwargs.get("changed_sentences", []), bullet=True),
+            removed_sentences=_numbered(kwargs.get("removed_sentences", []), bullet=True)
+        )
+    if mode == PromptMode.SEGMENT_ANALYSIS:
+        return SEGMENT_USER_PROMPT_TEMPLATE.format(
+            concept=kwargs["concept"],
+            target_audience=kwargs["target_audience"],
+            index=kwargs["index"],
+            count=kwargs["count"],
+            segment=kwargs["segment"]
+        )
+    if mode == PromptMode.SEGMENT_REDUCE:
+        return SEGMENT_REDUCE_USER_PROMPT_TEMPLATE.format(
+            concept=kwargs["concept"],
+            target_audience=kwargs["target_audience"],
+            segment_summaries=_numbered(kwargs.get("segment_summaries", [])),
+            gaps=_numbered(kwargs.get("gaps", []), bullet=True),
+            suggestions=_numbered(kwargs.get("suggestions", []), bullet=True),
+            speaking_context=kwargs.get("speaking_context", "")
+        )
     return ""
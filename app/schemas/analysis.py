@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional, Any, Literal
+from app.services.retrieval import RETRIEVAL_STRATEGIES
 
 class AnalysisRequest(BaseModel):
     concept: str = Field(..., description="The concept being explained")
@@ -16,6 +17,18 @@ class AnalysisRequest(BaseModel):
     # Phase 4b: Interview Loop
     session_id: Optional[str] = None
     turn_index: int = 1
+    # Retrieval (defaults: RETRIEVAL_STRATEGY / CONTEXT_COMPRESSION)
+    retrieval_strategy: Optional[str] = Field(None, description="Reference selection: 'keyword', 'bm25' or 'tfidf'")
+    context_compression: Optional[Literal["off", "extractive", "llm"]] = None
+    # Live speech: the unsaved analysis from when recording stopped; saved as-is if nothing changed since
+    draft_id: Optional[str] = None
+
+    @field_validator("retrieval_strategy")
+    @classmethod
+    def check_retrieval_strategy(cls, value):
+        if value is not None and value not in RETRIEVAL_STRATEGIES:
+            raise ValueError(f"Unknown retrieval strategy. Available: {', '.join(RETRIEVAL_STRATEGIES)}")
+        return value
 
 class AnalysisResponse(BaseModel):
     analysis: dict
@@ -26,4 +39,12 @@ class AnalysisResponse(BaseModel):
     conversation_complete: bool = False
     session_id: Optional[str] = None
     turn_index: int = 1
+    # Live speech: not saved yet, attempt_id is the draft id to submit
+    draft: bool = False
+
 
+class BatchAnalysisRequest(BaseModel):
+    items: List[AnalysisRequest] = Field(..., description="Explanations to analyze")
+    # Shared reference material for items that don't carry their own source_text
+    source_text: Optional[str] = None
+    max_concurrency: Optional[int] = Field(None, ge=1, description="Overrides BATCH_MAX_CONCURRENCY (capped by it)")
@@ -0,0 +1,82 @@
+import asyncio
+import hashlib
+import logging
+from typing import AsyncIterator
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.schemas.analysis import AnalysisRequest, BatchAnalysisRequest
+from app.services.feynman_analyzer import get_analyzer_service
+
+logger = logging.getLogger(__name__)
+
+class BatchAnalyzer:
+    """
+    Runs many analyses with bounded parallelism and yields progress events as items finish.
+    Each distinct source document is chunked once and shared by every item that references it.
+    """
+    @property
+    def analyzer(self):
+        return get_analyzer_service()
+
+    def _prepare_items(self, batch: BatchAnalysisRequest) -> tuple[list[AnalysisRequest], dict[str, list[dict]]]:
+        items = []
+        chunk_cache = {}
+
+        for item in batch.items:
+            if not item.source_text and batch.source_text:
+                item = item.model_copy(update={"source_text": batch.source_text})
+            items.append(item)
+
+            if item.source_text:
+                key = hashlib.sha256(item.source_text.encode("utf-8")).hexdigest()
+                if key not in chunk_cache:
+                    chunk_cache[key] = self.analyzer.chunker.chunk_text(item.source_text)
+
+        logger.info(f"Batch prepared: {len(items)} items, {len(chunk_cache)} distinct source documents")
+        return items, chunk_cache
+
+    async def stream(self, batch: BatchAnalysisRequest) -> AsyncIterator[dict]:
+        # Chunking every distinct source document is CPU-bound; keep it off the event loop
+        items, chunk_cache = await run_in_threadpool(self._prepare_items, batch)
+        total = len(items)
+        limit = min(batch.max_concurrency or settings.BATCH_MAX_CONCURRENCY, settings.BATCH_MAX_CONCURRENCY)
+        semaphore = asyncio.Semaphore(limit)
+
+        async def run(index: int, item: AnalysisRequest) -> tuple[int, dict | None, str | None]:
+            chunks = None
+            if item.source_text:
+                chunks = chunk_cache[hashlib.sha256(item.source_text.encode("utf-8")).hexdigest()]
+            async with semaphore:
+                try:
+                    response = await run_in_threadpool(self.analyzer.analyze_explanation, item, chunks)
+                    return index, response.model_dump(), None
+                except Exception as e:
+                    logger.error(f"Batch item {index} failed: {e}", exc_info=True)
+                    return index, None, str(e)
+
+        yield {"event": "started", "total": total, "concurrency": limit}
+
+        tasks = [asyncio.create_task(run(i, item)) for i, item in enumerate(items)]
+        succeeded = 0
+        failed = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, response, error = await next_done
+                if error is None:
+                    succeeded += 1
+                    event = {"event": "result", "index": index, "status": "ok", "response": response}
+                else:
+                    failed += 1
+                    event = {"event": "result", "index": index, "status": "error", "error": error}
+                event["progress"] = {"completed": succeeded + failed, "failed": failed, "total": total}
+                yield event
+        finally:
+            # Client went away mid-stream: don't keep queued items waiting on the model
+            for task in tasks:
+                task.cancel()
+
+        yield {"event": "done", "total": total, "succeeded": succeeded, "failed": failed}
+
+batch_analyzer = BatchAnalyzer()
@@ -1,12 +1,15 @@
 import json
 import logging
-from app.services.llm_engine import llm_engine
+from app.core.config import settings
+from app.core.metrics import comparator_fast_path
+from app.services.heuristic_comparator import compare_heuristically
+from app.services.llm_engine import get_llm_engine
 
 logger = logging.getLogger(__name__)
 
 class ExplanationComparator:
     def __init__(self):
-        self.llm = llm_engine
+        self.llm = get_llm_engine()
 
     def clean_json_string(self, json_str: str) -> str:
         json_str = json_str.strip()
@@ -18,10 +21,22 @@ class ExplanationComparator:
             json_str = json_str[:-3]
         return json_str.strip()
 
-    def compare_attempts(self, old_analysis: dict, new_analysis: dict) -> dict:
+    def compare_attempts(self, old_analysis: dict, new_analysis: dict, old_text: str | None = None, new_text: str | None = None) -> dict:
         """
         Compares two analysis results to generate progress feedback.
+        Clear-cut cases (gaps only resolved, only introduced, or unchanged) are decided locally;
+        the LLM is only asked when the signals disagree.
         """
+        if settings.COMPARATOR_FAST_PATH_ENABLED:
+            try:
+                result = compare_heuristically(old_analysis, new_analysis, old_text, new_text, settings.COMPARATOR_GAP_MATCH_THRESHOLD)
+            except Exception as e:
+                logger.error(f"Heuristic comparison failed: {e}")
+                result = None
+            comparator_fast_path.inc(result="hit" if result else "miss")
+            if result:
+                return result
+
         prompt = f"""
 You are a mentor tracking a student's progress. Compare their previous attempt vs current attempt.
 
@@ -43,7 +58,8 @@ Output valid JSON only:
         try:
             raw_response = self.llm.generate(
                 system_prompt="You are a helpful mentor.",
-                user_prompt=prompt
+                user_prompt=prompt,
+                task="comparison"
             )
             cleaned = self.clean_json_string(raw_response)
             return json.loads(cleaned)
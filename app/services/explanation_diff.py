@@ -0,0 +1,49 @@
+import difflib
+import re
+
+# Split after sentence-ending punctuation; good enough for spoken/typed explanations
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+def split_sentences(text: str) -> list[str]:
+    """Split text into whitespace-normalized sentences."""
+    sentences = []
+    for sentence in SENTENCE_BOUNDARY.split(text or ""):
+        sentence = " ".join(sentence.split())
+        if sentence:
+            sentences.append(sentence)
+    return sentences
+
+def diff_explanations(old_text: str, new_text: str) -> dict:
+    """
+    Sentence-level diff of a revised explanation against the previous one.
+
+    Returns:
+    - changed_sentences: sentences of the new text that were added or rewritten
+    - removed_sentences: sentences of the old text that were dropped or rewritten
+    - unchanged_count: sentences carried over as-is
+    - change_ratio: share of the text (by characters) that changed, 0.0 - 1.0
+    """
+    old_sentences = split_sentences(old_text)
+    new_sentences = split_sentences(new_text)
+
+    changed = []
+    removed = []
+    unchanged = 0
+    matcher = difflib.SequenceMatcher(a=old_sentences, b=new_sentences, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            unchanged += i2 - i1
+            continue
+        removed.extend(old_sentences[i1:i2])
+        changed.extend(new_sentences[j1:j2])
+
+    changed_chars = sum(len(s) for s in changed) + sum(len(s) for s in removed)
+    total_chars = sum(len(s) for s in old_sentences) + sum(len(s) for s in new_sentences)
+    change_ratio = round(changed_chars / total_chars, 3) if total_chars else 0.0
+
+    return {
+        "changed_sentences": changed,
+        "removed_sentences": removed,
+        "unchanged_count": unchanged,
+        "change_ratio": change_ratio
+    }
@@ -0,0 +1,81 @@
+import math
+
+from app.services.explanation_diff import split_sentences
+from app.services.heuristic_comparator import token_set_similarity
+
+# Same rough estimate the rest of the app uses for English text
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(text: str) -> int:
+    return len(text or "") // CHARS_PER_TOKEN
+
+def _split_long(sentence: str, max_chars: int) -> list[str]:
+    """Speech transcripts often have no punctuation: cut run-on "sentences" at word boundaries."""
+    if len(sentence) <= max_chars:
+        return [sentence]
+    pieces, current, length = [], [], 0
+    for word in sentence.split():
+        if current and length + len(word) + 1 > max_chars:
+            pieces.append(" ".join(current))
+            current, length = [], 0
+        current.append(word)
+        length += len(word) + 1
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+def segment_explanation(text: str, max_tokens: int) -> list[str]:
+    """
+    Split a long explanation into segments of about max_tokens, cut at sentence boundaries
+    (word boundaries inside run-on sentences) and, where possible, at paragraph breaks.
+
+    The segment count is fixed first and the text is split evenly across it, so the parallel
+    segment calls finish at about the same time (greedy packing would leave a short tail segment).
+    Segments can overshoot the target size by up to half a sentence (or half a segment when cut at a paragraph).
+    """
+    # Pieces of at most a quarter segment keep the cuts close to the target size
+    piece_chars = max(1, max_tokens * CHARS_PER_TOKEN // 4)
+    paragraphs = [
+        [piece for sentence in split_sentences(p) for piece in _split_long(sentence, piece_chars)]
+        for p in (text or "").replace("\r\n", "\n").split("\n\n")
+    ]
+    paragraphs = [p for p in paragraphs if p]
+    total_chars = sum(len(s) + 1 for p in paragraphs for s in p)
+    if not total_chars:
+        return []
+
+    count = max(1, math.ceil(total_chars / (max_tokens * CHARS_PER_TOKEN)))
+    target = total_chars / count
+
+    # Cuts are aimed at fixed offsets (target, 2 * target, ...) so early short segments don't push text into the last one
+    segments = []
+    current: list[str] = []
+    consumed = 0
+    boundary = target
+    for paragraph in paragraphs:
+        paragraph_chars = sum(len(s) + 1 for s in paragraph)
+        # Prefer a paragraph break when the paragraph won't fit and we are within half a segment of the cut
+        if current and len(segments) < count - 1 and consumed + paragraph_chars > boundary and consumed >= boundary - target / 2:
+            segments.append(" ".join(current))
+            current = []
+            boundary += target
+        for sentence in paragraph:
+            # Otherwise cut at the sentence boundary closest to the target offset
+            if current and len(segments) < count - 1 and consumed + (len(sentence) + 1) / 2 > boundary:
+                segments.append(" ".join(current))
+                current = []
+                boundary += target
+            current.append(sentence)
+            consumed += len(sentence) + 1
+    if current:
+        segments.append(" ".join(current))
+    return segments
+
+def dedupe_similar(items: list[str], threshold: float) -> list[str]:
+    """Drop items that say the same thing as an earlier one (token-set similarity at or above threshold)."""
+    kept: list[str] = []
+    for item in items:
+        item = str(item).strip()
+        if item and all(token_set_similarity(item, other) < threshold for other in kept):
+            kept.append(item)
+    return kept
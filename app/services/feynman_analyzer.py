@@ -3,17 +3,27 @@ import logging
 import uuid
 import asyncio
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 
-from app.services.llm_engine import llm_engine
-from app.prompts.templates import FEYNMAN_SYSTEM_PROMPT, PROFESSOR_FEYNMAN_SYSTEM_PROMPT, INTERVIEWER_FEYNMAN_SYSTEM_PROMPT, get_prompt_template, PromptMode
+from app.services.llm_engine import get_llm_engine
+from app.core.config import settings
+from app.core.metrics import stage
+from app.core.profiling import profiled
+from app.prompts.templates import FEYNMAN_SYSTEM_PROMPT, PROFESSOR_FEYNMAN_SYSTEM_PROMPT, INTERVIEWER_FEYNMAN_SYSTEM_PROMPT, DELTA_FEYNMAN_SYSTEM_PROMPT, SEGMENT_FEYNMAN_SYSTEM_PROMPT, SEGMENT_REDUCE_SYSTEM_PROMPT, get_prompt_template, PromptMode
 from app.schemas.analysis import AnalysisRequest, AnalysisResponse
 
 # Logic Services
 from app.services.text_chunker import TextChunker
 from app.services.context_selector import ContextSelector
 from app.services.explanation_comparator import ExplanationComparator
+from app.services.explanation_diff import diff_explanations
+from app.services.explanation_segmenter import dedupe_similar, estimate_tokens, segment_explanation
+from app.services.retrieval import chunk_id, compress_chunks
 from app.memory.attempts_store import save_attempt, load_attempt
+from app.memory.draft_store import draft_store
+from app.memory.session_store import session_store
 
 logger = logging.getLogger(__name__)
 
@@ -22,9 +32,32 @@ FILLER_WORDS = [
     "so", "kind of", "sort of", "i mean", "right", "you see"
 ]
 
+# One alternation over all fillers, longest phrases first so multi-word fillers win over shorter prefixes
+FILLER_PATTERN = re.compile(
+    r'\b(?:' + '|'.join(re.escape(f) for f in sorted(FILLER_WORDS, key=len, reverse=True)) + r')\b',
+    re.IGNORECASE
+)
+
+# IGNORECASE also matches Unicode case variants ("ſo", "liKe" with the Kelvin sign): report them as the filler they match
+FILLER_CANONICAL = {f.casefold(): f for f in FILLER_WORDS}
+FILLER_ORDER = {f: i for i, f in enumerate(FILLER_WORDS)}
+
+def canonical_filler(matched: str) -> str:
+    folded = matched.casefold()
+    return FILLER_CANONICAL.get(folded, folded)
+
+def filler_sort_key(counts: dict):
+    """Most frequent first; ties keep FILLER_WORDS order."""
+    return lambda k: (-counts[k], FILLER_ORDER.get(k, len(FILLER_WORDS)), k)
+
+# Keys of the previous analysis a delta re-analysis carries forward (filler numbers are recomputed separately)
+DELTA_CARRIED_KEYS = ("summary", "gaps", "suggestions", "speaking_clarity", "follow_up_questions")
+
+PARSE_FALLBACK_SUMMARY = "We couldn't process the AI response correctly."
+
 class FeynmanAnalyzer:
     def __init__(self):
-        self.llm = llm_engine
+        self.llm = get_llm_engine()
         self.chunker = TextChunker()
         self.selector = ContextSelector()
         self.comparator = ExplanationComparator()
@@ -41,84 +74,77 @@ class FeynmanAnalyzer:
         return json_str.strip()
 
     def _analyze_fillers(self, text: str) -> dict:
-        """Detect common filler words in the text."""
-        if barely_text:= (not text or len(text.split()) < 5):
+        """Detect common filler words in the text with a single regex pass."""
+        if not text:
             return None
 
-        found_fillers = {}
-        total_count = 0
-        
         # Normalize text slightly for word count, but regex handles matching
         word_count = len(text.split())
-        
-        for filler in FILLER_WORDS:
-            # Pattern for detecting fillers as whole words/phrases
-            pattern = r'\b' + re.escape(filler) + r'\b'
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            count = len(matches)
-            if count > 0:
-                found_fillers[filler] = count
-                total_count += count
-        
+        if word_count < 5:
+            return None
+
+        found_fillers = {}
+        positions = []
+
+        for match in FILLER_PATTERN.finditer(text):
+            filler = canonical_filler(match.group(0))
+            found_fillers[filler] = found_fillers.get(filler, 0) + 1
+            positions.append({"filler": filler, "start": match.start(), "end": match.end()})
+
+        total_count = len(positions)
         if total_count == 0:
             return None
 
         density = round(total_count / word_count, 3)
-        common = sorted(found_fillers.keys(), key=lambda k: found_fillers[k], reverse=True)[:3]
-        
+        # Ties keep FILLER_WORDS order, as the old one-pass-per-filler loop did
+        common = sorted(found_fillers, key=filler_sort_key(found_fillers))[:3]
+
         return {
             "total_filler_count": total_count,
             "filler_density": density,
-            "common_fillers": common
+            "common_fillers": common,
+            "filler_counts": found_fillers,
+            "filler_positions": positions
         }
 
-    def analyze_explanation(self, request: AnalysisRequest) -> AnalysisResponse:
-        logger.info(f"Analyzing concept: {request.concept}")
-        
-        # 1. Handle Source Text (RAG)
+    def _build_context(self, request: AnalysisRequest, chunks: list[dict] | None = None) -> tuple[str, list]:
+        """
+        Select reference material for the request.
+        `chunks` lets callers that analyze many explanations against one document chunk it once.
+        """
         context_str = ""
         used_chunk_ids = []
-        
-        if request.source_text:
-            logger.info("Processing source text for context...")
-            try:
-                # Chunk it
-                chunks = self.chunker.chunk_text(request.source_text)
-                # Select relevant chunks
-                query = f"{request.concept} {request.explanation}"
-                relevant_chunks = self.selector.select_context(query, chunks)
-                
-                if relevant_chunks:
-                    context_str = "\n\nReference Material:\n" + "\n---\n".join([c['text'] for c in relevant_chunks])
-                    used_chunk_ids = [c['id'] for c in relevant_chunks]
-                    logger.info(f"Found {len(relevant_chunks)} relevant chunks.")
-            except Exception as e:
-                logger.error(f"RAG processing failed: {e}")
-                # Continue without context rather than crashing
 
-        # 2. Prepare Prompt
-        logger.info(f"Analysis Purpose Mode: {request.purpose}")
+        if not request.source_text:
+            return context_str, used_chunk_ids
 
-        # Phase 4b: Interview Loop Logic
-        is_interview = (request.purpose == 'interview')
-        session_id = request.session_id or str(uuid.uuid4())
-        turn_index = request.turn_index
-        conversation_complete = False
-        
-        system_prompt_to_use = PROFESSOR_FEYNMAN_SYSTEM_PROMPT
+        logger.info("Processing source text for context...")
+        try:
+            # Chunk it (unless the caller already did)
+            if chunks is None:
+                with stage("chunking"):
+                    chunks = self.chunker.chunk_text(request.source_text)
+            # Select relevant chunks
+            query = f"{request.concept} {request.explanation}"
+            with stage("selection"):
+                relevant_chunks = self.selector.select_context(
+                    query, chunks, top_k=settings.RETRIEVAL_TOP_K, strategy=request.retrieval_strategy
+                )
+            with stage("compression"):
+                relevant_chunks = compress_chunks(query, relevant_chunks, request.context_compression)
 
-        if is_interview:
-            if turn_index >= 3:
-                # End of conversation: Force no new question
-                system_prompt_to_use = INTERVIEWER_FEYNMAN_SYSTEM_PROMPT.replace("Generate ONE specific 'interviewer_followup' question", "Do NOT generate any follow-up questions. State 'Interview Complete'.")
-                conversation_complete = True
-            else:
-                system_prompt_to_use = INTERVIEWER_FEYNMAN_SYSTEM_PROMPT
-        
-        if context_str:
-            system_prompt_to_use += f"\n\n{context_str}\n\nUse the Reference Material above to check the accuracy of the explanation."
+            if relevant_chunks:
+                context_str = "\n\nReference Material:\n" + "\n---\n".join([c['text'] for c in relevant_chunks])
+                used_chunk_ids = [chunk_id(c) for c in relevant_chunks]
+                logger.info(f"Found {len(relevant_chunks)} relevant chunks.")
+        except Exception as e:
+            logger.error(f"RAG processing failed: {e}")
+            # Continue without context rather than crashing
 
-        # 2a. Handle Speaking Metrics & Fillers
+        return context_str, used_chunk_ids
+
+    def _build_speaking_context(self, request: AnalysisRequest) -> tuple[str, dict | None, dict | None]:
+        """Filler and speaking-pace stats for the prompt. Returns (speaking_context, user_metrics, filler_stats)."""
         speaking_context = ""
         user_metrics = None
         filler_stats = None
@@ -162,21 +188,10 @@ class FeynmanAnalyzer:
             except Exception as e:
                 logger.error(f"Error processing speaking metrics: {e}")
 
-        user_prompt = get_prompt_template(
-            PromptMode.FEYNMAN_ANALYSIS,
-            concept=request.concept,
-            target_audience=request.target_audience,
-            explanation=request.explanation,
-            speaking_context=speaking_context
-        )
+        return speaking_context, user_metrics, filler_stats
 
-        # 3. Call LLM
-        raw_response = self.llm.generate(
-            system_prompt=system_prompt_to_use,
-            user_prompt=user_prompt
-        )
-
-        # 4. Parse Response
+    def _parse_analysis(self, raw_response: str, request: AnalysisRequest, user_metrics: dict | None, filler_stats: dict | None) -> dict:
+        """Parse the model's JSON and overlay the locally computed speaking/filler numbers."""
         analysis_data = {}
         try:
             cleaned_response = self.clean_json_string(raw_response)
@@ -206,6 +221,8 @@ class FeynmanAnalyzer:
                     "total_filler_count": filler_stats["total_filler_count"],
                     "filler_density": filler_stats["filler_density"],
                     "common_fillers": filler_stats["common_fillers"],
+                    "filler_counts": filler_stats["filler_counts"],
+                    "filler_positions": filler_stats["filler_positions"],
                     "insight": llm_fillers.get("insight", "Detected some filler words."),
                     "suggestions": llm_fillers.get("suggestions", ["Try to pause silently instead of using fillers."])
                  }
@@ -215,7 +232,7 @@ class FeynmanAnalyzer:
             logger.error(f"Failed to parse JSON response: {raw_response}")
             # Fallback
             analysis_data = {
-                "summary": "We couldn't process the AI response correctly.",
+                "summary": PARSE_FALLBACK_SUMMARY,
                 "gaps": ["System Error: Invalid JSON response"],
                 "suggestions": ["Please try again."],
                 "follow_up_questions": [],
@@ -225,20 +242,378 @@ class FeynmanAnalyzer:
                 }
             }
 
+        return analysis_data
+
+    def _plan_delta(self, request: AnalysisRequest, old_attempt: dict) -> dict | None:
+        """
+        Decide whether a revision can be analyzed incrementally.
+        Returns the sentence diff when the previous analysis can be carried forward, else None.
+        """
+        if not settings.DELTA_ANALYSIS_ENABLED or request.purpose == "interview" or request.input_mode != "text":
+            return None
+        old_analysis = old_attempt.get("analysis_result") or {}
+        summary = old_analysis.get("summary") or ""
+        # Nothing trustworthy to carry forward from a failed analysis
+        if not summary or summary == PARSE_FALLBACK_SUMMARY or summary.startswith("Error:"):
+            return None
+        if (old_attempt.get("concept") or "").strip().lower() != request.concept.strip().lower():
+            return None
+        if old_attempt.get("target_audience") != request.target_audience:
+            return None
+
+        diff = diff_explanations(old_attempt.get("explanation_text", ""), request.explanation)
+        if diff["change_ratio"] > settings.DELTA_MAX_CHANGE_RATIO:
+            return None
+        return diff
+
+    def _analyze_delta(self, request: AnalysisRequest, diff: dict, old_attempt: dict, context_str: str, filler_stats: dict | None) -> dict | None:
+        """
+        Re-analyze only the changed sentences of a revision, carrying the rest of the previous
+        analysis forward. Returns None if the model's answer can't be used (caller does a full analysis).
+        """
+        old_analysis = old_attempt.get("analysis_result") or {}
+        old_gaps = list(old_analysis.get("gaps") or [])
+        delta = {
+            "base_attempt_id": old_attempt.get("attempt_id"),
+            "change_ratio": diff["change_ratio"],
+            "changed_sentences": len(diff["changed_sentences"]),
+            "removed_sentences": len(diff["removed_sentences"]),
+            "unchanged_sentences": diff["unchanged_count"],
+            "resolved_gaps": []
+        }
+        result = {}
+
+        # Wording-only edits (whitespace, identical sentences) need no model call at all
+        if diff["changed_sentences"] or diff["removed_sentences"]:
+            with stage("prompt_build"):
+                system_prompt = DELTA_FEYNMAN_SYSTEM_PROMPT
+                if context_str:
+                    system_prompt += f"\n\n{context_str}\n\nUse the Reference Material above to check the accuracy of the changes."
+                user_prompt = get_prompt_template(
+                    PromptMode.DELTA_ANALYSIS,
+                    concept=request.concept,
+                    target_audience=request.target_audience,
+                    previous_gaps=old_gaps,
+                    changed_sentences=diff["changed_sentences"],
+                    removed_sentences=diff["removed_sentences"]
+                )
+            with stage("llm"):
+                raw_response = self.llm.generate(
+                    system_prompt=system_prompt,
+                    user_prompt=user_prompt,
+                    max_tokens=settings.DELTA_MAX_TOKENS,
+                    task="analysis"
+                )
+            with stage("parse"):
+                try:
+                    result = json.loads(self.clean_json_string(raw_response))
+                except (json.JSONDecodeError, ValueError):
+                    logger.warning("Delta analysis returned invalid JSON, falling back to a full analysis")
+                    return None
+                if not isinstance(result, dict) or "summary" not in result:
+                    return None
+
+        resolved = set()
+        for index in result.get("resolved_gaps") or []:
+            try:
+                resolved.add(int(index) - 1)
+            except (TypeError, ValueError):
+                continue
+        delta["resolved_gaps"] = [gap for i, gap in enumerate(old_gaps) if i in resolved]
+        remaining_gaps = [gap for i, gap in enumerate(old_gaps) if i not in resolved]
+
+        # Only what the delta re-judges or can stand for the whole text; pass-specific blocks ("segmented",
+        # "speaking_metrics", an earlier "delta") describe the previous run, not this one
+        analysis_data = {key: old_analysis[key] for key in DELTA_CARRIED_KEYS if key in old_analysis}
+        analysis_data["summary"] = result.get("summary") or old_analysis.get("summary")
+        analysis_data["gaps"] = remaining_gaps + [gap for gap in result.get("new_gaps") or [] if gap not in remaining_gaps]
+        if result.get("suggestions"):
+            analysis_data["suggestions"] = result["suggestions"]
+        if result.get("follow_up_questions"):
+            analysis_data["follow_up_questions"] = result["follow_up_questions"]
+
+        # Filler numbers are always recomputed locally for the full new text
+        old_fillers = old_analysis.get("filler_analysis") or {}
+        if filler_stats:
+            analysis_data["filler_analysis"] = {
+                "total_filler_count": filler_stats["total_filler_count"],
+                "filler_density": filler_stats["filler_density"],
+                "common_fillers": filler_stats["common_fillers"],
+                "filler_counts": filler_stats["filler_counts"],
+                "filler_positions": filler_stats["filler_positions"],
+                "insight": old_fillers.get("insight", "Detected some filler words."),
+                "suggestions": old_fillers.get("suggestions", ["Try to pause silently instead of using fillers."])
+            }
+        else:
+            analysis_data.pop("filler_analysis", None)
+
+        analysis_data["delta"] = delta
+        logger.info(f"Delta analysis: {delta['changed_sentences']} changed, {delta['removed_sentences']} removed, {len(resolved)} gaps resolved")
+        return analysis_data
+
+    def _plan_segments(self, request: AnalysisRequest, is_interview: bool) -> list[str] | None:
+        """Split the explanation for map-reduce analysis when it is too long for one prompt, else None."""
+        # Interview turns live in one pinned slot's transcript, so they are never split
+        if not settings.SEGMENTED_ANALYSIS_ENABLED or is_interview:
+            return None
+        if estimate_tokens(request.explanation) <= settings.SEGMENT_THRESHOLD_TOKENS:
+            return None
+        segments = segment_explanation(request.explanation, settings.SEGMENT_MAX_TOKENS)
+        return segments if len(segments) > 1 else None
+
+    def _analyze_segment(self, request: AnalysisRequest, system_prompt: str, segments: list[str], index: int) -> dict | None:
+        """Map step: review one segment. Returns None if the model's answer can't be used."""
+        user_prompt = get_prompt_template(
+            PromptMode.SEGMENT_ANALYSIS,
+            concept=request.concept,
+            target_audience=request.target_audience,
+            index=index + 1,
+            count=len(segments),
+            segment=segments[index]
+        )
+        # Spread segments over the slots; every slot then caches the shared system prompt once
+        raw_response = self.llm.generate(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            max_tokens=settings.SEGMENT_RESPONSE_MAX_TOKENS,
+            task="analysis",
+            slot_id=index % max(1, settings.LLM_SLOTS)
+        )
+        try:
+            result = json.loads(self.clean_json_string(raw_response))
+        except (json.JSONDecodeError, ValueError):
+            logger.warning(f"Segment {index + 1}/{len(segments)} returned invalid JSON, skipping it")
+            return None
+        if not isinstance(result, dict) or str(result.get("summary", "")).startswith("Error:"):
+            return None
+        return result
+
+    def _segmented_analysis(self, request: AnalysisRequest, segments: list[str], context_str: str, speaking_context: str,
+                            user_metrics: dict | None, filler_stats: dict | None) -> dict | None:
+        """
+        Map-reduce analysis of an explanation too long for one prompt: segments are reviewed in
+        parallel (one worker per llama-server slot), their gaps and suggestions deduplicated
+        locally, and one short reduce call writes the standard analysis.
+        Returns None if no segment could be analyzed (caller does a full analysis).
+        """
+        system_prompt = SEGMENT_FEYNMAN_SYSTEM_PROMPT
+        if context_str:
+            system_prompt += f"\n\n{context_str}\n\nUse the Reference Material above to check the accuracy of this part."
+
+        def run(index: int) -> dict | None:
+            try:
+                return self._analyze_segment(request, system_prompt, segments, index)
+            except Exception as e:
+                logger.error(f"Segment {index + 1}/{len(segments)} failed: {e}")
+                return None
+
+        with stage("segment_map"):
+            workers = max(1, min(len(segments), settings.LLM_SLOTS))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="segment") as pool:
+                results = [r for r in pool.map(run, range(len(segments))) if r]
+        if not results:
+            return None
+
+        summaries = [str(r["summary"]).strip() for r in results if r.get("summary")]
+        threshold = settings.COMPARATOR_GAP_MATCH_THRESHOLD
+        gaps = dedupe_similar([g for r in results for g in r.get("gaps") or []], threshold)
+        suggestions = dedupe_similar([s for r in results for s in r.get("suggestions") or []], threshold)
+
+        with stage("segment_reduce"):
+            user_prompt = get_prompt_template(
+                PromptMode.SEGMENT_REDUCE,
+                concept=request.concept,
+                target_audience=request.target_audience,
+                segment_summaries=summaries,
+                gaps=gaps,
+                suggestions=suggestions,
+                speaking_context=speaking_context
+            )
+            raw_response = self.llm.generate(
+                system_prompt=SEGMENT_REDUCE_SYSTEM_PROMPT,
+                user_prompt=user_prompt,
+                max_tokens=settings.SEGMENT_REDUCE_MAX_TOKENS,
+                task="analysis"
+            )
+
+        with stage("parse"):
+            analysis_data = self._parse_analysis(raw_response, request, user_metrics, filler_stats)
+            summary = analysis_data.get("summary") or ""
+            reduced_locally = summary == PARSE_FALLBACK_SUMMARY or summary.startswith("Error:")
+            if reduced_locally:
+                # The segment reviews are still good: merge them without the model
+                merged = {"summary": " ".join(summaries), "gaps": gaps, "suggestions": suggestions, "follow_up_questions": []}
+                analysis_data = self._parse_analysis(json.dumps(merged), request, user_metrics, filler_stats)
+
+        analysis_data["segmented"] = {
+            "segments": len(segments),
+            "analyzed": len(results),
+            "reduced_locally": reduced_locally
+        }
+        logger.info(f"Segmented analysis: {len(results)}/{len(segments)} segments, {len(gaps)} distinct gaps")
+        return analysis_data
+
+    def _interview_turn(self, session_id: str, turn_index: int, system_prompt: str, user_prompt: str) -> str:
+        """
+        Continue the server-side interview transcript so the model sees earlier turns.
+        Only the new turn has to be evaluated; the rest is already in the pinned slot's prompt cache.
+        """
+        messages, slot_id = session_store.start_turn(session_id, system_prompt, turn_index, user_prompt)
+        raw_response = self.llm.chat(messages=messages, slot_id=slot_id, task="interviewer")
+        session_store.finish_turn(session_id, raw_response)
+        return raw_response
+
+    def _full_analysis(self, request: AnalysisRequest, system_prompt_to_use: str, speaking_context: str,
+                       user_metrics: dict | None, filler_stats: dict | None, is_interview: bool,
+                       conversation_complete: bool, session_id: str, turn_index: int) -> dict:
+        """Analyze the whole explanation from scratch: build the prompt, call the model, parse."""
+        with stage("prompt_build"):
+            user_prompt = get_prompt_template(
+                PromptMode.FEYNMAN_ANALYSIS,
+                concept=request.concept,
+                target_audience=request.target_audience,
+                explanation=request.explanation,
+                speaking_context=speaking_context
+            )
+            if is_interview and conversation_complete:
+                # Said in the turn itself rather than by swapping the system prompt,
+                # so the session's cached prefix stays valid
+                user_prompt += "\nThis is the final turn. Do NOT generate any follow-up questions. State 'Interview Complete'."
+
+        # 3. Call LLM
+        with stage("llm"):
+            if is_interview:
+                raw_response = self._interview_turn(session_id, turn_index, system_prompt_to_use, user_prompt)
+            else:
+                raw_response = self.llm.generate(
+                    system_prompt=system_prompt_to_use,
+                    user_prompt=user_prompt,
+                    task="analysis"
+                )
+
+        # 4. Parse Response
+        with stage("parse"):
+            analysis_data = self._parse_analysis(raw_response, request, user_metrics, filler_stats)
+
+        return analysis_data
+
+    def analyze_explanation(self, request: AnalysisRequest, chunks: list[dict] | None = None, save: bool = True) -> AnalysisResponse:
+        """
+        Analyze an explanation and save it as a new attempt.
+        With save=False the attempt is kept as a draft instead (see submit_draft); a request carrying
+        a draft_id that still matches it saves that draft without analyzing again.
+        """
+        if save and request.draft_id:
+            response = self.submit_draft(request)
+            if response is not None:
+                return response
+        with profiled("analyze"):
+            return self._analyze_explanation(request, chunks, save)
+
+    def submit_draft(self, request: AnalysisRequest) -> AnalysisResponse | None:
+        """
+        Save the draft named by request.draft_id if the request is the one it was analyzed for
+        (same fields, same text up to whitespace). Returns None when there is nothing to save;
+        a draft that no longer matches is dropped either way.
+        """
+        draft = draft_store.pop(request.draft_id)
+        if draft is None:
+            return None
+        submitted = request.model_dump(exclude={"draft_id", "speaking_duration", "input_mode"})
+        drafted = {k: v for k, v in draft["request"].items() if k in submitted}
+        submitted["explanation"] = " ".join(submitted["explanation"].split())
+        drafted["explanation"] = " ".join((drafted.get("explanation") or "").split())
+        if submitted != drafted:
+            logger.info(f"Draft attempt {request.draft_id} no longer matches the submitted explanation, dropping it")
+            return None
+
+        try:
+            with stage("save"):
+                save_attempt(draft["attempt"])
+        except Exception as e:
+            logger.error(f"Failed to save attempt: {e}")
+        return AnalysisResponse(**dict(draft["response"], draft=False))
+
+    def _analyze_explanation(self, request: AnalysisRequest, chunks: list[dict] | None = None, save: bool = True) -> AnalysisResponse:
+        logger.info(f"Analyzing concept: {request.concept}")
+        
+        # 1. Handle Source Text (RAG)
+        context_str, used_chunk_ids = self._build_context(request, chunks)
+
+        # 2. Prepare Prompt
+        logger.info(f"Analysis Purpose Mode: {request.purpose}")
+
+        # Phase 4b: Interview Loop Logic
+        is_interview = (request.purpose == 'interview')
+        session_id = request.session_id or str(uuid.uuid4())
+        turn_index = request.turn_index
+        conversation_complete = False
+        
+        system_prompt_to_use = PROFESSOR_FEYNMAN_SYSTEM_PROMPT
+
+        if is_interview:
+            system_prompt_to_use = INTERVIEWER_FEYNMAN_SYSTEM_PROMPT
+            if turn_index >= 3:
+                # End of conversation: no new question (stated in the final turn, see below)
+                conversation_complete = True
+        
+        if context_str:
+            system_prompt_to_use += f"\n\n{context_str}\n\nUse the Reference Material above to check the accuracy of the explanation."
+
+        # 2a. Handle Speaking Metrics & Fillers
+        with stage("filler_analysis"):
+            speaking_context, user_metrics, filler_stats = self._build_speaking_context(request)
+
+        # 2b. Revision of an earlier attempt: send only the changed sentences when little changed
+        old_attempt = None
+        analysis_data = None
+        if request.previous_attempt_id:
+            try:
+                with stage("history_lookup"):
+                    old_attempt = load_attempt(request.previous_attempt_id)
+                diff = self._plan_delta(request, old_attempt) if old_attempt else None
+                if diff is not None:
+                    analysis_data = self._analyze_delta(request, diff, old_attempt, context_str, filler_stats)
+            except Exception as e:
+                logger.error(f"Delta analysis failed, running a full analysis: {e}")
+
+        # 2c. Too long for one prompt: map-reduce over segments
+        if analysis_data is None:
+            segments = self._plan_segments(request, is_interview)
+            if segments:
+                try:
+                    analysis_data = self._segmented_analysis(
+                        request, segments, context_str, speaking_context, user_metrics, filler_stats
+                    )
+                except Exception as e:
+                    logger.error(f"Segmented analysis failed, running a full analysis: {e}")
+
+        if analysis_data is None:
+            analysis_data = self._full_analysis(
+                request, system_prompt_to_use, speaking_context, user_metrics, filler_stats,
+                is_interview, conversation_complete, session_id, turn_index
+            )
+
         # 5. Handle Comparison (History)
         comparison_result = None
         if request.previous_attempt_id:
             logger.info(f"Comparing with previous attempt {request.previous_attempt_id}")
             try:
-                old_attempt = load_attempt(request.previous_attempt_id)
-                if old_attempt:
-                    old_analysis = old_attempt.get("analysis_result", {})
-                    comparison_result = self.comparator.compare_attempts(old_analysis, analysis_data)
+                with stage("comparison"):
+                    if old_attempt:
+                        old_analysis = old_attempt.get("analysis_result", {})
+                        comparison_result = self.comparator.compare_attempts(
+                            old_analysis,
+                            analysis_data,
+                            old_text=old_attempt.get("explanation_text"),
+                            new_text=request.explanation
+                        )
             except Exception as e:
                 logger.error(f"Comparison failed: {e}")
 
-        # 6. Save Current Attempt
+        # 6. Save Current Attempt (or keep it as a draft until the user submits it)
         new_attempt_id = str(uuid.uuid4())
+        attempt_record = None
         try:
             attempt_record = {
                 "attempt_id": new_attempt_id,
@@ -248,9 +623,12 @@ class FeynmanAnalyzer:
                 "explanation_text": request.explanation,
                 "analysis_result": analysis_data,
                 "referenced_chunk_ids": used_chunk_ids,
-                "comparison": comparison_result
+                "comparison": comparison_result,
+                "session_id": session_id if is_interview else None
             }
-            save_attempt(attempt_record)
+            if save:
+                with stage("save"):
+                    save_attempt(attempt_record)
         except Exception as e:
             logger.error(f"Failed to save attempt: {e}")
 
@@ -260,7 +638,7 @@ class FeynmanAnalyzer:
         
         logger.info(f"Interview session {session_id} turn {turn_index}, followup_generated={bool(interviewer_followup)}")
 
-        return AnalysisResponse(
+        response = AnalysisResponse(
             analysis=analysis_data,
             comparison=comparison_result,
             attempt_id=new_attempt_id,
@@ -268,7 +646,15 @@ class FeynmanAnalyzer:
             session_id=session_id if is_interview else None,
             turn_index=turn_index,
             conversation_complete=conversation_complete,
-            interviewer_followup=interviewer_followup
+            interviewer_followup=interviewer_followup,
+            draft=not save
         )
+        if not save and attempt_record is not None:
+            draft_store.put(new_attempt_id, request.model_dump(), attempt_record, response.model_dump())
+        return response
+
+@lru_cache(maxsize=None)
+def get_analyzer_service() -> FeynmanAnalyzer:
+    """Shared analyzer, built on first request instead of at import time."""
+    return FeynmanAnalyzer()
 
-analyzer_service = FeynmanAnalyzer()
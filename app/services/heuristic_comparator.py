@@ -0,0 +1,116 @@
+import difflib
+import re
+
+WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+# Words that carry no meaning when deciding whether two gap descriptions are the same gap
+STOPWORDS = {
+    "a", "an", "the", "of", "to", "and", "or", "is", "are", "be", "it", "its", "in", "on",
+    "for", "with", "that", "this", "not", "does", "do", "why", "how", "what", "no"
+}
+
+# Filler density change (fillers per word) that counts as a real difference on its own
+FILLER_DENSITY_DELTA = 0.02
+
+# Above this word-level similarity the explanation is treated as unchanged
+UNCHANGED_TEXT_RATIO = 0.98
+
+ENCOURAGEMENT = {
+    "better": "Nice progress, this version is clearer than your last attempt.",
+    "same": "You're holding steady. Pick one remaining gap and tackle it next.",
+    "same_no_gaps": "Still solid. Try explaining it to a different audience next.",
+    "worse": "This version opened new gaps. Compare it with your last attempt and keep what worked.",
+}
+
+def _tokens(text: str) -> set[str]:
+    return {w for w in WORD_PATTERN.findall((text or "").lower()) if w not in STOPWORDS}
+
+def token_set_similarity(a: str, b: str) -> float:
+    """Jaccard similarity of the meaningful words in two strings."""
+    tokens_a, tokens_b = _tokens(a), _tokens(b)
+    if not tokens_a and not tokens_b:
+        return 1.0
+    return len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+
+def match_gaps(old_gaps: list[str], new_gaps: list[str], threshold: float) -> tuple[list[str], list[str], list[str]]:
+    """
+    Pair up gaps that describe the same problem. Greedy, best pair first.
+    Returns (persisting, resolved, introduced).
+    """
+    pairs = sorted(
+        ((token_set_similarity(old, new), i, j) for i, old in enumerate(old_gaps) for j, new in enumerate(new_gaps)),
+        reverse=True
+    )
+    matched_old, matched_new = set(), set()
+    for score, i, j in pairs:
+        if score < threshold:
+            break
+        if i in matched_old or j in matched_new:
+            continue
+        matched_old.add(i)
+        matched_new.add(j)
+
+    persisting = [gap for i, gap in enumerate(old_gaps) if i in matched_old]
+    resolved = [gap for i, gap in enumerate(old_gaps) if i not in matched_old]
+    introduced = [gap for j, gap in enumerate(new_gaps) if j not in matched_new]
+    return persisting, resolved, introduced
+
+def text_similarity(old_text: str, new_text: str) -> float:
+    """Word-level edit similarity (difflib ratio), 1.0 for identical text."""
+    return difflib.SequenceMatcher(a=(old_text or "").split(), b=(new_text or "").split(), autojunk=False).ratio()
+
+def _filler_density(analysis: dict) -> float:
+    return (analysis.get("filler_analysis") or {}).get("filler_density") or 0.0
+
+def compare_heuristically(old_analysis: dict, new_analysis: dict, old_text: str | None, new_text: str | None, gap_threshold: float) -> dict | None:
+    """
+    Decide improvement_status without the LLM when the evidence points one way.
+    Returns a comparison dict, or None when the result is ambiguous (e.g. gaps both resolved and introduced).
+    """
+    old_gaps = [str(g) for g in old_analysis.get("gaps") or []]
+    new_gaps = [str(g) for g in new_analysis.get("gaps") or []]
+    persisting, resolved, introduced = match_gaps(old_gaps, new_gaps, gap_threshold)
+    density_delta = round(_filler_density(new_analysis) - _filler_density(old_analysis), 3)
+    similarity = text_similarity(old_text, new_text) if old_text is not None and new_text is not None else None
+
+    key_changes = [f"Resolved: {gap}" for gap in resolved] + [f"New gap: {gap}" for gap in introduced]
+    if abs(density_delta) >= FILLER_DENSITY_DELTA:
+        direction = "down" if density_delta < 0 else "up"
+        key_changes.append(
+            f"Filler density {direction} from {_filler_density(old_analysis)} to {_filler_density(new_analysis)}"
+        )
+
+    # +1 better, -1 worse, 0 no signal; signals pointing in opposite directions go to the LLM
+    gap_signal = (1 if resolved else 0) - (1 if introduced else 0)
+    filler_signal = 0
+    if density_delta <= -FILLER_DENSITY_DELTA:
+        filler_signal = 1
+    elif density_delta >= FILLER_DENSITY_DELTA:
+        filler_signal = -1
+    if (resolved and introduced) or gap_signal * filler_signal < 0:
+        return None
+
+    signal = gap_signal or filler_signal
+    encouragement_key = status = {1: "better", -1: "worse", 0: "same"}[signal]
+    if status == "same":
+        if similarity is not None and similarity >= UNCHANGED_TEXT_RATIO:
+            key_changes.append("Explanation is essentially unchanged")
+        elif persisting:
+            key_changes.append(f"The same {len(persisting)} gap(s) remain")
+        else:
+            key_changes.append("No gaps before or after")
+            encouragement_key = "same_no_gaps"
+
+    return {
+        "improvement_status": status,
+        "key_changes": key_changes,
+        "encouragement": ENCOURAGEMENT[encouragement_key],
+        "method": "heuristic",
+        "signals": {
+            "gaps_resolved": len(resolved),
+            "gaps_introduced": len(introduced),
+            "gaps_persisting": len(persisting),
+            "filler_density_delta": density_delta,
+            "text_similarity": round(similarity, 3) if similarity is not None else None
+        }
+    }
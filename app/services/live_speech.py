@@ -0,0 +1,111 @@
+import logging
+
+from app.schemas.analysis import AnalysisRequest
+from app.services.feynman_analyzer import FILLER_PATTERN, FILLER_WORDS, canonical_filler, filler_sort_key
+
+logger = logging.getLogger(__name__)
+
+# A filler split across two segments ("you" | "know") is caught by rescanning this many
+# trailing words of the previous text together with the new segment
+TAIL_WORDS = max(len(f.split()) for f in FILLER_WORDS) - 1
+
+def _tail_start(text: str, words: int) -> int:
+    """Offset at which the last `words` words of `text` begin (scans backwards, O(tail))."""
+    pos = len(text)
+    for _ in range(words):
+        while pos > 0 and text[pos - 1].isspace():
+            pos -= 1
+        while pos > 0 and not text[pos - 1].isspace():
+            pos -= 1
+    return pos
+
+class LiveSpeechSession:
+    """
+    Running transcript and speaking metrics for one live speech connection.
+    Segments are joined with single spaces. Each one is scanned once, together with
+    only the tail of the previous text, so a segment costs O(segment) regardless of
+    how long the talk has run. Counts match `_analyze_fillers` on the joined text.
+    """
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self.parts: list[str] = []
+        self.length = 0  # Characters in the joined transcript
+        self.word_count = 0
+        self.filler_counts: dict[str, int] = {}
+        self.filler_positions: list[dict] = []
+        self.active_seconds = 0.0
+        self.total_seconds = 0.0
+        self._tail = ""
+        self._tail_offset = 0
+
+    def add_segment(self, text: str, start: float | None = None, end: float | None = None) -> dict:
+        """Add one final transcript segment (timestamps in seconds since recording start)."""
+        text = (text or "").strip()
+        if start is not None and end is not None:
+            self.active_seconds += max(0.0, end - start)
+            self.total_seconds = max(self.total_seconds, end)
+        if not text:
+            return self.metrics()
+
+        offset = self.length + 1 if self.length else 0
+        if offset + len(text) > self.max_chars:
+            raise ValueError(f"Transcript too long. Max is {self.max_chars} characters.")
+
+        window = f"{self._tail} {text}" if self._tail else text
+        for match in FILLER_PATTERN.finditer(window):
+            start_pos = self._tail_offset + match.start()
+            end_pos = self._tail_offset + match.end()
+            if end_pos <= self.length:
+                continue  # Entirely inside the previous text, already counted
+            filler = canonical_filler(match.group(0))
+            self.filler_counts[filler] = self.filler_counts.get(filler, 0) + 1
+            self.filler_positions.append({"filler": filler, "start": start_pos, "end": end_pos})
+
+        self.parts.append(text)
+        self.length = offset + len(text)
+        self.word_count += len(text.split())
+        cut = _tail_start(window, TAIL_WORDS)
+        self._tail = window[cut:]
+        self._tail_offset = self.length - len(self._tail)
+        return self.metrics()
+
+    def stop(self, total_seconds: float | None = None) -> None:
+        # The recording usually runs on a little after the last segment
+        if total_seconds:
+            self.total_seconds = max(self.total_seconds, total_seconds)
+
+    @property
+    def transcript(self) -> str:
+        return " ".join(self.parts)
+
+    def metrics(self) -> dict:
+        total_fillers = len(self.filler_positions)
+        pause_ratio = None
+        if self.total_seconds > 0:
+            pause_ratio = round(max(0.0, self.total_seconds - self.active_seconds) / self.total_seconds, 2)
+        return {
+            "word_count": self.word_count,
+            "total_filler_count": total_fillers,
+            "filler_density": round(total_fillers / self.word_count, 3) if self.word_count else 0.0,
+            "common_fillers": sorted(self.filler_counts, key=filler_sort_key(self.filler_counts))[:3],
+            "filler_counts": dict(self.filler_counts),
+            "total_seconds": round(self.total_seconds, 1),
+            "active_seconds": round(self.active_seconds, 1),
+            "pause_ratio": pause_ratio
+        }
+
+    def analysis_request(self, fields: dict) -> AnalysisRequest:
+        """Build the final analysis request from the transcript and the client's form fields."""
+        fields = {k: v for k, v in (fields or {}).items() if k not in ("explanation", "input_mode", "speaking_duration", "draft_id")}
+        speaking_duration = None
+        if self.total_seconds > 0:
+            speaking_duration = {
+                "total_seconds": round(self.total_seconds, 1),
+                "active_seconds": round(min(self.active_seconds, self.total_seconds), 1)
+            }
+        return AnalysisRequest(
+            explanation=self.transcript,
+            input_mode="speech",
+            speaking_duration=speaking_duration,
+            **fields
+        )
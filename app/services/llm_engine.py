@@ -1,10 +1,45 @@
 import logging
-from openai import OpenAI
+import time
+from threading import BoundedSemaphore, Event, Lock
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from app.core.config import settings
+from app.core.metrics import observe_llm_call, llm_retries, llm_circuit_rejections, llm_hedged_requests
+from app.services.llm_recorder import LLMRecorder, LLMReplayer, request_key
+from app.services.resilience import CircuitBreaker, CircuitOpenError, LatencyTracker, backoff_delay
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+def transient_errors() -> tuple:
+    """
+    Failures worth retrying (and counting against the backend's circuit).
+    openai is heavy to import, so it is only loaded once an LLM call is actually made.
+    """
+    from openai import APIConnectionError, InternalServerError, RateLimitError
+    return (APIConnectionError, InternalServerError, RateLimitError)
+
+# Per-task defaults; LLM_TASK_ROUTES can point a task at another backend/model and override these
+TASK_DEFAULTS = {
+    "analysis": {"max_tokens": 1000, "temperature": 0.2},
+    "interviewer": {"max_tokens": 1000, "temperature": 0.2},
+    # The comparator JSON (summary plus three lists) runs past 300 tokens on longer explanations
+    "comparison": {"max_tokens": 600, "temperature": 0.2},
+    "compression": {"max_tokens": 400, "temperature": 0.2},
+}
+
+def resolve_route(task: str) -> dict:
+    """Backend, model, max_tokens and temperature for a task type."""
+    if task not in TASK_DEFAULTS:
+        raise ValueError(f"Unknown LLM task '{task}'. Expected one of: {', '.join(TASK_DEFAULTS)}")
+    route = {"api_base": settings.LLM_API_BASE, "api_key": settings.LLM_API_KEY, "model": "local-model"}
+    route.update(TASK_DEFAULTS[task])
+    route.update(settings.LLM_TASK_ROUTES.get(task) or {})
+    # The primary backend keeps its name so its breaker, hedging and metrics labels stay as they were
+    route["backend"] = "primary" if route["api_base"] == settings.LLM_API_BASE else route["api_base"]
+    return route
+
+LLM_UNAVAILABLE_RESPONSE = '{"summary": "Error: Local LLM Server is not running.", "gaps": ["Please run the start_model_server.ps1 script"], "suggestions": ["Check README"], "follow_up_questions": []}'
+
 class LLMEngine:
     _instance = None
 
@@ -12,14 +47,36 @@ class LLMEngine:
         if cls._instance is None:
             cls._instance = super(LLMEngine, cls).__new__(cls)
             cls._instance.client = None
+            cls._instance.hedge_client = None
+            cls._instance.recorder = None
+            cls._instance.replayer = None
+            if settings.LLM_MODE == "record":
+                cls._instance.recorder = LLMRecorder(settings.LLM_CASSETTE_PATH)
+            elif settings.LLM_MODE == "replay":
+                cls._instance.replayer = LLMReplayer(settings.LLM_CASSETTE_PATH, settings.LLM_REPLAY_LATENCY)
+            cls._instance.breakers = {
+                "primary": CircuitBreaker("primary", settings.LLM_BREAKER_FAILURE_THRESHOLD, settings.LLM_BREAKER_RESET_SECONDS),
+                "hedge": CircuitBreaker("hedge", settings.LLM_BREAKER_FAILURE_THRESHOLD, settings.LLM_BREAKER_RESET_SECONDS),
+            }
+            cls._instance.latency = LatencyTracker()
+            cls._instance.primary_pool = None
+            cls._instance.hedge_pool = None
+            cls._instance.hedge_capacity = None
+            # Clients for backends that tasks are routed to, keyed by api_base
+            cls._instance.route_clients = {}
+            cls._instance._route_lock = Lock()
         return cls._instance
 
     def get_client(self):
         if not self.client:
+            from openai import OpenAI
             try:
+                # Retries and timeouts are handled here, not by the SDK (its default is 2 retries / 10 minutes)
                 self.client = OpenAI(
                     base_url=settings.LLM_API_BASE,
-                    api_key=settings.LLM_API_KEY
+                    api_key=settings.LLM_API_KEY,
+                    timeout=settings.LLM_TIMEOUT_SECONDS,
+                    max_retries=0
                 )
                 logger.info(f"Connected to LLM Server at {settings.LLM_API_BASE}")
             except Exception as e:
@@ -27,27 +84,253 @@ class LLMEngine:
                 raise e
         return self.client
 
-    def generate(self, system_prompt: str, user_prompt: str, max_tokens: int = 1000) -> str:
-        client = self.get_client()
-        
-        try:
-            response = client.chat.completions.create(
-                model="local-model", # The server ignores this usually, or uses the loaded model
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=max_tokens,
-                temperature=0.2,
-                response_format={"type": "json_object"},
-                stop=["<|end|>", "User:", "Context:"]
+    def get_hedge_client(self):
+        if not self.hedge_client and settings.LLM_HEDGE_API_BASE:
+            from openai import OpenAI
+            self.hedge_client = OpenAI(
+                base_url=settings.LLM_HEDGE_API_BASE,
+                api_key=settings.LLM_API_KEY,
+                timeout=settings.LLM_TIMEOUT_SECONDS,
+                max_retries=0
             )
-            return response.choices[0].message.content
+            # Sized for the parallel callers the app itself creates (segment fan-out, batch items); primaries and
+            # hedges get separate pools so a burst of primaries never queues the hedges meant to rescue them
+            workers = 2 * max(1, settings.LLM_SLOTS, settings.BATCH_MAX_CONCURRENCY)
+            self.primary_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-primary")
+            self.hedge_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-hedge")
+            # Hedges in flight, losers included (they can't be cancelled mid-call)
+            self.hedge_capacity = BoundedSemaphore(workers)
+            logger.info(f"Hedging LLM calls against {settings.LLM_HEDGE_API_BASE}")
+        return self.hedge_client
+
+    def get_route_client(self, route: dict):
+        """Client (and circuit breaker) for a non-primary backend, created on first use."""
+        backend = route["backend"]
+        with self._route_lock:
+            if backend not in self.route_clients:
+                from openai import OpenAI
+                self.route_clients[backend] = OpenAI(
+                    base_url=route["api_base"],
+                    api_key=route["api_key"],
+                    timeout=settings.LLM_TIMEOUT_SECONDS,
+                    max_retries=0
+                )
+                self.breakers[backend] = CircuitBreaker(
+                    backend, settings.LLM_BREAKER_FAILURE_THRESHOLD, settings.LLM_BREAKER_RESET_SECONDS
+                )
+                logger.info(f"Routing LLM calls to {backend}")
+            return self.route_clients[backend]
+
+    def warm_route_clients(self) -> None:
+        """Build clients for every task routed away from the primary backend."""
+        for task in TASK_DEFAULTS:
+            route = resolve_route(task)
+            if route["backend"] != "primary":
+                self.get_route_client(route)
+
+    def generate(self, system_prompt: str, user_prompt: str, max_tokens: int | None = None, task: str = "analysis", slot_id: int | None = None) -> str:
+        return self.chat(
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            max_tokens=max_tokens,
+            slot_id=slot_id,
+            task=task
+        )
+
+    def _build_request(self, route: dict, messages: list[dict], max_tokens: int, temperature: float, slot_id: int | None) -> dict:
+        extra_body = {"cache_prompt": True}
+        if slot_id is not None:
+            extra_body["id_slot"] = slot_id
+
+        return {
+            "model": route["model"], # llama-server ignores this usually, or uses the loaded model
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "response_format": {"type": "json_object"},
+            "stop": ["<|end|>", "User:", "Context:"],
+            "extra_body": extra_body
+        }
+
+    def prime(self, messages: list[dict], task: str, slot_id: int | None = None) -> None:
+        """
+        Send a 1-token request so `messages` land in the prompt cache of the backend `task` is routed to.
+        Bypasses the cassette, retries and circuit breaker: warm-up traffic is not a real call, so it must not be
+        recorded, retried or counted against the backend. Only its duration is observed, as task="warmup".
+        """
+        route = resolve_route(task)
+        if route["backend"] == "primary":
+            client = self.get_client()
+        else:
+            client = self.get_route_client(route)
+        request = self._build_request(route, messages, 1, route["temperature"], slot_id)
+
+        start = time.perf_counter()
+        try:
+            client.with_options(timeout=settings.LLM_TIMEOUT_SECONDS).chat.completions.create(**request)
+        except Exception:
+            observe_llm_call(time.perf_counter() - start, "error", task="warmup")
+            raise
+        observe_llm_call(time.perf_counter() - start, "ok", task="warmup")
+
+    def _call_backend(self, backend: str, request: dict, timeout: float):
+        """One attempt against one backend, guarded by that backend's circuit breaker."""
+        breaker = self.breakers[backend]
+        try:
+            breaker.allow()
+        except CircuitOpenError:
+            llm_circuit_rejections.inc(backend=backend)
+            raise
+
+        # Every path must settle the breaker, or a half-open trial stays taken and the circuit never closes
+        try:
+            if backend == "primary":
+                client = self.get_client()
+            elif backend == "hedge":
+                client = self.get_hedge_client()
+            else:
+                client = self.route_clients[backend]
+            start = time.perf_counter()
+            response = client.with_options(timeout=timeout).chat.completions.create(**request)
+        except transient_errors():
+            breaker.record_failure()
+            raise
+        except Exception:
+            # 4xx, unparseable payloads etc.: the backend answered, so it is healthy as far as the breaker cares
+            breaker.record_success()
+            raise
+        except BaseException:
+            breaker.release_trial()
+            raise
+        breaker.record_success()
+        if backend == "primary":
+            self.latency.observe(time.perf_counter() - start)
+        return response
+
+    def _hedge_delay(self) -> float | None:
+        if settings.LLM_HEDGE_DELAY_SECONDS is not None:
+            return settings.LLM_HEDGE_DELAY_SECONDS
+        return self.latency.percentile(95, settings.LLM_HEDGE_MIN_SAMPLES)
+
+    def _call_hedged(self, request: dict, timeout: float):
+        """
+        Send to the primary; if it hasn't answered after the hedge delay (p95 by default),
+        send a duplicate to the hedge backend and take whichever succeeds first.
+        The delay is counted from when the primary call actually goes out, not from when it was queued here.
+        """
+        delay = self._hedge_delay() if self.get_hedge_client() else None
+        if delay is None or delay >= timeout:
+            return self._call_backend("primary", request, timeout)
+
+        deadline = time.monotonic() + timeout
+        sent = Event()
+
+        def call_primary():
+            sent.set()
+            return self._call_backend("primary", request, deadline - time.monotonic())
+
+        primary = self.primary_pool.submit(call_primary)
+        if not sent.wait(timeout=max(deadline - time.monotonic(), 0)) and primary.cancel():
+            from openai import APITimeoutError
+            raise APITimeoutError(request=None)
+        done, _ = wait([primary], timeout=max(min(delay, deadline - time.monotonic()), 0))
+        # Every hedge worker is busy (with losing calls, usually): a queued hedge would only start late
+        if done or not self.hedge_capacity.acquire(blocking=False):
+            return primary.result()  # Bounded by the call's own timeout
+
+        hedge = self.hedge_pool.submit(self._call_backend, "hedge", request, deadline - time.monotonic())
+        hedge.add_done_callback(lambda _: self.hedge_capacity.release())
+        pending = {primary: "primary", hedge: "hedge"}
+        last_error = None
+        while pending:
+            done, _ = wait(list(pending), timeout=max(deadline - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+            if not done:
+                from openai import APITimeoutError
+                raise APITimeoutError(request=None)
+            for future in done:
+                backend = pending.pop(future)
+                try:
+                    response = future.result()
+                except Exception as e:
+                    last_error = e
+                    continue
+                # The losing call can't be cancelled mid-flight; its result is simply dropped
+                llm_hedged_requests.inc(winner=backend)
+                return response
+        raise last_error
+
+    def _complete(self, request: dict, backend: str = "primary"):
+        """Run the request within LLM_TIMEOUT_SECONDS overall, retrying transient failures with jittered backoff."""
+        deadline = time.monotonic() + settings.LLM_TIMEOUT_SECONDS
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                # Hedging is only configured for the primary backend
+                if backend == "primary":
+                    return self._call_hedged(request, remaining)
+                return self._call_backend(backend, request, remaining)
+            except transient_errors() as e:
+                delay = backoff_delay(attempt, settings.LLM_RETRY_BACKOFF_SECONDS)
+                if attempt >= settings.LLM_MAX_RETRIES or deadline - time.monotonic() <= delay:
+                    raise
+                attempt += 1
+                llm_retries.inc()
+                logger.warning(f"LLM call failed ({e.__class__.__name__}), retry {attempt} in {delay:.2f}s")
+                time.sleep(delay)
+
+    def chat(self, messages: list[dict], max_tokens: int | None = None, slot_id: int | None = None, task: str = "analysis") -> str:
+        """
+        Run a chat completion over a full message history.
+        `task` picks the backend, model, max_tokens and temperature (see TASK_DEFAULTS / LLM_TASK_ROUTES);
+        an explicit `max_tokens` wins over the task's default.
+        `slot_id` pins the request to one llama-server slot so its cached prompt prefix is reused.
+        """
+        route = resolve_route(task)
+        if max_tokens is None:
+            max_tokens = route["max_tokens"]
+        temperature = route["temperature"]
+        key = request_key(messages, max_tokens, temperature) if (self.recorder or self.replayer) else None
+
+        if self.replayer:
+            start = time.perf_counter()
+            entry = self.replayer.replay(key)
+            observe_llm_call(time.perf_counter() - start, "ok", entry.get("usage"), entry.get("timings"), task=task)
+            return entry["content"]
+
+        request = self._build_request(route, messages, max_tokens, temperature, slot_id)
+
+        if route["backend"] != "primary":
+            self.get_route_client(route)
+
+        start = time.perf_counter()
+        try:
+            response = self._complete(request, route["backend"])
+            elapsed = time.perf_counter() - start
+            content = response.choices[0].message.content
+            if getattr(response.choices[0], "finish_reason", None) == "length":
+                logger.warning(f"LLM response for task '{task}' hit max_tokens ({request['max_tokens']}) and is likely truncated")
+            usage = response.usage.model_dump() if response.usage else None
+            # llama-server adds a non-standard 'timings' block (prompt/predict ms, cache_n)
+            timings = (response.model_extra or {}).get("timings")
+            observe_llm_call(elapsed, "ok", usage, timings, task=task)
+            if self.recorder:
+                self.recorder.record(key, messages, content, elapsed, usage, timings)
+            return content
         except Exception as e:
+            from openai import APIConnectionError, APITimeoutError
+            observe_llm_call(time.perf_counter() - start, "error", task=task)
             logger.error(f"LLM Generation Error: {e}")
-            # If connection refused, guide the user
-            if "Connection refused" in str(e) or "connect" in str(e).lower():
-                return '{"summary": "Error: Local LLM Server is not running.", "gaps": ["Please run the start_model_server.ps1 script"], "suggestions": ["Check README"], "follow_up_questions": []}'
+            # Backend down (or known to be down): guide the user instead of failing the request.
+            # Timeouts are re-raised; a wedged server is not the same as a missing one.
+            if isinstance(e, CircuitOpenError) or (isinstance(e, APIConnectionError) and not isinstance(e, APITimeoutError)):
+                return LLM_UNAVAILABLE_RESPONSE
+            if "Connection refused" in str(e):
+                return LLM_UNAVAILABLE_RESPONSE
             raise e
 
-llm_engine = LLMEngine()
+def get_llm_engine() -> LLMEngine:
+    """Shared engine, created on first use rather than at import time."""
+    return LLMEngine()
@@ -0,0 +1,83 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import defaultdict, deque
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+class ReplayMissError(LookupError):
+    """Raised in replay mode when the cassette has no recording for a request."""
+
+def request_key(messages: list[dict], max_tokens: int, temperature: float) -> str:
+    """Stable fingerprint of the parts of a request that determine the model's answer."""
+    payload = json.dumps(
+        {"messages": messages, "max_tokens": max_tokens, "temperature": temperature},
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class LLMRecorder:
+    """
+    Appends request/response pairs to a gzip-compressed JSON-lines cassette.
+    Each call is its own gzip member, so recording can be stopped and resumed safely.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def record(self, key: str, messages: list[dict], content: str, elapsed: float, usage: dict | None, timings: dict | None) -> None:
+        entry = {
+            "key": key,
+            # Only the last message is stored for readability; the key covers the full history
+            "last_message": messages[-1] if messages else None,
+            "content": content,
+            "elapsed": round(elapsed, 4),
+            "usage": usage,
+            "timings": timings,
+        }
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            with gzip.open(self.path, "ab") as f:
+                f.write(line)
+
+class LLMReplayer:
+    """
+    Serves recorded responses back by request fingerprint.
+    Repeated identical requests are answered in recording order; once exhausted the last answer repeats.
+    """
+    def __init__(self, path: str, latency: str = "zero"):
+        self.path = path
+        self.latency = latency
+        self._entries: dict[str, deque] = defaultdict(deque)
+        self._last: dict[str, dict] = {}
+        self._lock = Lock()
+
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries[entry["key"]].append(entry)
+        logger.info(f"Loaded LLM cassette {path}: {sum(len(q) for q in self._entries.values())} recordings")
+
+    def replay(self, key: str) -> dict:
+        with self._lock:
+            queue = self._entries.get(key)
+            if queue:
+                entry = queue.popleft()
+                self._last[key] = entry
+            elif key in self._last:
+                entry = self._last[key]
+            else:
+                raise ReplayMissError(f"No recorded LLM response for request {key[:12]} in {self.path}")
+
+        if self.latency == "original":
+            time.sleep(entry.get("elapsed", 0))
+        return entry
@@ -0,0 +1,154 @@
+import json
+import logging
+import math
+import re
+from collections import Counter
+from typing import Callable
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Common English stopwords (hardcoded to avoid huge dependencies)
+STOPWORDS = {
+    "the", "be", "to", "of", "and", "a", "in", "that", "have", "i",
+    "it", "for", "not", "on", "with", "he", "as", "you", "do", "at",
+    "this", "but", "his", "by", "from", "they", "we", "say", "her",
+    "she", "or", "an", "will", "my", "one", "all", "would", "there",
+    "their", "what", "so", "up", "out", "if", "about", "who", "get",
+    "which", "go", "me", "is", "are", "was", "were"
+}
+
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+COMPRESSION_MODES = ("off", "extractive", "llm")
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens without stopwords or very short words (keeps repeats for term frequency)."""
+    return [w for w in re.findall(r'\w+', (text or "").lower()) if w not in STOPWORDS and len(w) > 2]
+
+def chunk_id(chunk: dict):
+    """The services chunker uses 'id', the ingestion chunker 'chunk_id'."""
+    return chunk.get("id", chunk.get("chunk_id"))
+
+# name -> fn(query_tokens, chunk_tokens) -> one score per chunk
+RETRIEVAL_STRATEGIES: dict[str, Callable[[list[str], list[list[str]]], list[float]]] = {}
+
+def register_strategy(name: str):
+    """Decorator that makes a scoring function selectable by name (request field or RETRIEVAL_STRATEGY)."""
+    def decorator(fn):
+        RETRIEVAL_STRATEGIES[name] = fn
+        return fn
+    return decorator
+
+@register_strategy("keyword")
+def keyword_scores(query_tokens: list[str], chunk_tokens: list[list[str]]) -> list[float]:
+    """Number of distinct query words that appear in the chunk."""
+    query = set(query_tokens)
+    return [float(len(query.intersection(tokens))) for tokens in chunk_tokens]
+
+@register_strategy("bm25")
+def bm25_scores(query_tokens: list[str], chunk_tokens: list[list[str]], k1: float = 1.5, b: float = 0.75) -> list[float]:
+    """Okapi BM25 over the request's chunks."""
+    n = len(chunk_tokens)
+    avg_len = sum(len(tokens) for tokens in chunk_tokens) / n if n else 0
+    df = Counter(term for tokens in chunk_tokens for term in set(tokens))
+    query = set(query_tokens)
+
+    scores = []
+    for tokens in chunk_tokens:
+        tf = Counter(tokens)
+        length_norm = k1 * (1 - b + b * len(tokens) / avg_len) if avg_len else k1
+        score = 0.0
+        for term in query:
+            if term not in tf:
+                continue
+            idf = math.log(1 + (n - df[term] + 0.5) / (df[term] + 0.5))
+            score += idf * tf[term] * (k1 + 1) / (tf[term] + length_norm)
+        scores.append(score)
+    return scores
+
+@register_strategy("tfidf")
+def tfidf_scores(query_tokens: list[str], chunk_tokens: list[list[str]]) -> list[float]:
+    """Cosine similarity of TF-IDF vectors (smoothed idf, as scikit-learn does)."""
+    n = len(chunk_tokens)
+    df = Counter(term for tokens in chunk_tokens for term in set(tokens))
+    idf = {term: math.log((1 + n) / (1 + count)) + 1 for term, count in df.items()}
+
+    query_vec = {term: count * idf[term] for term, count in Counter(query_tokens).items() if term in idf}
+    query_norm = math.sqrt(sum(v * v for v in query_vec.values()))
+    if not query_norm:
+        return [0.0] * n
+
+    scores = []
+    for tokens in chunk_tokens:
+        vec = {term: count * idf[term] for term, count in Counter(tokens).items()}
+        norm = math.sqrt(sum(v * v for v in vec.values()))
+        dot = sum(weight * vec.get(term, 0.0) for term, weight in query_vec.items())
+        scores.append(dot / (query_norm * norm) if norm else 0.0)
+    return scores
+
+def select_chunks(query_text: str, chunks: list[dict], top_k: int | None = None, strategy: str | None = None) -> list[dict]:
+    """
+    Rank chunks against the query with the named strategy and return the top_k that match at all.
+    Returned chunks are copies carrying a 'relevance_score'.
+    """
+    strategy = strategy or settings.RETRIEVAL_STRATEGY
+    if strategy not in RETRIEVAL_STRATEGIES:
+        raise ValueError(f"Unknown retrieval strategy '{strategy}'. Available: {', '.join(RETRIEVAL_STRATEGIES)}")
+    top_k = top_k or settings.RETRIEVAL_TOP_K
+    if not chunks:
+        return []
+
+    chunk_tokens = [tokenize(chunk.get("text", "")) for chunk in chunks]
+    scores = RETRIEVAL_STRATEGIES[strategy](tokenize(query_text), chunk_tokens)
+
+    # Stable sort: equal scores keep document order
+    ranked = sorted(
+        ((score, i) for i, score in enumerate(scores) if score > 0),
+        key=lambda item: item[0],
+        reverse=True
+    )
+    return [dict(chunks[i], relevance_score=round(score, 4)) for score, i in ranked[:top_k]]
+
+def _extractive(query_text: str, chunk: dict, max_sentences: int) -> dict:
+    """Keep the chunk's sentences that share the most words with the query, in their original order."""
+    sentences = [s for s in SENTENCE_BOUNDARY.split(chunk.get("text", "")) if s.strip()]
+    query = set(tokenize(query_text))
+    scored = [(len(query.intersection(tokenize(s))), i) for i, s in enumerate(sentences)]
+    keep = sorted(i for score, i in sorted(scored, key=lambda item: item[0], reverse=True)[:max_sentences] if score > 0)
+    if not keep and sentences:
+        keep = [0]
+    return dict(chunk, text=" ".join(sentences[i].strip() for i in keep))
+
+def _llm_compress(query_text: str, chunk: dict, max_sentences: int) -> dict:
+    """Ask the 'compression' task model for only the passage relevant to the query; extractive on failure."""
+    from app.services.llm_engine import get_llm_engine
+
+    system_prompt = (
+        "You extract reference material. Copy, word for word, only the sentences from the Source "
+        "that are relevant to the Query. Return ONLY raw JSON: {\"relevant_text\": \"...\"}"
+    )
+    user_prompt = f"Query: {query_text}\n\nSource:\n{chunk.get('text', '')}"
+    try:
+        raw = get_llm_engine().generate(system_prompt=system_prompt, user_prompt=user_prompt, task="compression")
+        text = json.loads(raw).get("relevant_text", "").strip()
+        if text:
+            return dict(chunk, text=text)
+    except Exception as e:
+        logger.warning(f"LLM context compression failed, using extractive: {e}")
+    return _extractive(query_text, chunk, max_sentences)
+
+def compress_chunks(query_text: str, chunks: list[dict], mode: str | None = None) -> list[dict]:
+    """Shrink selected chunks before they go into the prompt ('off', 'extractive' or 'llm')."""
+    mode = mode or settings.CONTEXT_COMPRESSION
+    if mode not in COMPRESSION_MODES:
+        raise ValueError(f"Unknown context compression '{mode}'. Available: {', '.join(COMPRESSION_MODES)}")
+    if mode == "off":
+        return chunks
+    compress = _extractive if mode == "extractive" else _llm_compress
+    return [compress(query_text, chunk, settings.CONTEXT_COMPRESSION_MAX_SENTENCES) for chunk in chunks]
+
+def retrieve(query_text: str, chunks: list[dict], top_k: int | None = None, strategy: str | None = None, compression: str | None = None) -> list[dict]:
+    """Select then compress: the full retrieval pipeline used for reference material."""
+    return compress_chunks(query_text, select_chunks(query_text, chunks, top_k, strategy), compression)
@@ -0,0 +1,115 @@
+import logging
+import threading
+import time
+
+from app.core.config import settings
+from app.prompts.templates import PROFESSOR_FEYNMAN_SYSTEM_PROMPT, INTERVIEWER_FEYNMAN_SYSTEM_PROMPT
+from app.services.llm_engine import get_llm_engine
+
+logger = logging.getLogger(__name__)
+
+# (task, system prompt), most common first. Each is primed on whichever backend its task is routed to.
+PRIMED_SYSTEM_PROMPTS = [
+    ("analysis", PROFESSOR_FEYNMAN_SYSTEM_PROMPT),
+    ("interviewer", INTERVIEWER_FEYNMAN_SYSTEM_PROMPT),
+]
+
+# Minimum gap between warm-up retries triggered by readiness probes
+RETRY_INTERVAL_SECONDS = 10.0
+
+class WarmupService:
+    """
+    Gets the instance hot before it reports ready: builds the HTTP client(s), waits for the
+    backend to answer, then sends a 1-token request per slot so the long system prompts
+    are already in llama-server's prompt cache when real traffic arrives.
+    """
+    def __init__(self):
+        self.state = "pending"  # pending -> warming -> ready | failed
+        self.steps: dict[str, float] = {}
+        self.error: str | None = None
+        self._finished_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    def status(self) -> dict:
+        return {"status": self.state, "steps_seconds": dict(self.steps), "error": self.error}
+
+    def _step(self, name: str, fn) -> None:
+        start = time.perf_counter()
+        fn()
+        self.steps[name] = round(time.perf_counter() - start, 3)
+
+    def _wait_for_backend(self) -> None:
+        deadline = time.monotonic() + settings.WARMUP_TIMEOUT_SECONDS
+        client = get_llm_engine().get_client()
+        while True:
+            try:
+                # Cheapest call every OpenAI-compatible server implements
+                client.with_options(timeout=5).models.list()
+                return
+            except Exception as e:
+                if time.monotonic() >= deadline:
+                    raise RuntimeError(f"LLM backend not reachable at {settings.LLM_API_BASE}: {e}")
+                time.sleep(1)
+
+    @staticmethod
+    def _slot_plan(slots: int) -> list[tuple[str, str]]:
+        """
+        One (task, system prompt) per slot. A slot keeps only its most recent prompt in cache, so priming
+        two prompts on the same slot wastes the first: the most common prompt gets every slot except one
+        trailing slot for each other prompt, and always keeps at least one slot.
+        """
+        plan = [PRIMED_SYSTEM_PROMPTS[0]] * slots
+        for i, entry in enumerate(PRIMED_SYSTEM_PROMPTS[1:], start=1):
+            if i < slots:
+                plan[slots - i] = entry
+        return plan
+
+    def _prime_prompt_cache(self) -> None:
+        for slot_id, (task, system_prompt) in enumerate(self._slot_plan(max(1, settings.LLM_SLOTS))):
+            get_llm_engine().prime(
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": "Warm-up."}
+                ],
+                task=task,
+                slot_id=slot_id if settings.LLM_SLOTS > 1 else None
+            )
+            logger.info(f"Primed '{task}' system prompt on slot {slot_id}")
+
+    def run(self) -> None:
+        with self._lock:
+            if self.state == "warming":
+                return
+            self.state = "warming"
+            # Keep the previous error visible until a retry succeeds
+            self.steps = {}
+
+        try:
+            llm_engine = get_llm_engine()
+            if llm_engine.replayer is None:
+                self._step("client", lambda: (llm_engine.get_client(), llm_engine.get_hedge_client(), llm_engine.warm_route_clients()))
+                self._step("backend_health", self._wait_for_backend)
+                self._step("prompt_cache", self._prime_prompt_cache)
+            self.error = None
+            self.state = "ready"
+            logger.info(f"Warm-up complete: {self.steps}")
+        except Exception as e:
+            self.error = str(e)
+            self.state = "failed"
+            logger.error(f"Warm-up failed: {e}")
+        finally:
+            self._finished_at = time.monotonic()
+
+    def retry_if_failed(self) -> None:
+        """Re-run a failed warm-up (e.g. llama-server started after the app), at most every RETRY_INTERVAL_SECONDS."""
+        if self.state == "failed" and time.monotonic() - self._finished_at >= RETRY_INTERVAL_SECONDS:
+            self.run_in_background()
+
+    def run_in_background(self) -> None:
+        threading.Thread(target=self.run, name="warmup", daemon=True).start()
+
+warmup_service = WarmupService()
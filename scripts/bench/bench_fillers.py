@@ -0,0 +1,105 @@
+"""
+Micro-benchmark for filler-word detection on long speech transcripts.
+
+Compares the single-pass compiled matcher in FeynmanAnalyzer._analyze_fillers
+against the previous one-regex-per-filler implementation, and checks that both
+produce the same counts, density and top fillers.
+
+Usage:
+    python scripts/bench/bench_fillers.py --words 10000 --repeat 50
+"""
+import argparse
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.services.feynman_analyzer import FILLER_WORDS, FeynmanAnalyzer  # noqa: E402
+
+VOCABULARY = (
+    "energy entropy system heat particles order disorder state temperature "
+    "the a of and to in that it is was for on are with as be this at by "
+    "molecules spread out more ways arrange universe tends toward"
+).split()
+
+def legacy_analyze_fillers(text: str) -> dict | None:
+    """The original implementation: one re.findall pass per filler word."""
+    if not text or len(text.split()) < 5:
+        return None
+
+    found_fillers = {}
+    total_count = 0
+    word_count = len(text.split())
+
+    for filler in FILLER_WORDS:
+        pattern = r'\b' + re.escape(filler) + r'\b'
+        count = len(re.findall(pattern, text, re.IGNORECASE))
+        if count > 0:
+            found_fillers[filler] = count
+            total_count += count
+
+    if total_count == 0:
+        return None
+
+    density = round(total_count / word_count, 3)
+    common = sorted(found_fillers.keys(), key=lambda k: found_fillers[k], reverse=True)[:3]
+    return {
+        "total_filler_count": total_count,
+        "filler_density": density,
+        "common_fillers": common
+    }
+
+def make_transcript(words: int, filler_rate: float, seed: int) -> str:
+    rng = random.Random(seed)
+    tokens = []
+    while len(tokens) < words:
+        if rng.random() < filler_rate:
+            filler = rng.choice(FILLER_WORDS)
+            tokens.extend(filler.split())
+        else:
+            tokens.append(rng.choice(VOCABULARY))
+        if rng.random() < 0.08:
+            tokens[-1] += rng.choice([".", ",", "?"])
+    return " ".join(tokens[:words])
+
+def time_it(fn, text: str, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--filler-rate", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    analyzer = FeynmanAnalyzer()
+    text = make_transcript(args.words, args.filler_rate, args.seed)
+
+    new = analyzer._analyze_fillers(text)
+    old = legacy_analyze_fillers(text)
+    for key in ("total_filler_count", "filler_density", "common_fillers"):
+        if new[key] != old[key]:
+            raise SystemExit(f"Mismatch on {key}: new={new[key]!r} legacy={old[key]!r}")
+
+    legacy = time_it(legacy_analyze_fillers, text, args.repeat)
+    single = time_it(analyzer._analyze_fillers, text, args.repeat)
+
+    print(f"Transcript: {args.words} words, {new['total_filler_count']} fillers (density {new['filler_density']})")
+    print(f"{'implementation':<16}{'median ms':>12}{'p95 ms':>12}")
+    for name, samples in (("legacy", legacy), ("single-pass", single)):
+        p95 = statistics.quantiles(samples, n=20)[-1] if len(samples) > 1 else samples[0]
+        print(f"{name:<16}{statistics.median(samples):>12.3f}{p95:>12.3f}")
+    print(f"Speedup: {statistics.median(legacy) / statistics.median(single):.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Relevance / latency benchmark for the reference-material retrieval pipeline.
+
+Every document in the bundled corpus (scripts/bench/data/retrieval_corpus.json) is joined
+into one source text and chunked with the analyzer's TextChunker. Each query
+(concept + explanation, like `_build_context`) then runs through select + compress
+for every strategy x compression combination, and the report gives:
+  - recall@k: share of the query's relevant passages with at least one sentence in the
+    final context (so compression that drops the key sentence is penalized)
+  - latency of select + compress (median / p95 over --repeat runs, in ms)
+  - prompt tokens added by the context (estimated as characters / 4)
+
+Usage:
+    python scripts/bench/bench_retrieval.py
+    python scripts/bench/bench_retrieval.py --strategies bm25,tfidf --compression off,extractive --json retrieval.json
+    python scripts/bench/bench_retrieval.py --baseline retrieval.json --min-recall 0.8
+
+`--compression llm` calls the 'compression' task backend (LLM_API_BASE / LLM_TASK_ROUTES);
+use it with a real model or scripts/bench/fake_llama_server.py.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_CORPUS = REPO_ROOT / "scripts" / "bench" / "data" / "retrieval_corpus.json"
+
+sys.path.insert(0, str(REPO_ROOT))
+
+from app.services.retrieval import COMPRESSION_MODES, RETRIEVAL_STRATEGIES, SENTENCE_BOUNDARY, compress_chunks, select_chunks  # noqa: E402
+from app.services.text_chunker import TextChunker  # noqa: E402
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def load_corpus(path: Path) -> tuple[str, dict[str, list[str]], list[dict]]:
+    """Returns (source text, passage id -> its sentences, queries)."""
+    corpus = json.loads(path.read_text(encoding="utf-8"))
+    passages = {}
+    documents = []
+    for document in corpus["documents"]:
+        for passage in document["passages"]:
+            passages[passage["id"]] = [s.strip() for s in SENTENCE_BOUNDARY.split(passage["text"]) if s.strip()]
+        documents.append("\n\n".join(p["text"] for p in document["passages"]))
+    return "\n\n".join(documents), passages, corpus["queries"]
+
+def recalled(relevant: list[str], passages: dict[str, list[str]], context: str) -> int:
+    return sum(1 for pid in relevant if any(sentence in context for sentence in passages[pid]))
+
+def run_combination(strategy: str, compression: str, chunks: list[dict], passages: dict, queries: list[dict], top_k: int, repeat: int) -> dict:
+    latencies = []
+    hits = total = 0
+    tokens = []
+    for query in queries:
+        query_text = f"{query['concept']} {query['explanation']}"
+        for _ in range(repeat):
+            start = time.perf_counter()
+            selected = compress_chunks(query_text, select_chunks(query_text, chunks, top_k=top_k, strategy=strategy), compression)
+            latencies.append((time.perf_counter() - start) * 1000)
+        context = "\n---\n".join(c["text"] for c in selected)
+        hits += recalled(query["relevant"], passages, context)
+        total += len(query["relevant"])
+        tokens.append(len(context) / 4)
+
+    return {
+        "strategy": strategy,
+        "compression": compression,
+        "recall_at_k": round(hits / total, 3) if total else 0.0,
+        "latency_ms_p50": round(statistics.median(latencies), 3),
+        "latency_ms_p95": round(percentile(latencies, 95), 3),
+        "prompt_tokens_mean": round(statistics.mean(tokens), 1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS))
+    parser.add_argument("--strategies", default=",".join(RETRIEVAL_STRATEGIES), help="Comma-separated strategy names")
+    parser.add_argument("--compression", default="off,extractive", help="Comma-separated: off, extractive, llm")
+    parser.add_argument("--top-k", type=int, default=2)
+    parser.add_argument("--chunk-size", type=int, default=300, help="TextChunker chunk_size (the analyzer uses 1500; smaller keeps about one passage per chunk)")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per query")
+    parser.add_argument("--json", dest="json_path", help="Write the report as JSON to this path")
+    parser.add_argument("--baseline", help="Previous --json report to compare recall and latency against")
+    parser.add_argument("--max-regression", type=float, default=20.0, help="Allowed p50 latency slowdown vs baseline in percent")
+    parser.add_argument("--min-recall", type=float, help="Fail if any combination's recall@k is below this")
+    args = parser.parse_args()
+
+    strategies = [s.strip() for s in args.strategies.split(",") if s.strip()]
+    compressions = [c.strip() for c in args.compression.split(",") if c.strip()]
+    unknown = [s for s in strategies if s not in RETRIEVAL_STRATEGIES] + [c for c in compressions if c not in COMPRESSION_MODES]
+    if unknown:
+        raise SystemExit(f"Unknown strategy/compression: {', '.join(unknown)}")
+
+    source_text, passages, queries = load_corpus(Path(args.corpus))
+    chunks = TextChunker.chunk_text(source_text, chunk_size=args.chunk_size)
+
+    results = []
+    for strategy in strategies:
+        for compression in compressions:
+            # The LLM path is slow and not what the latency numbers are about: one run per query
+            repeat = 1 if compression == "llm" else args.repeat
+            results.append(run_combination(strategy, compression, chunks, passages, queries, args.top_k, repeat))
+
+    report = {
+        "corpus": Path(args.corpus).name,
+        "passages": len(passages),
+        "queries": len(queries),
+        "chunks": len(chunks),
+        "top_k": args.top_k,
+        "source_tokens": round(len(source_text) / 4),
+        "results": results,
+    }
+
+    print(f"{'strategy':<10} {'compression':<12} {'recall@k':>9} {'p50 ms':>9} {'p95 ms':>9} {'tokens':>8}")
+    for row in results:
+        print(
+            f"{row['strategy']:<10} {row['compression']:<12} {row['recall_at_k']:>9} "
+            f"{row['latency_ms_p50']:>9} {row['latency_ms_p95']:>9} {row['prompt_tokens_mean']:>8}"
+        )
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    failures = []
+    if args.min_recall is not None:
+        for row in results:
+            if row["recall_at_k"] < args.min_recall:
+                failures.append(f"{row['strategy']}/{row['compression']} recall@k {row['recall_at_k']} below {args.min_recall}")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        before_rows = {(row["strategy"], row["compression"]): row for row in baseline["results"]}
+        for row in results:
+            before = before_rows.get((row["strategy"], row["compression"]))
+            if before is None:
+                continue
+            name = f"{row['strategy']}/{row['compression']}"
+            print(f"{name} recall@k vs baseline: {before['recall_at_k']} -> {row['recall_at_k']}")
+            if row["recall_at_k"] < before["recall_at_k"]:
+                failures.append(f"{name} recall@k dropped")
+            if before["latency_ms_p50"]:
+                change = (row["latency_ms_p50"] - before["latency_ms_p50"]) / before["latency_ms_p50"] * 100
+                print(f"{name} p50 vs baseline: {before['latency_ms_p50']} -> {row['latency_ms_p50']}ms ({change:+.1f}%)")
+                if change > args.max_regression:
+                    failures.append(f"{name} p50 latency regressed by more than {args.max_regression}%")
+
+    if failures:
+        raise SystemExit("\n".join(failures))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Latency vs. explanation length for segmented (map-reduce) analysis.
+
+Runs the analyzer in-process on explanations of increasing length, once with
+SEGMENTED_ANALYSIS_ENABLED and once with a single prompt, and fits how latency scales:
+the exponent of latency ~ length^e between the shortest and longest size
+(1.0 = linear, below 1.0 = sublinear).
+
+Needs a backend with several slots, e.g.:
+    python scripts/bench/fake_llama_server.py --port 8080 --slots 4 --prompt-ms-per-token 0.5 --token-ms 5
+    LLM_API_BASE=http://localhost:8080/v1 LLM_SLOTS=4 python scripts/bench/bench_segmented.py --json segmented.json
+    LLM_API_BASE=http://localhost:8080/v1 LLM_SLOTS=4 python scripts/bench/bench_segmented.py --max-exponent 0.8
+
+Runs in a temporary working directory so benchmark attempts never touch your real history.
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+def build_explanation(explanations: list[str], tokens: int) -> str:
+    """Paragraphs cycled from the sample explanations until ~tokens (4 chars each)."""
+    paragraphs = []
+    length = 0
+    for paragraph in itertools.cycle(explanations):
+        if length >= tokens * 4:
+            break
+        paragraphs.append(paragraph)
+        length += len(paragraph) + 2
+    return "\n\n".join(paragraphs)
+
+def scaling_exponent(lengths: list[int], latencies: list[float]) -> float | None:
+    if len(lengths) < 2 or lengths[0] == lengths[-1] or not latencies[0]:
+        return None
+    return round(math.log(latencies[-1] / latencies[0]) / math.log(lengths[-1] / lengths[0]), 3)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", default="2000,4000,8000,16000", help="Comma-separated explanation sizes (estimated tokens)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--json", dest="json_path", help="Write the report as JSON to this path")
+    parser.add_argument("--max-exponent", type=float, help="Fail if segmented latency scales worse than length^this")
+    args = parser.parse_args()
+
+    sizes = sorted(int(t) for t in args.tokens.split(",") if t.strip())
+    json_path = Path(args.json_path).resolve() if args.json_path else None
+
+    sys.path.insert(0, str(REPO_ROOT))
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    workdir = tempfile.mkdtemp(prefix="feynman-bench-")
+    os.chdir(workdir)
+
+    from payloads import EXPLANATIONS  # noqa: E402
+    from app.core.config import settings  # noqa: E402
+    from app.schemas.analysis import AnalysisRequest  # noqa: E402
+    from app.services.feynman_analyzer import get_analyzer_service  # noqa: E402
+
+    explanations = list(EXPLANATIONS.values())
+    # Client set-up and connection pool are not what this measures
+    get_analyzer_service().analyze_explanation(AnalysisRequest(concept="Entropy", explanation=explanations[0]))
+
+    modes = {}
+    for mode, enabled in (("segmented", True), ("single", False)):
+        settings.SEGMENTED_ANALYSIS_ENABLED = enabled
+        rows = []
+        for size in sizes:
+            request = AnalysisRequest(concept="Entropy", explanation=build_explanation(explanations, size))
+            latencies = []
+            segments = None
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                response = get_analyzer_service().analyze_explanation(request)
+                latencies.append((time.perf_counter() - start) * 1000)
+                segments = (response.analysis.get("segmented") or {}).get("segments")
+            rows.append({"tokens": size, "segments": segments, "latency_ms_p50": round(statistics.median(latencies), 1)})
+        modes[mode] = {
+            "rows": rows,
+            "scaling_exponent": scaling_exponent(sizes, [row["latency_ms_p50"] for row in rows]),
+        }
+
+    report = {
+        "llm_slots": settings.LLM_SLOTS,
+        "segment_threshold_tokens": settings.SEGMENT_THRESHOLD_TOKENS,
+        "segment_max_tokens": settings.SEGMENT_MAX_TOKENS,
+        "runs": args.runs,
+        "modes": modes,
+    }
+    print(json.dumps(report, indent=2))
+    if json_path:
+        json_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    exponent = modes["segmented"]["scaling_exponent"]
+    if args.max_exponent is not None and exponent is not None and exponent > args.max_exponent:
+        raise SystemExit(f"Segmented latency scales as length^{exponent}, above {args.max_exponent}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Cold-start benchmark for the Mr. Feynman API.
+
+Measures, each in a fresh interpreter:
+  - import time of `app.main` (minus bare interpreter start-up), plus the slowest imports
+    from `python -X importtime`
+  - time from spawning uvicorn to the first 200 from /health
+and checks that heavy optional dependencies (openai, pypdf) are not loaded by the import.
+
+Usage:
+    python scripts/bench/bench_startup.py --runs 5 --json startup.json
+    python scripts/bench/bench_startup.py --baseline startup.json --max-regression 20
+    python scripts/bench/bench_startup.py --max-import-ms 1500 --max-first-200-ms 4000
+
+Warm-up is disabled for the server run, so no LLM backend is needed.
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Must stay lazily imported: loaded on first LLM call / first upload, never by `import app.main`
+LAZY_MODULES = ["openai", "pypdf"]
+
+def run_python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+def time_python(code: str) -> float:
+    start = time.perf_counter()
+    run_python(code)
+    return (time.perf_counter() - start) * 1000
+
+def slowest_imports(top: int) -> list[dict]:
+    """Parse `-X importtime` output (microseconds, cumulative) for the slowest top-level imports."""
+    stderr = run_python("import app.main", "-X", "importtime").stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        try:
+            rows.append({"module": name.strip(), "cumulative_ms": round(int(cumulative) / 1000, 1)})
+        except ValueError:
+            continue  # header row
+    # Top-level modules only, otherwise every package shows up next to each of its submodules
+    rows = [row for row in rows if "." not in row["module"]]
+    return sorted(rows, key=lambda row: row["cumulative_ms"], reverse=True)[:top]
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def time_to_first_200(timeout: float) -> float:
+    port = free_port()
+    env = dict(os.environ, WARMUP_ENABLED="false")
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=REPO_ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if server.poll() is not None:
+                raise SystemExit(f"uvicorn exited with code {server.returncode} before serving")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as resp:
+                    if resp.status == 200:
+                        return (time.perf_counter() - start) * 1000
+            except (urllib.error.URLError, ConnectionError, OSError):
+                pass
+            time.sleep(0.01)
+        raise SystemExit(f"No 200 from /health within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="How many of the slowest imports to list")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait for the first 200")
+    parser.add_argument("--json", dest="json_path", help="Write the report as JSON to this path")
+    parser.add_argument("--baseline", help="Previous --json report to compare against")
+    parser.add_argument("--max-regression", type=float, default=20.0, help="Allowed slowdown vs baseline in percent")
+    parser.add_argument("--max-import-ms", type=float, help="Fail if median app import time exceeds this")
+    parser.add_argument("--max-first-200-ms", type=float, help="Fail if median time-to-first-200 exceeds this")
+    args = parser.parse_args()
+
+    loaded = json.loads(run_python(
+        f"import json, sys; import app.main; print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))"
+    ).stdout)
+
+    interpreter = [time_python("pass") for _ in range(args.runs)]
+    imports = [time_python("import app.main") for _ in range(args.runs)]
+    first_200 = [time_to_first_200(args.timeout) for _ in range(args.runs)]
+    interpreter_ms = statistics.median(interpreter)
+
+    report = {
+        "runs": args.runs,
+        "interpreter_ms": round(interpreter_ms, 1),
+        "import_ms": round(statistics.median(imports) - interpreter_ms, 1),
+        "first_200_ms": round(statistics.median(first_200), 1),
+        "eagerly_loaded": loaded,
+        "slowest_imports": slowest_imports(args.top),
+    }
+    print(json.dumps(report, indent=2))
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    failures = []
+    if loaded:
+        failures.append(f"Lazy dependencies imported by app.main: {', '.join(loaded)}")
+    if args.max_import_ms is not None and report["import_ms"] > args.max_import_ms:
+        failures.append(f"Import time {report['import_ms']}ms exceeds {args.max_import_ms}ms")
+    if args.max_first_200_ms is not None and report["first_200_ms"] > args.max_first_200_ms:
+        failures.append(f"Time to first 200 {report['first_200_ms']}ms exceeds {args.max_first_200_ms}ms")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        for key in ("import_ms", "first_200_ms"):
+            before = baseline[key]
+            change = (report[key] - before) / before * 100
+            print(f"{key} vs baseline: {before} -> {report[key]} ({change:+.1f}%)")
+            if change > args.max_regression:
+                failures.append(f"{key} regressed by more than {args.max_regression}%")
+
+    if failures:
+        raise SystemExit("\n".join(failures))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Stand-in for llama-server that speaks the OpenAI-compatible /v1/chat/completions API used by LLMEngine.
+
+Latency is simulated rather than computed: a prompt-eval cost per uncached prompt token plus a
+per-token generation cost, with a fixed number of slots (like llama-server's -np). Each slot
+remembers its last prompt, so cache_prompt/id_slot reuse is modelled too. Responses are
+schema-valid JSON for the analysis, delta, interviewer, comparison, context-compression and segment prompts.
+
+Usage:
+    python scripts/bench/fake_llama_server.py --port 8080 --prompt-ms-per-token 0.5 --token-ms 25 --slots 1
+Then run the app with LLM_API_BASE=http://localhost:8080/v1
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from contextlib import asynccontextmanager
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+CONFIG = {
+    "prompt_ms_per_token": 0.5,
+    "token_ms": 25.0,
+    "slots": 1,
+}
+STATE = {
+    "semaphore": None,
+    "slot_prompts": {},
+    "next_slot": 0,
+}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    STATE["semaphore"] = asyncio.Semaphore(CONFIG["slots"])
+    yield
+
+app = FastAPI(title="fake-llama-server", lifespan=lifespan)
+
+def estimate_tokens(text: str) -> int:
+    # Roughly 4 characters per token for English text
+    return max(1, len(text) // 4)
+
+def render_prompt(messages: list[dict]) -> str:
+    return "".join(f"<|{m.get('role')}|>{m.get('content', '')}<|end|>" for m in messages)
+
+def build_content(messages: list[dict]) -> str:
+    system = next((m.get("content", "") for m in messages if m.get("role") == "system"), "")
+    user = messages[-1].get("content", "") if messages else ""
+
+    if "mentor" in system.lower():
+        return json.dumps({
+            "improvement_status": "better",
+            "key_changes": ["Replaced jargon with an everyday analogy", "Closed the gap on energy spreading out"],
+            "encouragement": "Nice progress, the analogy lands much better now."
+        })
+
+    if "revised an explanation" in system:
+        return json.dumps({
+            "summary": "The revision makes the mechanism explicit.",
+            "resolved_gaps": [1],
+            "new_gaps": [],
+            "suggestions": ["Tie the analogy back explicitly"],
+            "follow_up_questions": ["What would change if the room were sealed?"]
+        })
+
+    if "ONE part of a student's long explanation" in system:
+        # One gap shared by every part (merged by the analyzer), one specific to the part
+        part = user.split("Part ", 1)[-1].split(" ", 1)[0]
+        return json.dumps({
+            "summary": f"Part {part} describes the mechanism but skips a step.",
+            "gaps": ["Does not explain why disorder increases", f"Part {part} jumps to a conclusion"],
+            "suggestions": ["Explain the mechanism in one plain sentence"]
+        })
+
+    if "extract reference material" in system:
+        # First sentence of the source stands in for "the relevant part"
+        source = user.split("Source:\n", 1)[-1]
+        return json.dumps({"relevant_text": source.split(". ")[0].strip().rstrip(".") + "."})
+
+    analysis = {
+        "summary": "A clear start that leans on an analogy but skips the underlying mechanism.",
+        "gaps": ["Does not explain why disorder increases", "Analogy is not connected back to the concept"],
+        "suggestions": ["Explain the mechanism in one plain sentence", "Tie the analogy back explicitly"],
+        "follow_up_questions": ["What would happen if the system were not isolated?"],
+        "speaking_clarity": {"issues": ["filler words"], "suggestions": ["pause instead of saying 'um'"]},
+        "speaking_metrics": {"insight": "Steady pace with a few long pauses.", "suggestions": ["Keep sentences short."]},
+        "filler_analysis": {"insight": "Fillers cluster at the start of sentences.", "suggestions": ["Pause silently."]},
+    }
+    if "Technical Interviewer" in system and "final turn" not in user:
+        analysis["interviewer_followup"] = {
+            "question": "How would your answer change for an open system?",
+            "intent": "Testing whether the candidate understands the isolated-system assumption."
+        }
+    return json.dumps(analysis)
+
+def pick_slot(id_slot) -> int:
+    if isinstance(id_slot, int) and 0 <= id_slot < CONFIG["slots"]:
+        return id_slot
+    slot = STATE["next_slot"] % CONFIG["slots"]
+    STATE["next_slot"] += 1
+    return slot
+
+def cached_prefix_tokens(slot: int, prompt: str) -> int:
+    previous = STATE["slot_prompts"].get(slot, "")
+    common = 0
+    for a, b in zip(previous, prompt):
+        if a != b:
+            break
+        common += 1
+    return estimate_tokens(prompt[:common]) if common else 0
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+@app.get("/v1/models")
+async def models():
+    return {"object": "list", "data": [{"id": "fake-phi-3", "object": "model"}]}
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    messages = body.get("messages", [])
+    max_tokens = body.get("max_tokens") or 1000
+    stream = bool(body.get("stream"))
+
+    prompt = render_prompt(messages)
+    content = build_content(messages)
+    prompt_tokens = estimate_tokens(prompt)
+    completion_tokens = min(estimate_tokens(content), max_tokens)
+
+    queued_at = time.perf_counter()
+    await STATE["semaphore"].acquire()
+    slot = pick_slot(body.get("id_slot"))
+    cache_n = cached_prefix_tokens(slot, prompt) if body.get("cache_prompt", True) else 0
+    prompt_ms = (prompt_tokens - cache_n) * CONFIG["prompt_ms_per_token"]
+    predicted_ms = completion_tokens * CONFIG["token_ms"]
+    STATE["slot_prompts"][slot] = prompt + content
+
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+    created = int(time.time())
+    timings = {
+        "cache_n": cache_n,
+        "prompt_n": prompt_tokens - cache_n,
+        "prompt_ms": prompt_ms,
+        "predicted_n": completion_tokens,
+        "predicted_ms": predicted_ms,
+        "predicted_per_second": 1000 / CONFIG["token_ms"] if CONFIG["token_ms"] else 0,
+    }
+    usage = {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+    if not stream:
+        try:
+            await asyncio.sleep((prompt_ms + predicted_ms) / 1000)
+        finally:
+            STATE["semaphore"].release()
+        timings["queue_ms"] = (time.perf_counter() - queued_at) * 1000 - prompt_ms - predicted_ms
+        return JSONResponse({
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": body.get("model", "fake-phi-3"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": usage,
+            "timings": timings,
+        })
+
+    async def event_stream():
+        try:
+            await asyncio.sleep(prompt_ms / 1000)
+            pieces = [content[i:i + 4] for i in range(0, len(content), 4)][:completion_tokens]
+            for piece in pieces:
+                await asyncio.sleep(CONFIG["token_ms"] / 1000)
+                chunk = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": body.get("model", "fake-phi-3"),
+                    "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+                }
+                yield f"data: {json.dumps(chunk)}\n\n"
+            final = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": body.get("model", "fake-phi-3"),
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                "usage": usage,
+                "timings": timings,
+            }
+            yield f"data: {json.dumps(final)}\n\n"
+            yield "data: [DONE]\n\n"
+        finally:
+            STATE["semaphore"].release()
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--prompt-ms-per-token", type=float, default=CONFIG["prompt_ms_per_token"])
+    parser.add_argument("--token-ms", type=float, default=CONFIG["token_ms"])
+    parser.add_argument("--slots", type=int, default=CONFIG["slots"])
+    args = parser.parse_args()
+
+    CONFIG.update(prompt_ms_per_token=args.prompt_ms_per_token, token_ms=args.token_ms, slots=max(1, args.slots))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Load generator for the Mr. Feynman API.
+
+Drives /api/v1/analyze, /api/v2/upload and /api/v1/history with a weighted mix of realistic
+payloads at a fixed concurrency, then reports p50/p95/p99 latency and throughput per endpoint.
+LLM time is read back from the Server-Timing header, so app-side overhead (total minus LLM)
+is reported separately from model speed.
+
+Usage (against the fake backend for app-only numbers):
+    python scripts/bench/fake_llama_server.py --port 8080 &
+    LLM_API_BASE=http://localhost:8080/v1 python -m app.main &
+    python scripts/bench/load_generator.py --base-url http://localhost:8000 --requests 200 --concurrency 8
+"""
+import argparse
+import json
+import random
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from payloads import SOURCE_TEXT, analysis_payload, make_pdf
+
+def parse_server_timing(header: str | None) -> dict[str, float]:
+    timings = {}
+    for part in (header or "").split(","):
+        name, _, params = part.strip().partition(";")
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "dur":
+                try:
+                    timings[name] = float(value)
+                except ValueError:
+                    pass
+    return timings
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+class HTTPResult:
+    def __init__(self, status: int, headers, body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+class LoadGenerator:
+    # Standard library only (urllib + threads) so the benchmark runs with just requirements.txt installed
+    def __init__(self, base_url: str, mix: dict[str, int], seed: int, timeout: float):
+        self.base_url = base_url.rstrip("/")
+        self.mix = mix
+        self.rng = random.Random(seed)
+        self.timeout = timeout
+        self.pdf = make_pdf(SOURCE_TEXT[:3000])
+        self.results = defaultdict(lambda: {"latency_ms": [], "app_ms": [], "llm_ms": [], "errors": 0, "bytes": 0})
+        self._lock = threading.Lock()
+
+    def _pick(self) -> tuple[str, dict]:
+        with self._lock:
+            names = list(self.mix)
+            kind = self.rng.choices(names, weights=[self.mix[n] for n in names])[0]
+            payload = analysis_payload(self.rng) if kind == "analyze" else {}
+        return kind, payload
+
+    def _send(self, method: str, path: str, body: bytes | None = None, content_type: str | None = None) -> HTTPResult:
+        request = urllib.request.Request(self.base_url + path, data=body, method=method)
+        if content_type:
+            request.add_header("Content-Type", content_type)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return HTTPResult(response.status, response.headers, response.read())
+        except urllib.error.HTTPError as e:
+            return HTTPResult(e.code, e.headers, e.read())
+
+    def _request(self, kind: str, payload: dict) -> HTTPResult:
+        if kind == "analyze":
+            return self._send("POST", "/api/v1/analyze", json.dumps(payload).encode("utf-8"), "application/json")
+        if kind == "upload":
+            boundary = uuid.uuid4().hex
+            body = (
+                f"--{boundary}\r\n"
+                'Content-Disposition: form-data; name="file"; filename="notes.pdf"\r\n'
+                "Content-Type: application/pdf\r\n\r\n"
+            ).encode("utf-8") + self.pdf + f"\r\n--{boundary}--\r\n".encode("utf-8")
+            return self._send("POST", "/api/v2/upload", body, f"multipart/form-data; boundary={boundary}")
+        if kind == "history":
+            return self._send("GET", "/api/v1/history")
+        raise ValueError(f"Unknown request kind: {kind}")
+
+    def _record(self, kind: str, elapsed: float, response: HTTPResult | None) -> None:
+        with self._lock:
+            stats = self.results[kind]
+            if response is None or response.status >= 400:
+                stats["errors"] += 1
+                return
+            stats["latency_ms"].append(elapsed)
+            stats["bytes"] += len(response.body)
+            timing = parse_server_timing(response.headers.get("Server-Timing"))
+            if "total" in timing:
+                llm = timing.get("llm", 0.0) + timing.get("comparison", 0.0)
+                stats["llm_ms"].append(llm)
+                stats["app_ms"].append(timing["total"] - llm)
+
+    def _worker(self, budget: list[int], deadline: float | None) -> None:
+        while True:
+            if deadline is not None:
+                if time.perf_counter() >= deadline:
+                    return
+            else:
+                with self._lock:
+                    if budget[0] <= 0:
+                        return
+                    budget[0] -= 1
+
+            kind, payload = self._pick()
+            start = time.perf_counter()
+            try:
+                response = self._request(kind, payload)
+            except (urllib.error.URLError, OSError):
+                response = None
+            self._record(kind, (time.perf_counter() - start) * 1000, response)
+
+    def run(self, requests: int, duration: float | None, concurrency: int) -> float:
+        budget = [requests]
+        deadline = time.perf_counter() + duration if duration else None
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for future in [pool.submit(self._worker, budget, deadline) for _ in range(concurrency)]:
+                future.result()
+        return time.perf_counter() - start
+
+    def report(self, wall_seconds: float) -> dict:
+        report = {"wall_seconds": round(wall_seconds, 3), "endpoints": {}}
+        for kind, stats in sorted(self.results.items()):
+            latencies = stats["latency_ms"]
+            entry = {
+                "requests": len(latencies),
+                "errors": stats["errors"],
+                "throughput_rps": round(len(latencies) / wall_seconds, 2) if wall_seconds else 0.0,
+                "avg_bytes": round(stats["bytes"] / len(latencies)) if latencies else 0,
+            }
+            for label, samples in (("latency", latencies), ("app", stats["app_ms"]), ("llm", stats["llm_ms"])):
+                if samples:
+                    entry[f"{label}_ms"] = {
+                        "p50": round(percentile(samples, 50), 2),
+                        "p95": round(percentile(samples, 95), 2),
+                        "p99": round(percentile(samples, 99), 2),
+                        "mean": round(statistics.fmean(samples), 2),
+                    }
+            report["endpoints"][kind] = entry
+        return report
+
+def print_report(report: dict) -> None:
+    print(f"Wall time: {report['wall_seconds']}s")
+    header = f"{'endpoint':<10}{'reqs':>6}{'errs':>6}{'rps':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'app p50':>10}{'app p95':>10}{'llm p50':>10}"
+    print(header)
+    print("-" * len(header))
+    for kind, entry in report["endpoints"].items():
+        latency = entry.get("latency_ms", {})
+        app = entry.get("app_ms", {})
+        llm = entry.get("llm_ms", {})
+        print(
+            f"{kind:<10}{entry['requests']:>6}{entry['errors']:>6}{entry['throughput_rps']:>8}"
+            f"{latency.get('p50', 0):>9}{latency.get('p95', 0):>9}{latency.get('p99', 0):>9}"
+            f"{app.get('p50', 0):>10}{app.get('p95', 0):>10}{llm.get('p50', 0):>10}"
+        )
+    print("All latencies in ms. 'app' = server total minus LLM time (from Server-Timing).")
+
+def parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--requests", type=int, default=200, help="Total requests (ignored with --duration)")
+    parser.add_argument("--duration", type=float, default=None, help="Run for N seconds instead of a fixed count")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("analyze=6,history=3,upload=1"))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--json", dest="json_path", help="Also write the report as JSON to this path")
+    args = parser.parse_args()
+
+    generator = LoadGenerator(args.base_url, args.mix, args.seed, args.timeout)
+    wall = generator.run(args.requests, args.duration, args.concurrency)
+    report = generator.report(wall)
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
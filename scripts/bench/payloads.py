@@ -0,0 +1,88 @@
+"""
+Realistic request payloads shared by the benchmark scripts.
+"""
+import random
+
+CONCEPTS = ["Entropy", "Photosynthesis", "TCP Handshake", "Compound Interest", "Natural Selection"]
+
+EXPLANATIONS = {
+    "Entropy": (
+        "So entropy is basically like a measure of how messy things are. Um, if you have a room and you "
+        "never clean it, it gets messier, because there are way more messy ways to arrange stuff than tidy "
+        "ways. Heat also spreads out, like when you put ice in a warm drink, and that spreading is entropy going up."
+    ),
+    "Photosynthesis": (
+        "Plants make their own food. They take in sunlight with the green stuff in their leaves, which is "
+        "chlorophyll, and they use that energy to turn carbon dioxide from the air and water from the soil "
+        "into sugar. Oxygen is the leftover, so they kind of breathe it out for us."
+    ),
+    "TCP Handshake": (
+        "Before two computers talk they, you know, say hello three times. The client sends SYN, the server "
+        "answers SYN-ACK, and the client sends ACK. Now both agree on starting sequence numbers so they can "
+        "notice lost or out of order packets and ask for them again."
+    ),
+    "Compound Interest": (
+        "Compound interest is interest on interest. If you put money in a bank, each year you get a "
+        "percentage added, and the next year the percentage is taken on the bigger amount, so it grows "
+        "faster and faster, sort of like a snowball rolling downhill."
+    ),
+    "Natural Selection": (
+        "Animals that are a bit better suited to where they live survive more and have more babies. The "
+        "babies inherit those traits, so over many generations the whole population, um, shifts toward "
+        "those traits. Nobody plans it, it just happens because of who survives."
+    ),
+}
+
+SOURCE_TEXT = "\n\n".join([
+    "Entropy is a thermodynamic quantity representing the number of microscopic configurations that "
+    "correspond to a macroscopic state. The second law states that the total entropy of an isolated "
+    "system never decreases over time.",
+    "Heat flows spontaneously from hotter to colder bodies. This flow increases the total entropy because "
+    "energy becomes spread over more available microstates.",
+    "Photosynthesis converts light energy into chemical energy. Chlorophyll absorbs light, driving the "
+    "synthesis of glucose from carbon dioxide and water, and releasing oxygen as a by-product.",
+    "The TCP three-way handshake (SYN, SYN-ACK, ACK) establishes a connection and synchronises initial "
+    "sequence numbers, enabling reliable, ordered delivery with retransmission of lost segments.",
+] * 6)
+
+def analysis_payload(rng: random.Random) -> dict:
+    concept = rng.choice(CONCEPTS)
+    payload = {
+        "concept": concept,
+        "explanation": EXPLANATIONS[concept],
+        "target_audience": rng.choice(["5-year-old", "high school student", "new engineer"]),
+    }
+    roll = rng.random()
+    if roll < 0.3:
+        payload["source_text"] = SOURCE_TEXT
+    elif roll < 0.5:
+        payload["input_mode"] = "speech"
+        payload["speaking_duration"] = {"total_seconds": 42, "active_seconds": 31}
+    return payload
+
+def make_pdf(text: str) -> bytes:
+    """Build a minimal single-page text PDF that pypdf can extract."""
+    lines = []
+    for i in range(0, len(text), 80):
+        chunk = text[i:i + 80].replace("\n", " ").replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+        lines.append(f"({chunk}) Tj T*")
+    stream = "BT /F1 10 Tf 12 TL 50 760 Td " + " ".join(lines) + " ET"
+
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        "/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream",
+    ]
+    out = "%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out.encode("latin-1")))
+        out += f"{number} 0 obj\n{body}\nendobj\n"
+    xref_at = len(out.encode("latin-1"))
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n"
+    return out.encode("latin-1")
@@ -0,0 +1,122 @@
+"""
+Deterministic throughput benchmark for the analyzer pipeline using recorded LLM traffic.
+
+1. Record once against a real or fake backend:
+       LLM_API_BASE=http://localhost:8080/v1 python scripts/bench/replay_pipeline.py --mode record
+2. Replay as often as needed, with no backend and (by default) zero model latency:
+       python scripts/bench/replay_pipeline.py --mode replay --json run.json
+3. Guard against regressions from chunking, retrieval or storage changes:
+       python scripts/bench/replay_pipeline.py --mode replay --baseline run.json --max-regression 10
+
+Runs in a temporary working directory so benchmark attempts never touch your real history.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_CASSETTE = REPO_ROOT / "scripts" / "bench" / "data" / "pipeline_cassette.jsonl.gz"
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["record", "replay"], default="replay")
+    parser.add_argument("--cassette", default=str(DEFAULT_CASSETTE))
+    parser.add_argument("--latency", choices=["zero", "original"], default="zero")
+    parser.add_argument("--items", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--json", dest="json_path", help="Write the report as JSON to this path")
+    parser.add_argument("--baseline", help="Previous --json report to compare throughput against")
+    parser.add_argument("--max-regression", type=float, default=10.0, help="Allowed throughput drop in percent")
+    args = parser.parse_args()
+
+    cassette = Path(args.cassette).resolve()
+    if args.mode == "record" and cassette.exists():
+        cassette.unlink()
+    if args.mode == "replay" and not cassette.exists():
+        raise SystemExit(f"No cassette at {cassette}. Run with --mode record first.")
+
+    # Settings are read at import time, so configure the environment before importing the app
+    os.environ["LLM_MODE"] = args.mode
+    os.environ["LLM_CASSETTE_PATH"] = str(cassette)
+    os.environ["LLM_REPLAY_LATENCY"] = args.latency
+    json_path = Path(args.json_path).resolve() if args.json_path else None
+    baseline_path = Path(args.baseline).resolve() if args.baseline else None
+
+    sys.path.insert(0, str(REPO_ROOT))
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    workdir = tempfile.mkdtemp(prefix="feynman-bench-")
+    os.chdir(workdir)
+
+    from payloads import analysis_payload  # noqa: E402
+    from app.core.metrics import comparator_fast_path, stage_duration  # noqa: E402
+    from app.schemas.analysis import AnalysisRequest  # noqa: E402
+    from app.services.feynman_analyzer import get_analyzer_service  # noqa: E402
+
+    rng = random.Random(args.seed)
+    requests = []
+    for i in range(args.items):
+        payload = analysis_payload(rng)
+        # Every third item revises the previous one, exercising history lookup and comparison
+        payload["_revises_previous"] = i % 3 == 2
+        requests.append(payload)
+
+    latencies = []
+    previous_attempt_id = None
+    start = time.perf_counter()
+    for payload in requests:
+        revises = payload.pop("_revises_previous")
+        if revises and previous_attempt_id:
+            payload["previous_attempt_id"] = previous_attempt_id
+        item_start = time.perf_counter()
+        response = get_analyzer_service().analyze_explanation(AnalysisRequest(**payload))
+        latencies.append((time.perf_counter() - item_start) * 1000)
+        previous_attempt_id = response.attempt_id
+    wall = time.perf_counter() - start
+
+    stages = {
+        labels[0]: round(values["sum"] / values["count"] * 1000, 3)
+        for labels, values in stage_duration.summary().items() if values["count"]
+    }
+    hits, misses = comparator_fast_path.value(result="hit"), comparator_fast_path.value(result="miss")
+    fast_path_hit_rate = round(hits / (hits + misses), 3) if hits + misses else None
+
+    report = {
+        "mode": args.mode,
+        "latency": args.latency,
+        "items": args.items,
+        "wall_seconds": round(wall, 4),
+        "throughput_items_per_s": round(args.items / wall, 2),
+        "item_ms": {
+            "p50": round(percentile(latencies, 50), 3),
+            "p95": round(percentile(latencies, 95), 3),
+            "mean": round(statistics.fmean(latencies), 3),
+        },
+        "stage_mean_ms": dict(sorted(stages.items())),
+        "comparator_fast_path_hit_rate": fast_path_hit_rate,
+    }
+
+    print(json.dumps(report, indent=2))
+    if json_path:
+        json_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if baseline_path:
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+        before = baseline["throughput_items_per_s"]
+        change = (report["throughput_items_per_s"] - before) / before * 100
+        print(f"Throughput vs baseline: {before} -> {report['throughput_items_per_s']} items/s ({change:+.1f}%)")
+        if change < -args.max_regression:
+            raise SystemExit(f"Throughput regressed by more than {args.max_regression}%")
+
+if __name__ == "__main__":
+    main()
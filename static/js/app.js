@@ -131,7 +131,7 @@ function initApp() {
 
     async function loadHistory() {
         try {
-            const res = await fetch('/api/v1/history');
+            const res = await fetch('/api/v1/history?view=summary');
             const attempts = await res.json();
             
             historyList.innerHTML = '';
@@ -193,6 +193,11 @@ function initApp() {
     // Explicit Input Mode: "text" | "speech"
     let inputMode = "text";
 
+    // Live speech: analysis started over the WebSocket when recording stopped
+    // { explanation, concept, audience, promise } - its draft is submitted if the form is unchanged
+    let liveAnalysis = null;
+    const normalizeText = (text) => (text || '').replace(/\s+/g, ' ').trim();
+
     if (SpeechRecognition && micBtn) {
         micBtn.classList.remove('hidden');
         const recognition = new SpeechRecognition();
@@ -205,6 +210,72 @@ function initApp() {
         let isListening = false;
         let finalTranscript = '';
 
+        // Live metrics over WebSocket (falls back silently to the plain POST flow)
+        let liveSocket = null;
+        let liveSegmentStart = 0;
+
+        const openLiveSocket = () => {
+            liveAnalysis = null;
+            try {
+                const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
+                liveSocket = new WebSocket(`${protocol}://${window.location.host}/api/v1/ws/speech`);
+            } catch (err) {
+                console.error("Live speech socket failed", err);
+                liveSocket = null;
+                return;
+            }
+            liveSocket.onmessage = (event) => {
+                const msg = JSON.parse(event.data);
+                if (msg.type === 'metrics' && isListening) {
+                    const pauses = msg.pause_ratio !== null ? ` · ${Math.round(msg.pause_ratio * 100)}% pauses` : '';
+                    micText.textContent = `Stop Recording · ${msg.total_filler_count} fillers${pauses}`;
+                }
+            };
+        };
+
+        const sendLiveSegment = (text) => {
+            if (!liveSocket || liveSocket.readyState !== WebSocket.OPEN || !text.trim()) return;
+            const now = Date.now();
+            liveSocket.send(JSON.stringify({
+                type: 'segment',
+                text: text,
+                start: (liveSegmentStart - speechMetrics.startTime) / 1000,
+                end: (now - speechMetrics.startTime) / 1000
+            }));
+            liveSegmentStart = now;
+        };
+
+        const stopLiveSocket = () => {
+            const socket = liveSocket;
+            liveSocket = null;
+            if (!socket) return;
+            const concept = document.getElementById('concept').value;
+            // Only the spoken text is on the server; typed text before recording means a normal submit
+            if (!concept || finalTranscript.trim() || socket.readyState !== WebSocket.OPEN) {
+                socket.close();
+                return;
+            }
+            const explanation = explanationInput.value;
+            liveAnalysis = {
+                explanation: explanation,
+                concept: concept,
+                audience: document.getElementById('audience').value,
+                promise: new Promise((resolve) => {
+                    socket.onmessage = (event) => {
+                        const msg = JSON.parse(event.data);
+                        if (msg.type === 'result') resolve(msg.response);
+                        if (msg.type === 'error') resolve(null);
+                    };
+                    socket.onclose = () => resolve(null);
+                })
+            };
+            socket.send(JSON.stringify({
+                type: 'stop',
+                total_seconds: speechMetrics.totalDuration / 1000,
+                request: buildAnalysisPayload(concept, explanation, liveAnalysis.audience)
+            }));
+        };
+
         // Helpers
         const resetMetrics = () => {
             speechMetrics = {
@@ -238,6 +309,8 @@ function initApp() {
                  try {
                      finalTranscript = explanationInput.value; // Snapshot current text to append to
                      resetMetrics();
+                     liveSegmentStart = speechMetrics.startTime;
+                     openLiveSocket();
                      recognition.start();
                      isListening = true;
                      updateButtonState(true);
@@ -252,6 +325,7 @@ function initApp() {
         // Metrics Tracking
         recognition.onspeechstart = () => {
             speechMetrics.currentActiveStart = Date.now();
+            liveSegmentStart = speechMetrics.currentActiveStart;
         };
 
         recognition.onspeechend = () => {
@@ -270,6 +344,7 @@ function initApp() {
                  if (speechMetrics.currentActiveStart > 0) {
                      speechMetrics.activeDuration += (Date.now() - speechMetrics.currentActiveStart);
                  }
+                 stopLiveSocket();
              }
 
              isListening = false;
@@ -293,6 +368,7 @@ function initApp() {
              for (let i = event.resultIndex; i < event.results.length; ++i) {
                 if (event.results[i].isFinal) {
                     final += event.results[i][0].transcript;
+                    sendLiveSegment(event.results[i][0].transcript);
                 } else {
                     interim += event.results[i][0].transcript;
                 }
@@ -325,6 +401,10 @@ function initApp() {
 
         recognition.onerror = (event) => {
              console.error("Speech error", event.error);
+             if (liveSocket) {
+                 liveSocket.close();
+                 liveSocket = null;
+             }
              isListening = false;
              updateButtonState(false);
         };
@@ -343,6 +423,39 @@ function initApp() {
         if (counter) counter.textContent = `${count} / 2000 chars`;
     });
 
+    function buildAnalysisPayload(concept, explanation, audience) {
+        // Prepare Speech Metrics (Phase 3)
+        let durationPayload = null;
+        if (inputMode === "speech" && typeof speechMetrics !== 'undefined' && speechMetrics.totalDuration > 0) {
+             durationPayload = {
+                 total_seconds: Math.round(speechMetrics.totalDuration / 1000),
+                 active_seconds: Math.round(speechMetrics.activeDuration / 1000)
+             };
+        }
+
+        // Phase 4: Get Purpose from Attribute set by Inline Script
+        const currentPurpose = document.body.getAttribute('data-purpose') || 'learning';
+        console.log("Preparing analysis request. Purpose:", currentPurpose);
+        
+        // Loop Logic: Only send session ID if in interview mode
+        const sessionPayload = (currentPurpose === 'interview') ? {
+            session_id: sessionState.sessionId,
+            turn_index: sessionState.turnIndex
+        } : {};
+
+        return {
+            concept: concept,
+            explanation: explanation,
+            target_audience: audience,
+            source_text: currentSourceText, // Pass if loaded
+            previous_attempt_id: lastAttemptId, // Pass if revision
+            input_mode: inputMode, // Source of truth
+            speaking_duration: durationPayload, // Phase 3: Metrics
+            purpose: currentPurpose, // Phase 4: Learning vs Interview
+            ...sessionPayload
+        };
+    }
+
     form.addEventListener('submit', async (e) => {
         e.preventDefault();
 
@@ -358,38 +471,18 @@ function initApp() {
         resultsSection.classList.add('hidden');
 
         try {
-            // Prepare Speech Metrics (Phase 3)
-            let durationPayload = null;
-            if (inputMode === "speech" && typeof speechMetrics !== 'undefined' && speechMetrics.totalDuration > 0) {
-                 durationPayload = {
-                     total_seconds: Math.round(speechMetrics.totalDuration / 1000),
-                     active_seconds: Math.round(speechMetrics.activeDuration / 1000)
-                 };
+            // Live speech: the analysis that started when recording stopped is an unsaved draft.
+            // If nothing was edited since, submitting its id saves it instead of analyzing again.
+            let draft = null;
+            if (liveAnalysis && liveAnalysis.concept === concept && liveAnalysis.audience === audience
+                && normalizeText(liveAnalysis.explanation) === normalizeText(explanation)) {
+                draft = await liveAnalysis.promise;
             }
-
-            // Phase 4: Get Purpose from Attribute set by Inline Script
-            const currentPurpose = document.body.getAttribute('data-purpose') || 'learning';
-            console.log("Preparing analysis request. Purpose:", currentPurpose);
-            
-            // Loop Logic: Only send session ID if in interview mode
-            const sessionPayload = (currentPurpose === 'interview') ? {
-                session_id: sessionState.sessionId,
-                turn_index: sessionState.turnIndex
-            } : {};
+            liveAnalysis = null;
 
             // API Call (Updated for Phase 2, 3 & 4)
-            const payload = {
-                concept: concept,
-                explanation: explanation,
-                target_audience: audience,
-                source_text: currentSourceText, // Pass if loaded
-                previous_attempt_id: lastAttemptId, // Pass if revision
-                input_mode: inputMode, // Source of truth
-                speaking_duration: durationPayload, // Phase 3: Metrics
-                purpose: currentPurpose, // Phase 4: Learning vs Interview
-                ...sessionPayload
-            };
-            
+            const payload = buildAnalysisPayload(concept, explanation, audience);
+            if (draft && draft.draft) payload.draft_id = draft.attempt_id;
             console.log("Request Payload:", payload);
 
             const response = await fetch('/api/v1/analyze', {
@@ -0,0 +1,22 @@
+import pytest
+
+from app.core.config import settings
+from app.memory import attempts_store, progress_store
+from app.services.llm_engine import LLMEngine
+
+@pytest.fixture
+def engine(monkeypatch):
+    """A fresh LLMEngine singleton in live mode; the previous one is restored afterwards."""
+    monkeypatch.setattr(settings, "LLM_MODE", "live")
+    monkeypatch.setattr(settings, "LLM_HEDGE_API_BASE", None)
+    monkeypatch.setattr(LLMEngine, "_instance", None)
+    return LLMEngine()
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    """Attempts log and progress aggregates in a temporary directory."""
+    monkeypatch.setattr(attempts_store, "HISTORY_DIR", str(tmp_path))
+    monkeypatch.setattr(attempts_store, "HISTORY_FILE", str(tmp_path / "attempts.json"))
+    monkeypatch.setattr(progress_store, "PROGRESS_FILE", str(tmp_path / "progress.json"))
+    monkeypatch.setattr(progress_store, "_progress", None)
+    return tmp_path
@@ -0,0 +1,47 @@
+def make_error(cls, message: str = "test"):
+    """openai/httpx error constructors differ across versions; tests only need the type."""
+    error = cls.__new__(cls)
+    Exception.__init__(error, message)
+    return error
+
+class FakeClock:
+    """Replaces time.monotonic in the module under test; advance it by setting `now`."""
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+class FakeCompletions:
+    """Stands in for client.chat.completions: returns or raises the queued outcomes in order."""
+    def __init__(self, outcomes: list):
+        self.outcomes = outcomes
+        self.calls = 0
+        self.requests: list[dict] = []
+
+    def create(self, **request):
+        self.calls += 1
+        self.requests.append(request)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+class FakeClient:
+    def __init__(self, outcomes: list):
+        self.chat = type("Chat", (), {})()
+        self.chat.completions = FakeCompletions(outcomes)
+
+    def with_options(self, **kwargs):
+        return self
+
+class StubLLM:
+    """Stands in for the engine behind generate(): records each call and answers from `respond(call)`."""
+    def __init__(self, respond):
+        self.respond = respond
+        self.calls: list[dict] = []
+
+    def generate(self, system_prompt: str, user_prompt: str, max_tokens: int | None = None, task: str = "analysis", slot_id: int | None = None) -> str:
+        call = {"system_prompt": system_prompt, "user_prompt": user_prompt, "max_tokens": max_tokens, "task": task, "slot_id": slot_id}
+        self.calls.append(call)
+        return self.respond(call)
@@ -0,0 +1,54 @@
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.endpoints import admin
+from app.core.config import settings
+
+TOKEN = "s3cret"
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_DIR", str(tmp_path / "profiles"))
+    monkeypatch.setattr(settings, "PROFILING_ADMIN_TOKEN", TOKEN)
+    os.makedirs(settings.PROFILING_DIR)
+    (tmp_path / "profiles" / "20260101T000000-analyze-abcd1234.folded").write_text("analyze;llm 3\n", encoding="utf-8")
+    (tmp_path / "secret.txt").write_text("do not serve", encoding="utf-8")
+    app = FastAPI()
+    app.include_router(admin.router, prefix="/api/admin")
+    return TestClient(app)
+
+AUTH = {"Authorization": f"Bearer {TOKEN}"}
+
+def test_requires_token(client):
+    assert client.get("/api/admin/profiles").status_code == 401
+    assert client.get("/api/admin/profiles", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/api/admin/profiles", headers={"Authorization": TOKEN}).status_code == 401
+    profiles = client.get("/api/admin/profiles", headers=AUTH).json()
+    assert [p["name"] for p in profiles] == ["20260101T000000-analyze-abcd1234.folded"]
+
+def test_download(client):
+    response = client.get("/api/admin/profiles/20260101T000000-analyze-abcd1234.folded", headers=AUTH)
+    assert response.status_code == 200
+    assert response.text == "analyze;llm 3\n"
+
+@pytest.mark.parametrize("name", ["..%2Fsecret.txt", "..%5Csecret.txt", "secret.txt", "%2E%2E%2Fsecret.txt"])
+def test_name_cannot_escape_profile_dir(client, name):
+    response = client.get(f"/api/admin/profiles/{name}", headers=AUTH)
+    assert response.status_code == 404
+    assert "do not serve" not in response.text
+
+def test_no_token_configured_hides_endpoints(client, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_ADMIN_TOKEN", None)
+    assert client.get("/api/admin/profiles", headers=AUTH).status_code == 404
+
+def test_not_mounted_without_token(monkeypatch):
+    from app.main import app
+    if settings.PROFILING_ADMIN_TOKEN:
+        pytest.skip("PROFILING_ADMIN_TOKEN is set in this environment")
+    # Entering the client runs the lifespan; don't let it start a warm-up against a real backend
+    monkeypatch.setattr(settings, "WARMUP_ENABLED", False)
+    with TestClient(app) as client:
+        assert client.get("/api/admin/profiles").status_code in (404, 405)
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.schemas.analysis import AnalysisRequest, BatchAnalysisRequest
+from app.services import batch_analyzer as batch_module
+from app.services.batch_analyzer import BatchAnalyzer
+
+class FakeChunker:
+    def __init__(self):
+        self.calls = 0
+        self.threads: set[int] = set()
+
+    def chunk_text(self, text: str) -> list[dict]:
+        self.calls += 1
+        self.threads.add(threading.get_ident())
+        return [{"id": 0, "text": text}]
+
+class FakeAnalyzer:
+    """analyze_explanation runs in the threadpool; items listed in `blocked` wait until `gate` is set."""
+    def __init__(self, blocked=(), failing=()):
+        self.chunker = FakeChunker()
+        self.blocked = set(blocked)
+        self.failing = set(failing)
+        self.gate = threading.Event()
+        self.started: list[str] = []
+        self.chunks_seen: dict[str, list | None] = {}
+        self._lock = threading.Lock()
+
+    def analyze_explanation(self, request: AnalysisRequest, chunks=None):
+        with self._lock:
+            self.started.append(request.explanation)
+            self.chunks_seen[request.explanation] = chunks
+        if request.explanation in self.blocked:
+            self.gate.wait(timeout=5)
+        if request.explanation in self.failing:
+            raise RuntimeError("model said no")
+        return SimpleNamespace(model_dump=lambda: {"explanation": request.explanation})
+
+@pytest.fixture
+def fake_analyzer(monkeypatch):
+    def install(**kwargs) -> FakeAnalyzer:
+        analyzer = FakeAnalyzer(**kwargs)
+        monkeypatch.setattr(batch_module, "get_analyzer_service", lambda: analyzer)
+        return analyzer
+    return install
+
+def batch(count: int, **fields) -> BatchAnalysisRequest:
+    return BatchAnalysisRequest(items=[AnalysisRequest(concept="Entropy", explanation=f"item {i}") for i in range(count)], **fields)
+
+async def collect(request: BatchAnalysisRequest) -> list[dict]:
+    return [event async for event in BatchAnalyzer().stream(request)]
+
+def test_events_and_per_item_failures(fake_analyzer, monkeypatch):
+    monkeypatch.setattr(settings, "BATCH_MAX_CONCURRENCY", 2)
+    analyzer = fake_analyzer(failing={"item 1"})
+    events = asyncio.run(collect(batch(3, max_concurrency=10)))
+
+    assert events[0] == {"event": "started", "total": 3, "concurrency": 2}
+    results = {e["index"]: e for e in events[1:-1]}
+    assert results[1]["status"] == "error" and results[1]["error"] == "model said no"
+    assert results[0]["response"] == {"explanation": "item 0"}
+    assert [e["progress"]["completed"] for e in events[1:-1]] == [1, 2, 3]
+    assert events[-1] == {"event": "done", "total": 3, "succeeded": 2, "failed": 1}
+    assert sorted(analyzer.started) == ["item 0", "item 1", "item 2"]
+
+def test_shared_source_is_chunked_once(fake_analyzer):
+    analyzer = fake_analyzer()
+    request = batch(4, source_text="Entropy counts microstates.")
+    request.items[3].source_text = "Another document."
+    asyncio.run(collect(request))
+    assert analyzer.chunker.calls == 2
+    assert threading.get_ident() not in analyzer.chunker.threads  # Chunked in the threadpool, not on the loop
+    assert analyzer.chunks_seen["item 0"] is analyzer.chunks_seen["item 2"]
+    assert analyzer.chunks_seen["item 3"] == [{"id": 0, "text": "Another document."}]
+
+def test_disconnect_cancels_queued_items(fake_analyzer, monkeypatch):
+    monkeypatch.setattr(settings, "BATCH_MAX_CONCURRENCY", 2)
+    analyzer = fake_analyzer(blocked={f"item {i}" for i in range(1, 8)})
+
+    async def consume_first_result_then_disconnect():
+        stream = BatchAnalyzer().stream(batch(8))
+        assert (await stream.__anext__())["event"] == "started"
+        first = await stream.__anext__()
+        # What StreamingResponse does when the client goes away
+        await stream.aclose()
+        # Let the running items finish while the loop is still alive: uncancelled queued items would start now
+        analyzer.gate.set()
+        await asyncio.sleep(0.3)
+        return first
+
+    first = asyncio.run(consume_first_result_then_disconnect())
+    assert first["index"] == 0
+    # Only the items that already held a slot ran; the queued ones never reached the model
+    assert len(analyzer.started) <= 3
+    assert set(analyzer.started) <= {"item 0", "item 1", "item 2"}
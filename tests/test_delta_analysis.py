@@ -0,0 +1,157 @@
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.schemas.analysis import AnalysisRequest
+from app.services.explanation_diff import diff_explanations, split_sentences
+from app.services.feynman_analyzer import PARSE_FALLBACK_SUMMARY, FeynmanAnalyzer
+from tests.helpers import StubLLM
+
+OLD_TEXT = (
+    "Entropy measures how spread out energy is. "
+    "Heat flows from hot things to cold things. "
+    "That is why ice melts in a warm room. "
+    "Over time everything ends up the same temperature."
+)
+
+def old_attempt(**overrides) -> dict:
+    attempt = {
+        "attempt_id": "a1",
+        "concept": "Entropy",
+        "target_audience": "5-year-old",
+        "explanation_text": OLD_TEXT,
+        "analysis_result": {
+            "summary": "Good intuition.",
+            "gaps": ["No example of disorder", "Does not say why heat flows"],
+            "suggestions": ["Use a messy room example"],
+        },
+    }
+    attempt.update(overrides)
+    return attempt
+
+def revise(old: str, old_sentence: str, new_sentence: str) -> str:
+    assert old_sentence in old
+    return old.replace(old_sentence, new_sentence)
+
+@pytest.fixture
+def analyzer(engine):
+    return FeynmanAnalyzer()
+
+def test_split_sentences_normalizes_whitespace():
+    assert split_sentences("One.  Two!\n\nThree?   Four") == ["One.", "Two!", "Three?", "Four"]
+    assert split_sentences("") == []
+
+def test_diff_reports_rewritten_added_and_removed_sentences():
+    new_text = revise(OLD_TEXT, "That is why ice melts in a warm room.", "That is why ice cubes melt in lemonade.")
+    new_text += " A messy room is more likely than a tidy one."
+    diff = diff_explanations(OLD_TEXT, new_text)
+    assert diff["changed_sentences"] == ["That is why ice cubes melt in lemonade.", "A messy room is more likely than a tidy one."]
+    assert diff["removed_sentences"] == ["That is why ice melts in a warm room."]
+    assert diff["unchanged_count"] == 3
+    assert 0 < diff["change_ratio"] < 0.5
+
+def test_diff_ignores_whitespace_only_edits():
+    diff = diff_explanations(OLD_TEXT, OLD_TEXT.replace(" ", "  ").replace(". ", ".\n"))
+    assert diff == {"changed_sentences": [], "removed_sentences": [], "unchanged_count": 4, "change_ratio": 0.0}
+
+def test_diff_of_a_rewrite_is_all_changed():
+    diff = diff_explanations(OLD_TEXT, "Completely different words. Nothing shared.")
+    assert diff["change_ratio"] == 1.0
+    assert diff["unchanged_count"] == 0
+    assert diff_explanations("", "")["change_ratio"] == 0.0
+
+def request_for(text: str, **overrides) -> AnalysisRequest:
+    fields = {"concept": "entropy ", "explanation": text, "previous_attempt_id": "a1"}
+    fields.update(overrides)
+    return AnalysisRequest(**fields)
+
+def test_plan_delta_for_a_small_revision(analyzer):
+    text = revise(OLD_TEXT, "That is why ice melts in a warm room.", "That is why ice cubes melt in lemonade.")
+    diff = analyzer._plan_delta(request_for(text), old_attempt())
+    assert diff["changed_sentences"] == ["That is why ice cubes melt in lemonade."]
+
+@pytest.mark.parametrize("overrides, attempt_overrides", [
+    ({"purpose": "interview"}, {}),
+    ({"input_mode": "speech"}, {}),
+    ({"concept": "Enthalpy"}, {}),
+    ({"target_audience": "physics student"}, {}),
+    ({}, {"analysis_result": {"summary": PARSE_FALLBACK_SUMMARY, "gaps": []}}),
+    ({}, {"analysis_result": {"summary": "Error: Local LLM Server is not running.", "gaps": []}}),
+])
+def test_plan_delta_falls_back_to_full_analysis(analyzer, overrides, attempt_overrides):
+    text = revise(OLD_TEXT, "That is why ice melts in a warm room.", "That is why ice cubes melt in lemonade.")
+    assert analyzer._plan_delta(request_for(text, **overrides), old_attempt(**attempt_overrides)) is None
+
+def test_plan_delta_respects_the_change_ratio(analyzer, monkeypatch):
+    text = revise(OLD_TEXT, "That is why ice melts in a warm room.", "That is why ice cubes melt in lemonade.")
+    ratio = diff_explanations(OLD_TEXT, text)["change_ratio"]
+    monkeypatch.setattr(settings, "DELTA_MAX_CHANGE_RATIO", ratio)
+    assert analyzer._plan_delta(request_for(text), old_attempt()) is not None
+    monkeypatch.setattr(settings, "DELTA_MAX_CHANGE_RATIO", ratio - 0.001)
+    assert analyzer._plan_delta(request_for(text), old_attempt()) is None
+    monkeypatch.setattr(settings, "DELTA_ANALYSIS_ENABLED", False)
+    monkeypatch.setattr(settings, "DELTA_MAX_CHANGE_RATIO", 1.0)
+    assert analyzer._plan_delta(request_for(text), old_attempt()) is None
+
+def test_analyze_delta_sends_only_changes_and_carries_the_rest(analyzer):
+    analyzer.llm = StubLLM(lambda call: json.dumps({
+        "summary": "Better example.", "resolved_gaps": [2, "x", 9], "new_gaps": ["Lemonade is not a closed system"],
+    }))
+    text = revise(OLD_TEXT, "That is why ice melts in a warm room.", "That is why ice cubes melt in lemonade.")
+    diff = diff_explanations(OLD_TEXT, text)
+
+    result = analyzer._analyze_delta(request_for(text), diff, old_attempt(), "", None)
+
+    [call] = analyzer.llm.calls
+    assert "That is why ice cubes melt in lemonade." in call["user_prompt"]
+    assert "Heat flows from hot things to cold things." not in call["user_prompt"]
+    assert call["max_tokens"] == settings.DELTA_MAX_TOKENS
+    assert result["summary"] == "Better example."
+    assert result["gaps"] == ["No example of disorder", "Lemonade is not a closed system"]
+    assert result["suggestions"] == ["Use a messy room example"]
+    assert result["delta"]["resolved_gaps"] == ["Does not say why heat flows"]
+    assert result["delta"]["base_attempt_id"] == "a1"
+    assert "filler_analysis" not in result
+
+def test_unchanged_revision_needs_no_llm_call(analyzer):
+    analyzer.llm = StubLLM(lambda call: pytest.fail("no LLM call expected"))
+    diff = diff_explanations(OLD_TEXT, OLD_TEXT + "  ")
+    result = analyzer._analyze_delta(request_for(OLD_TEXT), diff, old_attempt(), "", None)
+    assert result["gaps"] == old_attempt()["analysis_result"]["gaps"]
+    assert result["delta"]["changed_sentences"] == 0
+
+@pytest.mark.parametrize("response", ["not json", "[1, 2]", '{"gaps": []}'])
+def test_unusable_delta_answer_falls_back(analyzer, response):
+    analyzer.llm = StubLLM(lambda call: response)
+    text = revise(OLD_TEXT, "That is why ice melts in a warm room.", "That is why ice cubes melt in lemonade.")
+    assert analyzer._analyze_delta(request_for(text), diff_explanations(OLD_TEXT, text), old_attempt(), "", None) is None
+
+def test_delta_of_a_segmented_base_drops_pass_specific_blocks(analyzer):
+    analyzer.llm = StubLLM(lambda call: json.dumps({
+        "summary": "Better.", "resolved_gaps": [], "new_gaps": [], "follow_up_questions": ["Why lemonade?"],
+    }))
+    base = old_attempt()
+    base["analysis_result"] = dict(
+        base["analysis_result"],
+        follow_up_questions=["Why does ice melt?"],
+        speaking_clarity={"issues": [], "suggestions": []},
+        segmented={"segments": 4, "analyzed": 4, "reduced_locally": False},
+        delta={"base_attempt_id": "a0"},
+        speaking_metrics={"pause_ratio": 0.2},
+    )
+    text = revise(OLD_TEXT, "That is why ice melts in a warm room.", "That is why ice cubes melt in lemonade.")
+
+    result = analyzer._analyze_delta(request_for(text), diff_explanations(OLD_TEXT, text), base, "", None)
+
+    assert set(result) == {"summary", "gaps", "suggestions", "speaking_clarity", "follow_up_questions", "delta"}
+    assert result["follow_up_questions"] == ["Why lemonade?"]
+    assert result["delta"]["base_attempt_id"] == "a1"
+
+def test_delta_keeps_previous_follow_ups_when_the_model_sends_none(analyzer):
+    analyzer.llm = StubLLM(lambda call: json.dumps({"summary": "Better.", "resolved_gaps": []}))
+    base = old_attempt()
+    base["analysis_result"]["follow_up_questions"] = ["Why does ice melt?"]
+    text = revise(OLD_TEXT, "That is why ice melts in a warm room.", "That is why ice cubes melt in lemonade.")
+    result = analyzer._analyze_delta(request_for(text), diff_explanations(OLD_TEXT, text), base, "", None)
+    assert result["follow_up_questions"] == ["Why does ice melt?"]
@@ -0,0 +1,118 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.prompts.templates import (
+    INTERVIEWER_FEYNMAN_SYSTEM_PROMPT,
+    PROFESSOR_FEYNMAN_SYSTEM_PROMPT,
+    PromptMode,
+    get_prompt_template,
+)
+from app.schemas.analysis import AnalysisRequest
+from app.services.explanation_comparator import ExplanationComparator
+from app.services.explanation_diff import diff_explanations
+from app.services.feynman_analyzer import PARSE_FALLBACK_SUMMARY, FeynmanAnalyzer
+from app.services.retrieval import compress_chunks
+from tests.helpers import StubLLM
+
+# The benchmark scripts are not a package; load the server module by path
+_spec = importlib.util.spec_from_file_location(
+    "fake_llama_server", Path(__file__).resolve().parents[1] / "scripts" / "bench" / "fake_llama_server.py"
+)
+fake_server = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(fake_server)
+
+def fake_llm() -> StubLLM:
+    """Answers generate() with what the fake server would send for the same prompts."""
+    return StubLLM(lambda call: fake_server.build_content([
+        {"role": "system", "content": call["system_prompt"]},
+        {"role": "user", "content": call["user_prompt"]},
+    ]))
+
+def feynman_prompt(system_prompt: str, **extra) -> list[dict]:
+    user = get_prompt_template(PromptMode.FEYNMAN_ANALYSIS, concept="Entropy", target_audience="5-year-old",
+                               explanation="Entropy is how messy things get.", speaking_context="")
+    return [{"role": "system", "content": system_prompt}, {"role": "user", "content": user + extra.get("suffix", "")}]
+
+@pytest.fixture
+def analyzer(engine):
+    analyzer = FeynmanAnalyzer()
+    analyzer.llm = fake_llm()
+    return analyzer
+
+def test_analysis_response(analyzer):
+    request = AnalysisRequest(concept="Entropy", explanation="Entropy is how messy things get.")
+    raw = fake_server.build_content(feynman_prompt(PROFESSOR_FEYNMAN_SYSTEM_PROMPT))
+    analysis = analyzer._parse_analysis(raw, request, None, None)
+    assert analysis["summary"] != PARSE_FALLBACK_SUMMARY
+    for key in ("gaps", "suggestions", "follow_up_questions"):
+        assert isinstance(analysis[key], list) and all(isinstance(v, str) for v in analysis[key])
+    assert "interviewer_followup" not in json.loads(raw)
+
+def test_interviewer_response():
+    followup = json.loads(fake_server.build_content(feynman_prompt(INTERVIEWER_FEYNMAN_SYSTEM_PROMPT)))["interviewer_followup"]
+    assert followup["question"] and followup["intent"]
+    final = fake_server.build_content(feynman_prompt(
+        INTERVIEWER_FEYNMAN_SYSTEM_PROMPT,
+        suffix="\nThis is the final turn. Do NOT generate any follow-up questions. State 'Interview Complete'."
+    ))
+    assert "interviewer_followup" not in json.loads(final)
+
+def test_comparison_response(engine, monkeypatch):
+    monkeypatch.setattr(settings, "COMPARATOR_FAST_PATH_ENABLED", False)
+    comparator = ExplanationComparator()
+    comparator.llm = fake_llm()
+    result = comparator.compare_attempts({"summary": "a", "gaps": ["x"]}, {"summary": "b", "gaps": []})
+    assert result["improvement_status"] in ("better", "same", "worse")
+    assert isinstance(result["key_changes"], list) and result["encouragement"]
+    assert comparator.llm.calls[0]["task"] == "comparison"
+
+def test_delta_response(analyzer):
+    old_text = "Entropy is how messy things get. Heat flows from hot to cold."
+    new_text = "Entropy counts the ways particles can be arranged. Heat flows from hot to cold."
+    old_attempt = {"attempt_id": "a1", "explanation_text": old_text,
+                   "analysis_result": {"summary": "ok", "gaps": ["No mechanism", "No example"]}}
+    request = AnalysisRequest(concept="Entropy", explanation=new_text)
+    result = analyzer._analyze_delta(request, diff_explanations(old_text, new_text), old_attempt, "", None)
+    assert result is not None
+    assert result["delta"]["resolved_gaps"] == ["No mechanism"]
+
+def test_segment_and_reduce_responses(analyzer, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_SLOTS", 2)
+    request = AnalysisRequest(concept="Entropy", explanation="x")
+    segments = ["Part one of the talk.", "Part two of the talk.", "Part three of the talk."]
+    result = analyzer._segmented_analysis(request, segments, "", "", None, None)
+    assert result["segmented"] == {"segments": 3, "analyzed": 3, "reduced_locally": False}
+    segment_answers = [json.loads(r) for r in map(analyzer.llm.respond, analyzer.llm.calls[:3])]
+    assert {a["summary"].split()[1] for a in segment_answers} == {"1", "2", "3"}
+
+def test_compression_response(engine, monkeypatch):
+    llm = fake_llm()
+    monkeypatch.setattr(engine, "generate", llm.generate)
+    chunk = {"id": 0, "text": "Gas spreads out. Entropy counts microstates. Sugar is sweet."}
+    [compressed] = compress_chunks("entropy microstates", [chunk], mode="llm")
+    # Extractive fallback would have kept "Entropy counts microstates."
+    assert compressed["text"] == "Gas spreads out."
+    assert llm.calls[0]["task"] == "compression"
+
+def test_completion_endpoint_models_the_prompt_cache(monkeypatch):
+    monkeypatch.setitem(fake_server.CONFIG, "prompt_ms_per_token", 0.0)
+    monkeypatch.setitem(fake_server.CONFIG, "token_ms", 0.0)
+    monkeypatch.setitem(fake_server.CONFIG, "slots", 2)
+    monkeypatch.setitem(fake_server.STATE, "slot_prompts", {})
+    body = {"messages": feynman_prompt(PROFESSOR_FEYNMAN_SYSTEM_PROMPT), "max_tokens": 1000, "id_slot": 1}
+
+    with TestClient(fake_server.app) as client:
+        first = client.post("/v1/chat/completions", json=body).json()
+        second = client.post("/v1/chat/completions", json=body).json()
+        other_slot = client.post("/v1/chat/completions", json=dict(body, id_slot=0)).json()
+
+    json.loads(first["choices"][0]["message"]["content"])
+    assert first["usage"]["total_tokens"] == first["usage"]["prompt_tokens"] + first["usage"]["completion_tokens"]
+    assert first["timings"]["cache_n"] == 0
+    assert second["timings"]["cache_n"] == first["usage"]["prompt_tokens"]
+    assert other_slot["timings"]["cache_n"] == 0
@@ -0,0 +1,38 @@
+import pytest
+
+from app.services.feynman_analyzer import FeynmanAnalyzer
+from app.services.live_speech import LiveSpeechSession
+
+KELVIN = "K"  # casefolds to "k"
+LONG_S = "ſ"  # casefolds to "s"
+
+@pytest.fixture
+def analyzer():
+    # _analyze_fillers needs no backend
+    return FeynmanAnalyzer.__new__(FeynmanAnalyzer)
+
+def test_counts_fillers_and_keeps_filler_order_on_ties(analyzer):
+    result = analyzer._analyze_fillers("So, um, it is like heat, you know, and um like so on.")
+    assert result["filler_counts"] == {"so": 2, "um": 2, "like": 2, "you know": 1}
+    assert result["common_fillers"] == ["um", "like", "so"]
+    assert result["total_filler_count"] == 7
+
+@pytest.mark.parametrize("text", [
+    f"{LONG_S}o the entropy goes up and {LONG_S}o does disorder",
+    f"li{KELVIN}e the entropy goes up, li{KELVIN}e, always",
+    f"I MEAN the entropy goes up, i mean it really does",
+])
+def test_unicode_case_variants_map_to_the_canonical_filler(analyzer, text):
+    result = analyzer._analyze_fillers(text)
+    assert result is not None
+    assert len(result["common_fillers"]) == 1
+    assert result["common_fillers"][0] in {"so", "like", "i mean"}
+    assert sum(result["filler_counts"].values()) == 2
+    assert {p["filler"] for p in result["filler_positions"]} == set(result["common_fillers"])
+
+def test_live_session_reports_unicode_variants():
+    session = LiveSpeechSession(max_chars=1000)
+    session.add_segment(f"{LONG_S}o the entropy goes")
+    metrics = session.add_segment(f"up li{KELVIN}e always")
+    assert metrics["filler_counts"] == {"so": 1, "like": 1}
+    assert metrics["common_fillers"] == ["like", "so"]
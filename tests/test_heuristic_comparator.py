@@ -0,0 +1,106 @@
+import pytest
+
+from app.services.heuristic_comparator import (
+    FILLER_DENSITY_DELTA,
+    compare_heuristically,
+    match_gaps,
+    text_similarity,
+    token_set_similarity,
+)
+
+THRESHOLD = 0.6
+
+def analysis(gaps: list[str], density: float = 0.0) -> dict:
+    return {"gaps": gaps, "filler_analysis": {"filler_density": density}}
+
+def test_token_set_similarity_ignores_stopwords_and_case():
+    assert token_set_similarity("The entropy of a gas", "entropy GAS") == 1.0
+    assert token_set_similarity("", "the a of") == 1.0
+    assert token_set_similarity("heat flows", "entropy rises") == 0.0
+
+def test_match_gaps_pairs_rephrased_gaps_above_threshold():
+    old = ["Does not explain why entropy increases", "No example of heat flow"]
+    new = ["Does not explain why entropy always increases", "Confuses energy with temperature"]
+    persisting, resolved, introduced = match_gaps(old, new, THRESHOLD)
+    assert persisting == ["Does not explain why entropy increases"]
+    assert resolved == ["No example of heat flow"]
+    assert introduced == ["Confuses energy with temperature"]
+
+def test_match_gaps_threshold_is_inclusive():
+    # 3 shared of 5 distinct meaningful words: exactly 0.6
+    old, new = ["entropy heat disorder gas"], ["entropy heat disorder volume"]
+    assert token_set_similarity(old[0], new[0]) == pytest.approx(0.6)
+    assert match_gaps(old, new, 0.6)[0] == old
+    assert match_gaps(old, new, 0.61)[0] == []
+
+def test_match_gaps_pairs_each_gap_once():
+    persisting, resolved, introduced = match_gaps(["entropy heat"], ["entropy heat", "entropy heat"], THRESHOLD)
+    assert persisting == ["entropy heat"]
+    assert introduced == ["entropy heat"]
+
+def test_only_resolved_gaps_is_better():
+    result = compare_heuristically(analysis(["No example of heat flow", "Skips the second law"]),
+                                   analysis(["Skips the second law"]), "a b", "a b c", THRESHOLD)
+    assert result["improvement_status"] == "better"
+    assert result["method"] == "heuristic"
+    assert result["key_changes"] == ["Resolved: No example of heat flow"]
+    assert result["signals"]["gaps_resolved"] == 1
+    assert result["signals"]["gaps_persisting"] == 1
+
+def test_only_introduced_gaps_is_worse():
+    result = compare_heuristically(analysis([]), analysis(["Confuses energy with temperature"]), None, None, THRESHOLD)
+    assert result["improvement_status"] == "worse"
+    assert result["signals"]["text_similarity"] is None
+
+def test_resolved_and_introduced_is_ambiguous():
+    assert compare_heuristically(analysis(["No example of heat flow"]), analysis(["Confuses energy with temperature"]),
+                                 None, None, THRESHOLD) is None
+
+@pytest.mark.parametrize("delta, expected", [
+    (-FILLER_DENSITY_DELTA, "better"),
+    (FILLER_DENSITY_DELTA, "worse"),
+    (-(FILLER_DENSITY_DELTA - 0.001), "same"),
+    (FILLER_DENSITY_DELTA - 0.001, "same"),
+])
+def test_filler_density_threshold(delta, expected):
+    result = compare_heuristically(analysis([], 0.05), analysis([], round(0.05 + delta, 3)), None, None, THRESHOLD)
+    assert result["improvement_status"] == expected
+    assert any(c.startswith("Filler density") for c in result["key_changes"]) == (expected != "same")
+
+def test_gap_and_filler_signals_disagreeing_is_ambiguous():
+    old = analysis(["No example of heat flow"], 0.01)
+    new = analysis([], 0.01 + FILLER_DENSITY_DELTA)
+    assert compare_heuristically(old, new, None, None, THRESHOLD) is None
+
+def test_unchanged_text_is_same():
+    text = "Entropy is a measure of how many ways the particles can be arranged."
+    result = compare_heuristically(analysis(["Skips the second law"]), analysis(["Skips the second law"]), text, text, THRESHOLD)
+    assert result["improvement_status"] == "same"
+    assert result["key_changes"] == ["Explanation is essentially unchanged"]
+    assert result["signals"]["text_similarity"] == 1.0
+
+def test_same_with_persisting_gaps_or_none():
+    persisting = compare_heuristically(analysis(["Skips the second law"]), analysis(["Skips the second law"]),
+                                       "one version", "a quite different version", THRESHOLD)
+    assert persisting["key_changes"] == ["The same 1 gap(s) remain"]
+    none = compare_heuristically(analysis([]), analysis([]), "one version", "a quite different version", THRESHOLD)
+    assert none["key_changes"] == ["No gaps before or after"]
+    assert none["encouragement"] != persisting["encouragement"]
+
+def test_text_similarity_is_word_level():
+    assert text_similarity("a b c d", "a b c d") == 1.0
+    assert text_similarity("a b c d", "a b x d") == pytest.approx(0.75)
+    assert text_similarity(None, "") == 1.0  # Both empty: nothing changed
+
+def test_comparator_asks_the_llm_only_when_ambiguous(engine, monkeypatch):
+    from app.services.explanation_comparator import ExplanationComparator
+    calls = []
+    monkeypatch.setattr(engine, "generate", lambda **kwargs: calls.append(kwargs) or
+                        '{"improvement_status": "same", "key_changes": [], "encouragement": "ok"}')
+    comparator = ExplanationComparator()
+
+    clear = comparator.compare_attempts(analysis(["No example of heat flow"]), analysis([]))
+    assert clear["method"] == "heuristic" and not calls
+    ambiguous = comparator.compare_attempts(analysis(["No example of heat flow"]), analysis(["Confuses energy with temperature"]))
+    assert ambiguous["improvement_status"] == "same"
+    assert [c["task"] for c in calls] == ["comparison"]
@@ -0,0 +1,171 @@
+import json
+import random
+
+import pytest
+
+from app.memory import draft_store as draft_module
+from app.memory import progress_store
+from app.memory.attempts_store import load_attempts
+from app.memory.draft_store import DraftAttemptStore
+from app.schemas.analysis import AnalysisRequest
+from app.services import feynman_analyzer
+from app.services.feynman_analyzer import FeynmanAnalyzer
+from app.services.live_speech import LiveSpeechSession
+from tests.helpers import FakeClock, StubLLM
+
+TALK = (
+    "So um entropy is like you know how messy things get and I mean kind of the number of ways "
+    "uh the particles can be arranged right so basically a hot cup you see sort of spreads its heat "
+    "and actually it never goes back you know because that would be like un mixing milk I mean um"
+)
+
+def full_scan(text: str) -> dict:
+    return FeynmanAnalyzer.__new__(FeynmanAnalyzer)._analyze_fillers(text)
+
+def feed(segments: list[str]) -> LiveSpeechSession:
+    session = LiveSpeechSession(max_chars=10000)
+    for segment in segments:
+        session.add_segment(segment)
+    return session
+
+def split_words(text: str, cuts: list[int]) -> list[str]:
+    words = text.split()
+    bounds = [0] + sorted(cuts) + [len(words)]
+    return [" ".join(words[a:b]) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+@pytest.mark.parametrize("segments", [
+    ["we all", "you", "know", "it"],           # two-word filler split across segments
+    ["it is kind", "of hot you", "see"],       # and again, twice in a row
+    ["I", "mean", "I mean", "so so"],
+    ["you know you", "know you", "know"],      # overlapping candidates around boundaries
+    ["like it", "", "   ", "like it a lot"],  # empty segments change nothing
+])
+def test_fillers_across_segment_boundaries_match_a_full_scan(segments):
+    session = feed(segments)
+    expected = full_scan(session.transcript) or {"filler_counts": {}, "total_filler_count": 0}
+    metrics = session.metrics()
+    assert metrics["filler_counts"] == expected["filler_counts"]
+    assert metrics["total_filler_count"] == expected["total_filler_count"]
+
+def test_random_segmentations_match_a_full_scan():
+    rng = random.Random(40)
+    words = TALK.split()
+    expected = full_scan(TALK)
+    for _ in range(200):
+        cuts = rng.sample(range(1, len(words)), rng.randint(1, len(words) - 1))
+        session = feed(split_words(TALK, cuts))
+        assert session.transcript == TALK
+        metrics = session.metrics()
+        assert metrics["filler_counts"] == expected["filler_counts"]
+        assert metrics["common_fillers"] == expected["common_fillers"]
+        assert metrics["filler_density"] == expected["filler_density"]
+        assert session.filler_positions == expected["filler_positions"]
+
+def test_positions_point_into_the_joined_transcript():
+    session = feed(["so we", "you", "know it"])
+    assert [session.transcript[p["start"]:p["end"]].lower() for p in session.filler_positions] == ["so", "you know"]
+
+def test_transcript_cap():
+    session = LiveSpeechSession(max_chars=11)
+    session.add_segment("hello")
+    with pytest.raises(ValueError):
+        session.add_segment("world!")  # "hello world!" is 12
+    session.add_segment("world")
+    assert session.transcript == "hello world"
+
+def test_timing_metrics_and_analysis_request():
+    session = LiveSpeechSession(max_chars=1000)
+    session.add_segment("um entropy is", start=0.0, end=2.0)
+    metrics = session.add_segment("like disorder", start=3.0, end=4.0)
+    assert metrics["active_seconds"] == 3.0
+    assert metrics["pause_ratio"] == 0.25
+    session.stop(total_seconds=6.0)
+
+    request = session.analysis_request({"concept": "Entropy", "explanation": "ignored", "input_mode": "text"})
+    assert request.explanation == "um entropy is like disorder"
+    assert request.input_mode == "speech"
+    assert request.speaking_duration == {"total_seconds": 6.0, "active_seconds": 3.0}
+
+TRANSCRIPT = "um entropy is like how messy a room gets over time"
+
+@pytest.fixture
+def analyzer(engine, history, monkeypatch):
+    analyzer = FeynmanAnalyzer()
+    analyzer.llm = StubLLM(lambda call: json.dumps({"summary": "Fine.", "gaps": [], "suggestions": []}))
+    monkeypatch.setattr(draft_module, "draft_store", DraftAttemptStore(ttl_seconds=60, max_drafts=10))
+    monkeypatch.setattr(feynman_analyzer, "draft_store", draft_module.draft_store)
+    return analyzer
+
+def stop_time_analysis(analyzer) -> dict:
+    session = feed(split_words(TRANSCRIPT, [3, 6]))
+    request = session.analysis_request({"concept": "Entropy", "draft_id": "client-sent"})
+    return analyzer.analyze_explanation(request, save=False).model_dump()
+
+def submit(analyzer, draft: dict, explanation: str = TRANSCRIPT, **fields):
+    return analyzer.analyze_explanation(AnalysisRequest(
+        concept="Entropy", explanation=explanation, input_mode="speech", draft_id=draft["attempt_id"], **fields
+    ))
+
+def test_stop_time_analysis_is_not_saved(analyzer):
+    draft = stop_time_analysis(analyzer)
+    assert draft["draft"] is True
+    assert load_attempts() == []
+    assert progress_store.get_concept_progress("Entropy") is None
+
+def test_unchanged_submit_saves_the_draft_once(analyzer):
+    draft = stop_time_analysis(analyzer)
+    calls = len(analyzer.llm.calls)
+
+    response = submit(analyzer, draft, explanation="  " + TRANSCRIPT.replace(" ", "\n", 1))
+    assert response.attempt_id == draft["attempt_id"]
+    assert response.draft is False
+    assert len(analyzer.llm.calls) == calls  # Not analyzed again
+    assert [a["attempt_id"] for a in load_attempts()] == [draft["attempt_id"]]
+    assert progress_store.get_concept_progress("Entropy")["attempt_count"] == 1
+
+    # Submitting the same draft again is a normal analysis, not a second copy of the draft
+    again = submit(analyzer, draft)
+    assert again.attempt_id != draft["attempt_id"]
+    assert progress_store.get_concept_progress("Entropy")["attempt_count"] == 2
+
+@pytest.mark.parametrize("fields", [
+    {"explanation": TRANSCRIPT + " and that is entropy"},
+    {"target_audience": "physics student"},
+])
+def test_edited_submit_drops_the_draft(analyzer, fields):
+    draft = stop_time_analysis(analyzer)
+    response = submit(analyzer, draft, **fields)
+    assert response.attempt_id != draft["attempt_id"]
+    assert [a["attempt_id"] for a in load_attempts()] == [response.attempt_id]
+    assert progress_store.get_concept_progress("Entropy")["attempt_count"] == 1
+
+def test_drafts_expire(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(draft_module.time, "monotonic", clock)
+    store = DraftAttemptStore(ttl_seconds=60, max_drafts=2)
+    store.put("a", {}, {}, {})
+    clock.now += 60
+    assert store.pop("a") is None
+    for draft_id in ("b", "c", "d"):
+        store.put(draft_id, {}, {}, {})
+    assert store.pop("b") is None
+    assert store.pop("d") is not None
+    assert store.pop("d") is None
+
+def test_websocket_stop_returns_an_unsaved_draft(analyzer, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.api.endpoints import analysis as analysis_endpoints
+    from app.core.config import settings
+    from app.main import app
+
+    monkeypatch.setattr(settings, "WARMUP_ENABLED", False)
+    monkeypatch.setattr(analysis_endpoints, "get_analyzer_service", lambda: analyzer)
+    with TestClient(app) as client, client.websocket_connect("/api/v1/ws/speech") as ws:
+        ws.send_json({"type": "segment", "text": TRANSCRIPT, "start": 0.0, "end": 4.0})
+        assert ws.receive_json()["type"] == "metrics"
+        ws.send_json({"type": "stop", "total_seconds": 5.0, "request": {"concept": "Entropy"}})
+        assert ws.receive_json()["type"] == "analyzing"
+        result = ws.receive_json()
+    assert result["type"] == "result" and result["response"]["draft"] is True
+    assert load_attempts() == []
@@ -0,0 +1,89 @@
+import gzip
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.services.llm_engine import LLMEngine
+from app.services.llm_recorder import LLMRecorder, LLMReplayer, ReplayMissError, request_key
+from tests.helpers import FakeClient
+
+MESSAGES = [
+    {"role": "system", "content": "You are Mr. Feynman."},
+    {"role": "user", "content": "Explain entropy — café ☕"},
+]
+
+def test_request_key_is_stable_across_releases():
+    # Changing how keys are computed orphans every recorded cassette: update this only on purpose
+    assert request_key(MESSAGES, 1000, 0.2) == "d282056d5eb6b04e08f56bc59f94d055714e63e8315f6df6057a21ff65bfb933"
+
+def test_request_key_ignores_dict_order_only():
+    reordered = [{"content": m["content"], "role": m["role"]} for m in MESSAGES]
+    assert request_key(reordered, 1000, 0.2) == request_key(MESSAGES, 1000, 0.2)
+    variants = [
+        request_key(MESSAGES[:1], 1000, 0.2),
+        request_key(MESSAGES, 999, 0.2),
+        request_key(MESSAGES, 1000, 0.3),
+        request_key([MESSAGES[0], dict(MESSAGES[1], content="Explain entropy")], 1000, 0.2),
+        request_key(list(reversed(MESSAGES)), 1000, 0.2),
+    ]
+    assert len(set(variants + [request_key(MESSAGES, 1000, 0.2)])) == len(variants) + 1
+
+def test_replay_order_and_resumed_recording(tmp_path):
+    path = str(tmp_path / "cassette.jsonl.gz")
+    key = request_key(MESSAGES, 10, 0.2)
+    LLMRecorder(path).record(key, MESSAGES, "first", 0.5, None, None)
+    # A second recording session appends its own gzip member to the same file
+    LLMRecorder(path).record(key, MESSAGES, "second", 0.5, None, None)
+
+    replayer = LLMReplayer(path)
+    assert [replayer.replay(key)["content"] for _ in range(3)] == ["first", "second", "second"]
+    with pytest.raises(ReplayMissError):
+        replayer.replay(request_key(MESSAGES, 11, 0.2))
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f]
+    assert entries[0]["last_message"] == MESSAGES[-1]
+
+def response(content: str, finish_reason: str = "stop"):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content), finish_reason=finish_reason)],
+        usage=None,
+        model_extra={"timings": {"prompt_ms": 1.0, "predicted_ms": 2.0, "cache_n": 0}},
+    )
+
+def fresh_engine(monkeypatch, mode: str) -> LLMEngine:
+    monkeypatch.setattr(settings, "LLM_MODE", mode)
+    monkeypatch.setattr(LLMEngine, "_instance", None)
+    return LLMEngine()
+
+def test_engine_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_CASSETTE_PATH", str(tmp_path / "cassette.jsonl.gz"))
+    monkeypatch.setattr(settings, "LLM_HEDGE_API_BASE", None)
+    monkeypatch.setattr(settings, "LLM_TASK_ROUTES", {})
+
+    recording = fresh_engine(monkeypatch, "record")
+    recording.client = FakeClient([response('{"summary": "one"}'), response('{"summary": "two"}')])
+    assert recording.chat(MESSAGES, task="analysis") == '{"summary": "one"}'
+    assert recording.chat(MESSAGES, task="comparison") == '{"summary": "two"}'
+
+    replaying = fresh_engine(monkeypatch, "replay")
+    replaying.client = FakeClient([])  # Any backend call would fail
+    # The task's default max_tokens is part of the key, so each task gets its own answer back
+    assert replaying.chat(MESSAGES, task="comparison") == '{"summary": "two"}'
+    assert replaying.chat(MESSAGES, task="analysis") == '{"summary": "one"}'
+    # Slot pinning doesn't change the answer, so it isn't part of the key
+    assert replaying.chat(MESSAGES, task="analysis", slot_id=1) == '{"summary": "one"}'
+
+def test_truncated_response_is_logged(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "LLM_HEDGE_API_BASE", None)
+    monkeypatch.setattr(settings, "LLM_TASK_ROUTES", {})
+    engine = fresh_engine(monkeypatch, "live")
+    engine.client = FakeClient([response('{"summary": "cut', finish_reason="length"), response("{}")])
+
+    engine.chat(MESSAGES, task="comparison")
+    engine.chat(MESSAGES, task="comparison")
+
+    warnings = [r.getMessage() for r in caplog.records if r.levelname == "WARNING"]
+    assert warnings == ["LLM response for task 'comparison' hit max_tokens (600) and is likely truncated"]
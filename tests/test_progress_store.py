@@ -0,0 +1,32 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from app.memory import attempts_store, progress_store
+
+def _attempt(i: int, concept: str = "Entropy") -> dict:
+    return {
+        "attempt_id": f"a{i}",
+        "timestamp": f"2026-01-01T00:00:{i:02d}",
+        "concept": concept,
+        "analysis_result": {"gaps": ["g"] * (i % 3), "filler_analysis": {"filler_density": 0.01 * i}},
+    }
+
+def test_concurrent_saves_from_cold_start_fold_each_attempt_once_in_log_order(history):
+    # No progress file yet: the first save rebuilds from the log while others are saving
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: attempts_store.save_attempt(_attempt(i)), range(40)))
+
+    log = json.loads((history / "attempts.json").read_text(encoding="utf-8"))
+    entry = progress_store.get_concept_progress("entropy")
+    assert entry["attempt_count"] == 40
+    assert entry["last_attempt_id"] == log[-1]["attempt_id"]
+    assert [p["attempt_id"] for p in entry["gap_counts"]] == [a["attempt_id"] for a in log]
+
+def test_in_memory_aggregates_match_a_rebuild(history):
+    for i in range(5):
+        attempts_store.save_attempt(_attempt(i, concept="Entropy" if i % 2 else " entropy "))
+    incremental = progress_store.get_concept_progress("Entropy")
+
+    progress_store.rebuild_progress()
+    assert progress_store.get_concept_progress("Entropy") == incremental
+    assert incremental["attempt_count"] == 5
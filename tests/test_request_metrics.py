@@ -0,0 +1,35 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.metrics import http_request_duration
+from app.memory import progress_store
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "WARMUP_ENABLED", False)
+    # No progress recorded: every concept lookup is a 404 without touching the history files
+    monkeypatch.setattr(progress_store, "_progress", {"concepts": {}, "sessions": {}})
+    from app.main import app
+    with TestClient(app) as client:
+        yield client
+
+def _routes() -> set[str]:
+    return {labels[1] for labels in http_request_duration.summary()}
+
+@pytest.mark.parametrize("concept", ["v1", "1", "api", "heat%20death%20of%20the%20universe"])
+def test_route_label_is_the_template(client, concept):
+    response = client.get(f"/api/v1/progress/{concept}")
+    assert response.status_code == 404
+    routes = _routes()
+    assert "/api/v1/progress/{concept}" in routes
+    assert not any("heat" in route or route.count("{concept}") > 1 for route in routes)
+    assert "/api/{concept}/progress/{concept}" not in routes
+
+def test_unparameterized_and_static_routes(client):
+    client.get("/health")
+    client.get("/index.html")
+    routes = _routes()
+    assert "/health" in routes
+    assert "static" in routes
+    assert not any("index" in route for route in routes)
@@ -0,0 +1,213 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from openai import APIConnectionError, BadRequestError, InternalServerError, RateLimitError
+
+from app.core.config import settings
+from app.core.metrics import llm_retries
+from app.services import llm_engine, resilience
+from app.services.resilience import CircuitBreaker, CircuitOpenError
+from tests.helpers import FakeClient, FakeClock, make_error
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(resilience.time, "monotonic", fake)
+    return fake
+
+def test_breaker_closed_open_half_open_closed(clock):
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_seconds=30)
+    breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+
+    clock.now += 30
+    breaker.allow()  # The one trial call
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.allow()
+
+def test_failed_trial_reopens(clock):
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_seconds=30)
+    breaker.record_failure()
+    clock.now += 30
+    breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+
+def test_success_resets_consecutive_failures():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_seconds=30)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+def _open_primary(engine, clock) -> CircuitBreaker:
+    breaker = CircuitBreaker("primary", failure_threshold=1, reset_seconds=30)
+    engine.breakers["primary"] = breaker
+    breaker.record_failure()
+    clock.now += 30
+    return breaker
+
+def test_non_transient_trial_error_closes_circuit(engine, clock):
+    breaker = _open_primary(engine, clock)
+    engine.client = FakeClient([make_error(BadRequestError), "ok"])
+
+    with pytest.raises(BadRequestError):
+        engine._call_backend("primary", {}, timeout=5)
+    # The backend answered, so the circuit must not stay stuck half-open
+    assert breaker.state == "closed"
+    assert engine._call_backend("primary", {}, timeout=5) == "ok"
+
+def test_error_before_reaching_backend_releases_trial(engine, clock):
+    breaker = _open_primary(engine, clock)
+    engine.breakers["http://router"] = breaker
+
+    with pytest.raises(KeyError):
+        engine._call_backend("http://router", {}, timeout=5)
+    breaker.allow()  # Would raise CircuitOpenError if the trial were still taken
+
+def test_interrupted_trial_is_released(engine, clock):
+    breaker = _open_primary(engine, clock)
+    engine.client = FakeClient([KeyboardInterrupt(), "ok"])
+
+    with pytest.raises(KeyboardInterrupt):
+        engine._call_backend("primary", {}, timeout=5)
+    assert breaker.state == "half_open"
+    assert engine._call_backend("primary", {}, timeout=5) == "ok"
+    assert breaker.state == "closed"
+
+def test_transient_trial_error_reopens(engine, clock):
+    breaker = _open_primary(engine, clock)
+    engine.client = FakeClient([make_error(APIConnectionError)])
+
+    with pytest.raises(APIConnectionError):
+        engine._call_backend("primary", {}, timeout=5)
+    assert breaker.state == "open"
+
+def test_backoff_delay_bounds(monkeypatch):
+    monkeypatch.setattr(resilience.random, "uniform", lambda low, high: (low, high))
+    assert [resilience.backoff_delay(n, 0.5) for n in range(6)] == [
+        (0, 0.5), (0, 1.0), (0, 2.0), (0, 4.0), (0, 8.0), (0, 10.0)
+    ]
+    assert resilience.backoff_delay(3, 0.5, cap=3.0) == (0, 3.0)
+
+def test_backoff_delay_is_jittered():
+    delays = [resilience.backoff_delay(2, 0.5) for _ in range(200)]
+    assert all(0 <= d <= 2.0 for d in delays)
+    assert len(set(delays)) > 100
+
+def test_latency_percentile_needs_enough_samples():
+    tracker = resilience.LatencyTracker(window=100)
+    for ms in range(1, 101):
+        tracker.observe(ms / 1000)
+    assert tracker.percentile(95, min_samples=100) == 0.095
+    assert tracker.percentile(95, min_samples=101) is None
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Records backoff sleeps instead of sleeping; every backoff is 0.01s."""
+    recorded = []
+    monkeypatch.setattr(llm_engine, "backoff_delay", lambda attempt, base: 0.01 * (attempt + 1))
+    monkeypatch.setattr(llm_engine.time, "sleep", recorded.append)
+    return recorded
+
+def test_transient_errors_are_retried_then_succeed(engine, sleeps, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_MAX_RETRIES", 2)
+    engine.client = FakeClient([make_error(APIConnectionError), make_error(InternalServerError), "ok"])
+    retries_before = llm_retries.value()
+
+    assert engine._complete({}) == "ok"
+    assert engine.client.chat.completions.calls == 3
+    assert sleeps == [0.01, 0.02]
+    assert llm_retries.value() == retries_before + 2
+
+def test_retries_are_bounded(engine, sleeps, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_MAX_RETRIES", 2)
+    engine.client = FakeClient([make_error(RateLimitError)] * 3)
+
+    with pytest.raises(RateLimitError):
+        engine._complete({})
+    assert engine.client.chat.completions.calls == 3
+
+def test_non_transient_errors_are_not_retried(engine, sleeps):
+    engine.client = FakeClient([make_error(BadRequestError), "ok"])
+    with pytest.raises(BadRequestError):
+        engine._complete({})
+    assert engine.client.chat.completions.calls == 1
+    assert sleeps == []
+
+def test_no_retry_past_the_deadline(engine, sleeps, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_MAX_RETRIES", 5)
+    # The backoff would end after the overall deadline
+    monkeypatch.setattr(settings, "LLM_TIMEOUT_SECONDS", 0.005)
+    engine.client = FakeClient([make_error(APIConnectionError), "ok"])
+    with pytest.raises(APIConnectionError):
+        engine._complete({})
+    assert sleeps == []
+
+def test_open_circuit_is_not_retried(engine, sleeps):
+    engine.breakers["primary"] = CircuitBreaker("primary", failure_threshold=1, reset_seconds=30)
+    engine.breakers["primary"].record_failure()
+    engine.client = FakeClient(["ok"])
+    with pytest.raises(CircuitOpenError):
+        engine._complete({})
+    assert engine.client.chat.completions.calls == 0
+
+class SlowClient(FakeClient):
+    """Answers `value` after `seconds` on every call."""
+    def __init__(self, value, seconds: float):
+        super().__init__([])
+        self.chat.completions.create = self._create
+        self.value, self.seconds, self.calls = value, seconds, 0
+
+    def _create(self, **request):
+        self.calls += 1
+        time.sleep(self.seconds)
+        return self.value
+
+@pytest.fixture
+def hedged(engine, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_HEDGE_API_BASE", "http://hedge.invalid/v1")
+    monkeypatch.setattr(settings, "LLM_HEDGE_DELAY_SECONDS", 0.1)
+    engine.get_hedge_client()  # Builds the pools
+    yield engine
+    engine.primary_pool.shutdown(wait=True)
+    engine.hedge_pool.shutdown(wait=True)
+
+def test_slow_primary_is_hedged(hedged):
+    hedged.client = SlowClient("primary", 0.5)
+    hedged.hedge_client = SlowClient("hedge", 0.0)
+    assert hedged._call_hedged({}, timeout=5) == "hedge"
+
+def test_fast_primary_is_not_hedged(hedged):
+    hedged.client = SlowClient("primary", 0.0)
+    hedged.hedge_client = SlowClient("hedge", 0.0)
+    assert hedged._call_hedged({}, timeout=5) == "primary"
+    assert hedged.hedge_client.calls == 0
+
+def test_time_queued_behind_other_calls_does_not_trigger_a_hedge(hedged):
+    hedged.primary_pool = ThreadPoolExecutor(max_workers=1)
+    hedged.primary_pool.submit(time.sleep, 0.3)  # Keeps the only primary worker busy past the hedge delay
+    hedged.client = SlowClient("primary", 0.0)
+    hedged.hedge_client = SlowClient("hedge", 0.0)
+    assert hedged._call_hedged({}, timeout=5) == "primary"
+    assert hedged.hedge_client.calls == 0
+
+def test_no_hedge_when_hedge_workers_are_busy(hedged):
+    while hedged.hedge_capacity.acquire(blocking=False):
+        pass
+    hedged.client = SlowClient("primary", 0.3)
+    hedged.hedge_client = SlowClient("hedge", 0.0)
+    assert hedged._call_hedged({}, timeout=5) == "primary"
+    assert hedged.hedge_client.calls == 0
@@ -0,0 +1,116 @@
+import json
+
+import pytest
+
+from app.services import retrieval
+from app.services.retrieval import (
+    RETRIEVAL_STRATEGIES,
+    bm25_scores,
+    compress_chunks,
+    keyword_scores,
+    register_strategy,
+    retrieve,
+    select_chunks,
+    tfidf_scores,
+    tokenize,
+)
+from tests.helpers import StubLLM
+
+CHUNKS = [
+    {"id": 0, "text": "Photosynthesis turns light into chemical energy. Plants store it as sugar."},
+    {"id": 1, "text": "Entropy entropy entropy. Entropy always increases in an isolated system."},
+    {"id": 2, "text": "Entropy counts microstates. A system with more microstates has higher entropy. Gas spreads out."},
+    {"id": 3, "text": "The second law: total entropy of an isolated system never decreases over time."},
+]
+
+def test_tokenize_drops_stopwords_and_short_words():
+    assert tokenize("The entropy IS up, so it goes UP; ok gas!") == ["entropy", "goes", "gas"]
+
+def test_keyword_counts_distinct_query_words():
+    assert keyword_scores(["entropy", "entropy", "gas"], [["entropy", "entropy"], ["gas", "entropy"], ["sugar"]]) == [1.0, 2.0, 0.0]
+
+def test_bm25_saturates_term_frequency_and_weights_rare_terms():
+    docs = [["entropy"] * 10 + ["filler"] * 10, ["entropy", "filler"], ["microstates", "filler"]]
+    scores = bm25_scores(["entropy"], docs)
+    # Ten times the occurrences gives far less than ten times the score
+    assert scores[0] < 2 * scores[1]
+    assert scores[2] == 0.0
+    rare = bm25_scores(["microstates", "filler"], docs)
+    common = bm25_scores(["filler"], docs)
+    assert rare[2] > common[2]
+
+def test_tfidf_is_cosine_bounded_and_zero_without_overlap():
+    docs = [["entropy", "gas"], ["entropy", "gas"], ["sugar"]]
+    scores = tfidf_scores(["entropy", "gas"], docs)
+    assert scores[0] == pytest.approx(1.0)
+    assert scores[2] == 0.0
+    assert tfidf_scores(["unknown"], docs) == [0.0, 0.0, 0.0]
+
+def test_empty_inputs():
+    for strategy in ("keyword", "bm25", "tfidf"):
+        assert RETRIEVAL_STRATEGIES[strategy]([], [[], []]) == [0.0, 0.0]
+        assert select_chunks("entropy", [], strategy=strategy) == []
+
+@pytest.mark.parametrize("strategy", ["keyword", "bm25", "tfidf"])
+def test_select_chunks_ranks_by_query_overlap(strategy):
+    query = "Why does entropy of an isolated system never decrease over time?"
+    selected = select_chunks(query, CHUNKS, top_k=3, strategy=strategy)
+    assert [c["id"] for c in selected] == [3, 1, 2]
+    assert selected[0]["relevance_score"] > selected[1]["relevance_score"] > selected[2]["relevance_score"]
+    assert all("relevance_score" not in c for c in CHUNKS)
+
+def test_single_term_query_ties_for_keyword_only():
+    keyword = select_chunks("entropy", CHUNKS, top_k=3, strategy="keyword")
+    # Equal scores keep document order
+    assert [c["id"] for c in keyword] == [1, 2, 3]
+    assert len({c["relevance_score"] for c in keyword}) == 1
+    for strategy in ("bm25", "tfidf"):
+        # Term frequency counts: the chunk that says "entropy" five times ranks first
+        selected = select_chunks("entropy", CHUNKS, top_k=3, strategy=strategy)
+        assert selected[0]["id"] == 1
+        assert len({c["relevance_score"] for c in selected}) == 3
+
+def test_select_chunks_drops_non_matching_and_unknown_strategy():
+    assert [c["id"] for c in select_chunks("photosynthesis sugar", CHUNKS, top_k=3, strategy="bm25")] == [0]
+    with pytest.raises(ValueError):
+        select_chunks("entropy", CHUNKS, strategy="nope")
+
+def test_registered_strategy_is_selectable(monkeypatch):
+    monkeypatch.setattr(retrieval, "RETRIEVAL_STRATEGIES", dict(RETRIEVAL_STRATEGIES))
+
+    @register_strategy("longest")
+    def longest(query_tokens, chunk_tokens):
+        return [float(len(tokens)) for tokens in chunk_tokens]
+
+    assert select_chunks("anything", CHUNKS, top_k=1, strategy="longest")[0]["id"] == 2
+
+def test_extractive_keeps_best_sentences_in_order(monkeypatch):
+    monkeypatch.setattr(retrieval.settings, "CONTEXT_COMPRESSION_MAX_SENTENCES", 2)
+    chunk = {"id": 9, "text": "Gas spreads out. Sugar is sweet. Entropy counts microstates. More microstates, higher entropy."}
+    [compressed] = compress_chunks("entropy microstates gas", [chunk], mode="extractive")
+    assert compressed["text"] == "Entropy counts microstates. More microstates, higher entropy."
+    assert compressed["id"] == 9
+    [fallback] = compress_chunks("photosynthesis", [chunk], mode="extractive")
+    assert fallback["text"] == "Gas spreads out."
+
+def test_llm_compression_and_fallback(engine, monkeypatch):
+    chunk = {"id": 9, "text": "Gas spreads out. Sugar is sweet. Entropy counts microstates."}
+    stub = StubLLM(lambda call: json.dumps({"relevant_text": "Entropy counts microstates."}))
+    monkeypatch.setattr(engine, "generate", stub.generate)
+    [compressed] = compress_chunks("entropy", [chunk], mode="llm")
+    assert compressed["text"] == "Entropy counts microstates."
+    assert stub.calls[0]["task"] == "compression"
+
+    monkeypatch.setattr(engine, "generate", StubLLM(lambda call: "not json").generate)
+    [fallback] = compress_chunks("entropy microstates", [chunk], mode="llm")
+    assert fallback["text"] == "Entropy counts microstates."
+
+def test_compression_off_and_unknown():
+    assert compress_chunks("entropy", CHUNKS, mode="off") is CHUNKS
+    with pytest.raises(ValueError):
+        compress_chunks("entropy", CHUNKS, mode="zip")
+
+def test_retrieve_selects_then_compresses():
+    result = retrieve("photosynthesis sugar", CHUNKS, top_k=2, strategy="bm25", compression="extractive")
+    assert [c["id"] for c in result] == [0]
+    assert result[0]["relevance_score"] > 0
@@ -0,0 +1,135 @@
+import json
+import re
+
+import pytest
+
+from app.core.config import settings
+from app.prompts.templates import SEGMENT_REDUCE_SYSTEM_PROMPT
+from app.schemas.analysis import AnalysisRequest
+from app.services.explanation_segmenter import CHARS_PER_TOKEN, dedupe_similar, estimate_tokens, segment_explanation
+from app.services.feynman_analyzer import FeynmanAnalyzer
+from tests.helpers import StubLLM
+
+def sentences(count: int, words: int = 12) -> list[str]:
+    return [" ".join(f"w{i}x{j}" for j in range(words)) + "." for i in range(count)]
+
+def test_short_text_is_one_segment():
+    text = " ".join(sentences(3))
+    assert segment_explanation(text, max_tokens=600) == [text]
+    assert segment_explanation("", max_tokens=600) == []
+
+def test_segments_cut_at_sentence_boundaries_and_keep_all_text():
+    parts = sentences(60)
+    segments = segment_explanation(" ".join(parts), max_tokens=100)
+    assert " ".join(segments).split() == " ".join(parts).split()
+    for segment in segments:
+        assert segment.endswith(".")
+        assert set(re.findall(r"w(\d+)x0", segment))  # starts of whole sentences only
+
+def test_segments_are_evenly_sized():
+    parts = sentences(61)
+    text = " ".join(parts)
+    max_chars = 100 * CHARS_PER_TOKEN
+    segments = segment_explanation(text, max_tokens=100)
+    # The count is fixed up front: no short tail segment from greedy packing
+    assert len(segments) == -(-(len(text) + 1) // max_chars)
+    # Each cut lands within half a sentence of its target offset
+    longest = max(len(p) + 1 for p in parts)
+    target = (len(text) + 1) / len(segments)
+    assert all(abs(len(s) + 1 - target) <= longest for s in segments)
+
+def test_paragraph_breaks_are_preferred():
+    first, second = sentences(8), sentences(8)
+    text = " ".join(first) + "\n\n" + " ".join(second)
+    segments = segment_explanation(text, max_tokens=len(text) // CHARS_PER_TOKEN // 2 + 20)
+    assert segments == [" ".join(first), " ".join(second)]
+
+def test_run_on_speech_is_cut_at_word_boundaries():
+    words = [f"word{i}" for i in range(800)]
+    segments = segment_explanation(" ".join(words), max_tokens=100)
+    assert len(segments) > 1
+    assert " ".join(segments).split() == words
+
+def test_dedupe_similar_keeps_first_of_each_near_duplicate():
+    items = ["Does not explain why entropy increases", "does not explain why ENTROPY increases!",
+             "No everyday example", "", "  ", "Does not explain why entropy always increases"]
+    assert dedupe_similar(items, 0.6) == ["Does not explain why entropy increases", "No everyday example"]
+    assert dedupe_similar(items, 1.01) == [
+        "Does not explain why entropy increases", "does not explain why ENTROPY increases!",
+        "No everyday example", "Does not explain why entropy always increases"]
+
+@pytest.fixture
+def analyzer(engine, monkeypatch):
+    monkeypatch.setattr(settings, "SEGMENT_THRESHOLD_TOKENS", 150)
+    monkeypatch.setattr(settings, "SEGMENT_MAX_TOKENS", 100)
+    monkeypatch.setattr(settings, "LLM_SLOTS", 2)
+    return FeynmanAnalyzer()
+
+def long_request(**overrides) -> AnalysisRequest:
+    return AnalysisRequest(concept="Entropy", explanation=" ".join(sentences(40)), **overrides)
+
+def test_plan_segments(analyzer, monkeypatch):
+    request = long_request()
+    assert estimate_tokens(request.explanation) > settings.SEGMENT_THRESHOLD_TOKENS
+    segments = analyzer._plan_segments(request, is_interview=False)
+    assert len(segments) > 1
+    assert analyzer._plan_segments(request, is_interview=True) is None
+    assert analyzer._plan_segments(AnalysisRequest(concept="Entropy", explanation="Short."), is_interview=False) is None
+    monkeypatch.setattr(settings, "SEGMENTED_ANALYSIS_ENABLED", False)
+    assert analyzer._plan_segments(request, is_interview=False) is None
+
+def segment_reply(call) -> dict:
+    index = int(re.search(r"Part (\d+) of", call["user_prompt"]).group(1))
+    return {
+        "summary": f"Part {index} is fine.",
+        # Every part reports the same gap in slightly different words, plus one of its own
+        "gaps": ["Does not explain why entropy increases" + ("!" * index), f"Never defines term{index}a, term{index}b or term{index}c"],
+        "suggestions": ["Use a messy room example"],
+    }
+
+def test_map_reduce_dedupes_gaps_across_segments(analyzer):
+    def respond(call):
+        if call["system_prompt"] == SEGMENT_REDUCE_SYSTEM_PROMPT:
+            return json.dumps({"summary": "Combined.", "gaps": ["g"], "suggestions": [], "follow_up_questions": []})
+        return json.dumps(segment_reply(call))
+    analyzer.llm = StubLLM(respond)
+    request = long_request()
+    segments = analyzer._plan_segments(request, is_interview=False)
+
+    result = analyzer._segmented_analysis(request, segments, "", "", None, None)
+
+    map_calls = [c for c in analyzer.llm.calls if c["system_prompt"] != SEGMENT_REDUCE_SYSTEM_PROMPT]
+    [reduce_call] = [c for c in analyzer.llm.calls if c["system_prompt"] == SEGMENT_REDUCE_SYSTEM_PROMPT]
+    assert len(map_calls) == len(segments)
+    assert {c["slot_id"] for c in map_calls} == {0, 1}
+    assert reduce_call["user_prompt"].count("Does not explain why entropy increases") == 1
+    assert reduce_call["user_prompt"].count("Use a messy room example") == 1
+    for index in range(1, len(segments) + 1):
+        assert f"Never defines term{index}a, term{index}b or term{index}c" in reduce_call["user_prompt"]
+    assert result["summary"] == "Combined."
+    assert result["segmented"] == {"segments": len(segments), "analyzed": len(segments), "reduced_locally": False}
+
+def test_failed_segments_are_skipped_and_reduce_falls_back_locally(analyzer):
+    def respond(call):
+        if call["system_prompt"] == SEGMENT_REDUCE_SYSTEM_PROMPT:
+            return "not json"
+        if "Part 1 of" in call["user_prompt"]:
+            raise RuntimeError("backend hiccup")
+        if "Part 2 of" in call["user_prompt"]:
+            return "not json either"
+        return json.dumps(segment_reply(call))
+    analyzer.llm = StubLLM(respond)
+    request = long_request()
+    segments = analyzer._plan_segments(request, is_interview=False)
+
+    result = analyzer._segmented_analysis(request, segments, "", "", None, None)
+
+    assert result["segmented"] == {"segments": len(segments), "analyzed": len(segments) - 2, "reduced_locally": True}
+    assert result["gaps"][0] == "Does not explain why entropy increases!!!"
+    assert len([g for g in result["gaps"] if "entropy increases" in g]) == 1
+    assert "Part 3 is fine." in result["summary"]
+
+def test_no_usable_segment_returns_none(analyzer):
+    analyzer.llm = StubLLM(lambda call: '{"summary": "Error: Local LLM Server is not running."}')
+    request = long_request()
+    assert analyzer._segmented_analysis(request, analyzer._plan_segments(request, False), "", "", None, None) is None
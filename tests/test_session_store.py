@@ -0,0 +1,72 @@
+import pytest
+
+from app.memory import session_store as session_store_module
+from app.memory.session_store import InterviewSessionStore
+from tests.helpers import FakeClock
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(session_store_module.time, "monotonic", fake)
+    return fake
+
+def run_turn(store: InterviewSessionStore, session_id: str, turn_index: int, reply: str | None = None) -> list[dict]:
+    messages, _ = store.start_turn(session_id, "system", turn_index, f"user {turn_index}")
+    store.finish_turn(session_id, reply or f"assistant {turn_index}")
+    return messages
+
+def test_turns_build_one_transcript(clock):
+    store = InterviewSessionStore(ttl_seconds=60, max_sessions=10, slots=1)
+    run_turn(store, "s", 1)
+    messages = run_turn(store, "s", 2)
+    assert [m["content"] for m in messages] == ["system", "user 1", "assistant 1", "user 2"]
+    assert store.get("s")["turns"] == 2
+
+def test_repeated_turn_replaces_instead_of_appending(clock):
+    store = InterviewSessionStore(ttl_seconds=60, max_sessions=10, slots=1)
+    run_turn(store, "s", 1)
+    run_turn(store, "s", 2, reply="first try")
+    # Client retried turn 2: the transcript is truncated back to the end of turn 1
+    messages = run_turn(store, "s", 2, reply="second try")
+    assert [m["content"] for m in messages] == ["system", "user 1", "assistant 1", "user 2"]
+    assert [m["content"] for m in store.get("s")["messages"]][-1] == "second try"
+    # Going back to turn 1 drops everything after the system prompt
+    assert [m["content"] for m in run_turn(store, "s", 1)] == ["system", "user 1"]
+
+def test_reply_without_pending_turn_is_ignored(clock):
+    store = InterviewSessionStore(ttl_seconds=60, max_sessions=10, slots=1)
+    store.finish_turn("missing", "reply")
+    run_turn(store, "s", 1)
+    store.finish_turn("s", "duplicate reply")
+    assert store.get("missing") is None
+    assert store.get("s")["turns"] == 1
+
+def test_sessions_expire_after_ttl_of_inactivity(clock):
+    store = InterviewSessionStore(ttl_seconds=60, max_sessions=10, slots=1)
+    run_turn(store, "old", 1)
+    clock.now += 30
+    run_turn(store, "active", 1)
+    clock.now += 29
+    assert store.get("old") is not None
+    clock.now += 1
+    assert store.get("old") is None
+    assert store.get("active") is not None
+    # An expired session restarts from scratch
+    clock.now += 60
+    assert [m["content"] for m in run_turn(store, "active", 2)] == ["system", "user 2"]
+
+def test_least_recently_used_session_is_evicted_above_capacity(clock):
+    store = InterviewSessionStore(ttl_seconds=60, max_sessions=2, slots=1)
+    run_turn(store, "a", 1)
+    run_turn(store, "b", 1)
+    run_turn(store, "a", 2)  # "b" is now the least recently used
+    run_turn(store, "c", 1)
+    # Eviction runs before a session is added, so capacity can be exceeded by one until the next call
+    assert store.get("b") is None
+    assert store.get("a") is not None and store.get("c") is not None
+
+def test_sessions_are_spread_over_slots_and_stay_pinned(clock):
+    store = InterviewSessionStore(ttl_seconds=60, max_sessions=10, slots=3)
+    slots = [store.start_turn(f"s{i}", "system", 1, "hi")[1] for i in range(6)]
+    assert slots == [0, 1, 2, 0, 1, 2]
+    assert store.start_turn("s1", "system", 2, "again")[1] == 1
@@ -0,0 +1,60 @@
+import os
+
+import pytest
+from openai import APIConnectionError
+
+from app.core.config import settings
+from app.core.metrics import llm_request_duration
+from app.services.llm_engine import LLMEngine
+from app.services.resilience import CircuitBreaker
+from app.services.warmup import PRIMED_SYSTEM_PROMPTS, WarmupService
+from tests.helpers import FakeClient, make_error
+
+@pytest.fixture
+def recording_engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_MODE", "record")
+    monkeypatch.setattr(settings, "LLM_CASSETTE_PATH", str(tmp_path / "cassette.jsonl.gz"))
+    monkeypatch.setattr(settings, "LLM_HEDGE_API_BASE", None)
+    monkeypatch.setattr(settings, "LLM_TASK_ROUTES", {})
+    monkeypatch.setattr(settings, "LLM_SLOTS", 2)
+    monkeypatch.setattr(LLMEngine, "_instance", None)
+    return LLMEngine()
+
+def _counts(task: str) -> dict:
+    return {key[0]: value["count"] for key, value in llm_request_duration.summary().items() if key[1] == task}
+
+def test_priming_is_not_recorded_and_tagged_warmup(recording_engine):
+    engine = recording_engine
+    engine.client = FakeClient([object()] * 4)
+    analysis_before, warmup_before = _counts("analysis"), _counts("warmup")
+
+    WarmupService()._prime_prompt_cache()
+
+    requests = engine.client.chat.completions.requests
+    # One prompt per slot: a second prompt on the same slot would evict the first from its cache
+    assert [r["extra_body"]["id_slot"] for r in requests] == [0, 1]
+    assert all(r["max_tokens"] == 1 and r["extra_body"]["cache_prompt"] for r in requests)
+    # Priming must use the exact system prompts real calls send, or it warms the wrong prefix
+    assert [r["messages"][0]["content"] for r in requests] == [prompt for _, prompt in PRIMED_SYSTEM_PROMPTS]
+
+    assert not os.path.exists(settings.LLM_CASSETTE_PATH)
+    assert _counts("analysis") == analysis_before
+    assert _counts("warmup").get("ok", 0) == warmup_before.get("ok", 0) + 2
+
+def test_priming_failures_do_not_trip_the_breaker(recording_engine):
+    engine = recording_engine
+    engine.breakers["primary"] = CircuitBreaker("primary", failure_threshold=1, reset_seconds=30)
+    engine.client = FakeClient([make_error(APIConnectionError)] * 3)
+    service = WarmupService()
+
+    for _ in range(3):
+        with pytest.raises(APIConnectionError):
+            service._prime_prompt_cache()
+
+    assert engine.breakers["primary"].state == "closed"
+    assert engine.client.chat.completions.calls == 3  # No retries either
+
+def test_slot_plan_keeps_the_most_common_prompt_on_most_slots():
+    analysis, interviewer = PRIMED_SYSTEM_PROMPTS
+    assert WarmupService._slot_plan(1) == [analysis]
+    assert WarmupService._slot_plan(4) == [analysis, analysis, analysis, interviewer]